@@ -9,6 +9,8 @@ setup(
 	tests_require=['pytest'],
 	author='Rohan Bulusu',
 	author_email='rohanbulusu@gmail.com',
-	url='https://github.com/rohanbulusu/algae'
+	url='https://github.com/rohanbulusu/algae',
+	packages=['algae', 'algae.absal'],
+	package_dir={'algae': 'src'}
 )
 
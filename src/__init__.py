@@ -0,0 +1,12 @@
+
+import importlib
+
+
+# submodules are imported on first attribute access, so `import algae`
+# costs nothing until a structure is actually used
+_SUBMODULES = ('absal', 'algaeset', 'maps', 'properties', 'setexpressions', 'utils', 'verification')
+
+def __getattr__(name):
+	if name in _SUBMODULES:
+		return importlib.import_module(f'.{name}', __name__)
+	raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
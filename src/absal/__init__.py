@@ -0,0 +1,10 @@
+
+import importlib
+
+
+_SUBMODULES = ('actions', 'bitsets', 'expressions', 'groups', 'lie', 'magma', 'matrices', 'morphisms', 'polynomials', 'rewriting', 'rings')
+
+def __getattr__(name):
+	if name in _SUBMODULES:
+		return importlib.import_module(f'.{name}', __name__)
+	raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
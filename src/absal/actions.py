@@ -0,0 +1,124 @@
+
+from array import array
+
+from ..utils import typename
+from ..algaeset import AlgaeSet
+from ..maps import Mapping
+from ..properties import IdentityError
+from .groups import Group
+from .bitsets import Bitset, Universe
+
+
+class GroupAction:
+
+	__slots__ = ('group', 'aset', 'action', 'points', 'index', 'universe', '_permutations')
+
+	def __init__(self, group, aset, action_mapping):
+		if not isinstance(group, Group):
+			raise TypeError(f'Expected Group, not {typename(group)}')
+		if not isinstance(aset, AlgaeSet):
+			raise TypeError(f'Expected AlgaeSet, not {typename(aset)}')
+		if not isinstance(action_mapping, Mapping):
+			raise TypeError(f'Expected Mapping, not {typename(action_mapping)}')
+		if action_mapping.input_dim != 2:
+			raise ValueError(f'Expected action to take a group element and a point')
+		if aset.is_infinite:
+			raise ValueError(f'Expected a finite set of points, not {aset}')
+		self.group = group
+		self.aset = aset
+		self.action = action_mapping.mapping
+		self.points = tuple(aset)
+		self.index = {p: i for i, p in enumerate(self.points)}
+		self.universe = Universe(self.points, self.index)
+		self._permutations = None
+		identity = group.binop.identity
+		for p in self.points:
+			if self.action(identity, p) != p:
+				raise IdentityError(f'Identity {identity} does not fix point {p}')
+
+	def permutations(self):
+		# each generator is tabulated once as a permutation of point indices
+		if self._permutations is None:
+			act, points, index = self.action, self.points, self.index
+			self._permutations = tuple(
+				(s, array('l', (index[act(s, p)] for p in points)))
+				for s in self.group.generating_set()
+			)
+		return self._permutations
+
+	def _search(self, start, visited, schreier=None):
+		# breadth-first search over point indices, marking visited, a
+		# bytearray with one flag per point, in place; a Schreier vector,
+		# when asked for, records the generator that first reached each
+		# point and where it came from
+		permutations = self.permutations()
+		visited[start] = 1
+		order = [start]
+		for i in order:
+			for k, (_, permutation) in enumerate(permutations):
+				j = permutation[i]
+				if not visited[j]:
+					visited[j] = 1
+					order.append(j)
+					if schreier is not None:
+						schreier[j] = (k, i)
+		return order
+
+	def orbit(self, point):
+		if point not in self.index:
+			raise ValueError(f'Expected {point} to be in {self.aset}')
+		order = self._search(self.index[point], bytearray(len(self.points)))
+		return AlgaeSet(*(self.points[i] for i in order))
+
+	def orbit_bitset(self, point):
+		if point not in self.index:
+			raise ValueError(f'Expected {point} to be in {self.aset}')
+		order = self._search(self.index[point], bytearray(len(self.points)))
+		# the int is built once from packed bytes, bit i in byte i // 8
+		packed = bytearray((len(self.points) + 7) // 8)
+		for i in order:
+			packed[i >> 3] |= 1 << (i & 7)
+		return Bitset(self.universe, int.from_bytes(packed, 'little'))
+
+	def orbits(self):
+		visited = bytearray(len(self.points))
+		for i in range(len(self.points)):
+			if not visited[i]:
+				order = self._search(i, visited)
+				yield AlgaeSet(*(self.points[j] for j in order))
+
+	def stabilizer(self, point):
+		if point not in self.index:
+			raise ValueError(f'Expected {point} to be in {self.aset}')
+		op = self.group.binop.mapping
+		permutations = self.permutations()
+		schreier = {}
+		order = self._search(self.index[point], bytearray(len(self.points)), schreier)
+		# coset representatives u_y with u_y . point = y, read off the vector
+		transversal = {order[0]: self.group.binop.identity}
+		for j in order[1:]:
+			k, i = schreier[j]
+			transversal[j] = op(permutations[k][0], transversal[i])
+		# Schreier generators u_{s.y}^-1 s u_y fix the point and generate
+		# its stabilizer; only those outside the current span are kept
+		generators, members = [], {self.group.binop.identity}
+		for i in order:
+			for s, permutation in permutations:
+				j = permutation[i]
+				candidate = op(self.group.inverse(transversal[j]), op(s, transversal[i]))
+				if candidate not in members:
+					generators.append(candidate)
+					members = self.group.closure(generators)
+		return self.group._restricted(members, tuple(generators))
+
+	def fixed_points(self, g):
+		act = self.action
+		return sum(1 for p in self.points if act(g, p) == p)
+
+	def count_orbits(self):
+		# Burnside's lemma; fixed point counts are class functions, so one
+		# representative per conjugacy class suffices
+		total = 0
+		for c in self.group.conjugacy_classes():
+			total += len(c.elements) * self.fixed_points(c.elements[0])
+		return total // self.group.order
@@ -0,0 +1,263 @@
+
+from ..utils import typename
+from ..algaeset import AlgaeSet, FrozenAlgaeSet, _numpy
+
+
+def positions(bits):
+	# indices of the set bits of a nonnegative int, in increasing order
+	return [i for i, bit in enumerate(reversed(bin(bits)[2:])) if bit == '1']
+
+
+class Universe:
+
+	# the indexed elements of one finite structure; every Bitset over it
+	# stores bit i for elements[i]
+
+	__slots__ = ('elements', 'index', 'full')
+
+	def __init__(self, elements, index=None):
+		self.elements = tuple(elements)
+		if index is None:
+			index = {e: i for i, e in enumerate(self.elements)}
+		if len(index) != len(self.elements):
+			raise ValueError(f'Expected distinct elements')
+		self.index = index
+		self.full = (1 << len(self.elements)) - 1
+
+	def __repr__(self):
+		return f'Universe({len(self.elements)} elements)'
+
+	def __len__(self):
+		return len(self.elements)
+
+	def empty(self):
+		return Bitset(self, 0)
+
+	def whole(self):
+		return Bitset(self, self.full)
+
+	def subset(self, elements):
+		if isinstance(elements, Bitset):
+			if elements.universe is not self:
+				raise ValueError(f'Expected a subset of {self}')
+			return elements
+		# sub-structures such as subgroups and ideals convert through their set
+		elements = getattr(elements, 'aset', elements)
+		if isinstance(elements, AlgaeSet) and elements.is_infinite:
+			raise ValueError(f'Expected a finite subset, not {elements}')
+		index, bits = self.index, 0
+		for e in elements:
+			i = index.get(e)
+			if i is None:
+				raise ValueError(f'Expected {e} to be an element of {self}')
+			bits |= 1 << i
+		return Bitset(self, bits)
+
+	def family(self, subsets):
+		return BitsetFamily.from_bitsets(self, (self.subset(s) for s in subsets))
+
+	@property
+	def words(self):
+		return max(1, (len(self.elements) + 63) // 64)
+
+
+def universe(structure):
+	if isinstance(structure, Universe):
+		return structure
+	if isinstance(structure, AlgaeSet):
+		if structure.is_infinite:
+			raise ValueError(f'Expected a finite set, not {structure}')
+		return Universe(structure)
+	# rings are indexed by their additive group
+	structure = getattr(structure, 'additive_group', structure)
+	if not callable(getattr(structure, 'universe', None)):
+		raise TypeError(f'Expected a finite structure, not {typename(structure)}')
+	return structure.universe()
+
+
+class Bitset:
+
+	__slots__ = ('universe', 'bits')
+
+	def __init__(self, universe, bits=0):
+		if not isinstance(universe, Universe):
+			raise TypeError(f'Expected Universe, not {typename(universe)}')
+		if not isinstance(bits, int):
+			raise TypeError(f'Expected int, not {typename(bits)}')
+		if bits < 0 or bits > universe.full:
+			raise ValueError(f'Expected bits within a universe of {len(universe)} elements')
+		self.universe = universe
+		self.bits = bits
+
+	@classmethod
+	def from_aset(cls, structure, aset):
+		return universe(structure).subset(aset)
+
+	def to_aset(self):
+		return FrozenAlgaeSet(*self)
+
+	def __repr__(self):
+		return f'Bitset({set(self)})'
+
+	def _other(self, other):
+		if not isinstance(other, Bitset):
+			other = self.universe.subset(other)
+		elif other.universe is not self.universe:
+			raise ValueError(f'Expected bitsets over the same universe')
+		return other.bits
+
+	def __eq__(self, other):
+		if not isinstance(other, Bitset):
+			return False
+		return self.universe is other.universe and self.bits == other.bits
+
+	def __hash__(self):
+		return hash(self.bits)
+
+	def __len__(self):
+		return self.bits.bit_count()
+
+	def __bool__(self):
+		return bool(self.bits)
+
+	def __iter__(self):
+		elements = self.universe.elements
+		return (elements[i] for i in positions(self.bits))
+
+	def __contains__(self, element):
+		i = self.universe.index.get(element)
+		return i is not None and bool(self.bits >> i & 1)
+
+	def __or__(self, other):
+		return Bitset(self.universe, self.bits | self._other(other))
+
+	def __and__(self, other):
+		return Bitset(self.universe, self.bits & self._other(other))
+
+	def __sub__(self, other):
+		return Bitset(self.universe, self.bits & ~self._other(other))
+
+	def __xor__(self, other):
+		return Bitset(self.universe, self.bits ^ self._other(other))
+
+	def __invert__(self):
+		return Bitset(self.universe, self.universe.full ^ self.bits)
+
+	def __le__(self, other):
+		return not self.bits & ~self._other(other)
+
+	def __lt__(self, other):
+		other = self._other(other)
+		return self.bits != other and not self.bits & ~other
+
+	def __ge__(self, other):
+		return not self._other(other) & ~self.bits
+
+	def __gt__(self, other):
+		other = self._other(other)
+		return self.bits != other and not other & ~self.bits
+
+	def issubset(self, other):
+		return self <= other
+
+	def issuperset(self, other):
+		return self >= other
+
+	def isdisjoint(self, other):
+		return not self.bits & self._other(other)
+
+
+class BitsetFamily:
+
+	# many subsets of one universe as rows of little-endian 64-bit words,
+	# so set algebra and comparisons over the family are array operations
+
+	__slots__ = ('universe', 'words')
+
+	def __init__(self, universe, words):
+		np = _numpy()
+		if not isinstance(universe, Universe):
+			raise TypeError(f'Expected Universe, not {typename(universe)}')
+		words = np.asarray(words, dtype='<u8')
+		if words.ndim != 2 or words.shape[1] != universe.words:
+			raise ValueError(f'Expected an array of shape (n, {universe.words}), not {words.shape}')
+		self.universe = universe
+		self.words = words
+
+	@classmethod
+	def from_bitsets(cls, universe, bitsets):
+		np = _numpy()
+		size = universe.words * 8
+		data = bytearray()
+		for b in bitsets:
+			if b.universe is not universe:
+				raise ValueError(f'Expected bitsets over the same universe')
+			data += b.bits.to_bytes(size, 'little')
+		return cls(universe, np.frombuffer(bytes(data), dtype='<u8').reshape(-1, universe.words))
+
+	def _row(self, bitset):
+		np = _numpy()
+		if not isinstance(bitset, Bitset):
+			bitset = self.universe.subset(bitset)
+		elif bitset.universe is not self.universe:
+			raise ValueError(f'Expected bitsets over the same universe')
+		return np.frombuffer(bitset.bits.to_bytes(self.universe.words * 8, 'little'), dtype='<u8')
+
+	def _operand(self, other):
+		if isinstance(other, BitsetFamily):
+			if other.universe is not self.universe:
+				raise ValueError(f'Expected families over the same universe')
+			return other.words
+		return self._row(other)
+
+	def __repr__(self):
+		return f'BitsetFamily({len(self)} subsets of {self.universe})'
+
+	def __len__(self):
+		return len(self.words)
+
+	def __getitem__(self, i):
+		if isinstance(i, int):
+			return Bitset(self.universe, int.from_bytes(self.words[i].tobytes(), 'little'))
+		return BitsetFamily(self.universe, self.words[i])
+
+	def __iter__(self):
+		return (self[i] for i in range(len(self)))
+
+	def __or__(self, other):
+		return BitsetFamily(self.universe, self.words | self._operand(other))
+
+	def __and__(self, other):
+		return BitsetFamily(self.universe, self.words & self._operand(other))
+
+	def __sub__(self, other):
+		return BitsetFamily(self.universe, self.words & ~self._operand(other))
+
+	def __xor__(self, other):
+		return BitsetFamily(self.universe, self.words ^ self._operand(other))
+
+	def cardinalities(self):
+		np = _numpy()
+		if hasattr(np, 'bitwise_count'):
+			return np.bitwise_count(self.words).sum(axis=1, dtype=np.int64)
+		bits = np.unpackbits(self.words.view(np.uint8), axis=1)
+		return bits.sum(axis=1, dtype=np.int64)
+
+	def subsets_of(self, other):
+		return ~(self.words & ~self._operand(other)).any(axis=1)
+
+	def supersets_of(self, other):
+		return ~(self._operand(other) & ~self.words).any(axis=1)
+
+	def intersects(self, other):
+		return (self.words & self._operand(other)).any(axis=1)
+
+	def containing(self, element):
+		i = self.universe.index.get(element)
+		if i is None:
+			raise ValueError(f'Expected {element} to be an element of {self.universe}')
+		return (self.words[:, i // 64] >> (i % 64)) & 1 == 1
+
+	def unique(self):
+		np = _numpy()
+		return BitsetFamily(self.universe, np.unique(self.words, axis=0))
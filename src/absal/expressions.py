@@ -0,0 +1,317 @@
+
+from ..utils import typename
+from ..properties import DomainError
+from .. import maps
+
+from .rings import Ring, UnitalRing
+
+
+class Expression:
+
+	__slots__ = ('builder', 'op', 'args', 'index')
+
+	def __init__(self, builder, op, args, index):
+		self.builder = builder
+		self.op = op
+		self.args = args
+		self.index = index
+
+	def __repr__(self):
+		if self.op == 'var':
+			return str(self.args[0])
+		if self.op == 'const':
+			return repr(self.args[0])
+		if self.op == 'neg':
+			return f'-{self.args[0]!r}'
+		symbol = {'add': '+', 'sub': '-', 'mul': '*'}[self.op]
+		return f'({self.args[0]!r} {symbol} {self.args[1]!r})'
+
+	def __add__(self, other):
+		return self.builder.add(self, other)
+
+	def __radd__(self, other):
+		return self.builder.add(other, self)
+
+	def __sub__(self, other):
+		return self.builder.sub(self, other)
+
+	def __rsub__(self, other):
+		return self.builder.sub(other, self)
+
+	def __mul__(self, other):
+		return self.builder.mul(self, other)
+
+	def __rmul__(self, other):
+		return self.builder.mul(other, self)
+
+	def __neg__(self):
+		return self.builder.neg(self)
+
+	def __pow__(self, k):
+		return self.builder.power(self, k)
+
+	@property
+	def is_constant(self):
+		return self.op == 'const'
+
+	@property
+	def value(self):
+		if self.op != 'const':
+			raise TypeError(f'Expected a constant expression, not {self}')
+		return self.args[0]
+
+	def nodes(self):
+		# every node reachable from self; children are always created before
+		# their parents, so sorting by index is a topological order
+		seen = {self.index: self}
+		stack = [self]
+		while stack:
+			for child in stack.pop().args:
+				if isinstance(child, Expression) and child.index not in seen:
+					seen[child.index] = child
+					stack.append(child)
+		return [seen[i] for i in sorted(seen)]
+
+	def variables(self):
+		return tuple(n.args[0] for n in self.nodes() if n.op == 'var')
+
+	def evaluate(self, assignment=None, **kwargs):
+		return self.builder.evaluate(self, assignment, **kwargs)
+
+	def evaluate_batch(self, columns=None, **kwargs):
+		return self.builder.evaluate_batch(self, columns, **kwargs)
+
+
+class RingExpressions:
+
+	__slots__ = ('ring', '_nodes', '_table', 'zero', 'one', '_commutative')
+
+	def __init__(self, ring):
+		if not isinstance(ring, Ring):
+			raise TypeError(f'Expected Ring, not {typename(ring)}')
+		self.ring = ring
+		self._nodes = []
+		self._table = {}
+		self._commutative = (
+			isinstance(ring.addition, maps.CommutativeOperation),
+			isinstance(ring.multiplication, maps.CommutativeOperation)
+		)
+		self.zero = self.constant(ring.addition.identity)
+		self.one = None
+		if isinstance(ring, UnitalRing):
+			self.one = self.constant(ring.multiplication.identity)
+
+	def __len__(self):
+		return len(self._nodes)
+
+	def _node(self, op, args):
+		# hash-consing: structurally identical subterms are one node
+		key = (op,) + tuple(a.index if isinstance(a, Expression) else a for a in args)
+		node = self._table.get(key)
+		if node is None:
+			node = Expression(self, op, args, len(self._nodes))
+			self._nodes.append(node)
+			self._table[key] = node
+		return node
+
+	def _coerce(self, candidate):
+		if isinstance(candidate, Expression):
+			if candidate.builder is not self:
+				raise ValueError(f'Expected an expression over {self.ring.aset}')
+			return candidate
+		return self.constant(candidate)
+
+	def variable(self, name):
+		if not isinstance(name, str):
+			raise TypeError(f'Expected str, not {typename(name)}')
+		return self._node('var', (name,))
+
+	def variables(self, *names):
+		return tuple(self.variable(name) for name in names)
+
+	def constant(self, value):
+		if isinstance(value, Expression):
+			raise TypeError(f'Expected a ring element, not {typename(value)}')
+		if ('const', value) not in self._table and value not in self.ring.aset:
+			raise DomainError(f'Expected constant {value} to be in {self.ring.aset}')
+		return self._node('const', (value,))
+
+	def _ordered(self, a, b, commutative):
+		if commutative and b.index < a.index:
+			return b, a
+		return a, b
+
+	def add(self, a, b):
+		a, b = self._coerce(a), self._coerce(b)
+		if a is self.zero:
+			return b
+		if b is self.zero:
+			return a
+		if a.is_constant and b.is_constant:
+			return self.constant(self.ring.addition.mapping(a.value, b.value))
+		if b.op == 'neg' and b.args[0] is a or a.op == 'neg' and a.args[0] is b:
+			return self.zero
+		if b.op == 'neg':
+			return self.sub(a, b.args[0])
+		factored = self._factor(a, b)
+		if factored is not None:
+			return factored
+		return self._node('add', self._ordered(a, b, self._commutative[0]))
+
+	def _factor(self, a, b):
+		# distributivity is applied only in the direction that saves a
+		# multiplication: a*b + a*c -> a*(b + c), a*c + b*c -> (a + b)*c
+		if a.op != 'mul' or b.op != 'mul':
+			return None
+		(p, q), (r, s) = a.args, b.args
+		if p is r:
+			return self.mul(p, self.add(q, s))
+		if q is s:
+			return self.mul(self.add(p, r), q)
+		if self._commutative[1]:
+			if p is s:
+				return self.mul(p, self.add(q, r))
+			if q is r:
+				return self.mul(q, self.add(p, s))
+		return None
+
+	def neg(self, a):
+		a = self._coerce(a)
+		if a is self.zero:
+			return a
+		if a.op == 'neg':
+			return a.args[0]
+		if a.is_constant:
+			return self.constant(self.ring.additive_group.inverse(a.value))
+		if a.op == 'sub':
+			return self.sub(a.args[1], a.args[0])
+		return self._node('neg', (a,))
+
+	def sub(self, a, b):
+		a, b = self._coerce(a), self._coerce(b)
+		if a is b:
+			return self.zero
+		if b is self.zero:
+			return a
+		if a is self.zero:
+			return self.neg(b)
+		if a.is_constant and b.is_constant:
+			return self.constant(self.ring.addition.inverse_mapping.mapping(a.value, b.value))
+		if b.op == 'neg':
+			return self.add(a, b.args[0])
+		return self._node('sub', (a, b))
+
+	def mul(self, a, b):
+		a, b = self._coerce(a), self._coerce(b)
+		if a is self.zero or b is self.zero:
+			return self.zero
+		if a is self.one:
+			return b
+		if b is self.one:
+			return a
+		if a.is_constant and b.is_constant:
+			return self.constant(self.ring.multiplication.mapping(a.value, b.value))
+		if a.op == 'neg' and b.op == 'neg':
+			return self.mul(a.args[0], b.args[0])
+		return self._node('mul', self._ordered(a, b, self._commutative[1]))
+
+	def power(self, a, k):
+		if not isinstance(k, int):
+			raise TypeError(f'Expected int, not {typename(k)}')
+		if k < 1 and (k < 0 or self.one is None):
+			raise ValueError(f'Expected a positive exponent, not {k}')
+		a = self._coerce(a)
+		# square-and-multiply; the squares are shared nodes of the DAG
+		result = self.one
+		while k:
+			if k & 1:
+				result = a if result is None else self.mul(result, a)
+			k >>= 1
+			if k:
+				a = self.mul(a, a)
+		return result
+
+	def sum(self, terms):
+		result = self.zero
+		for t in terms:
+			result = self.add(result, t)
+		return result
+
+	def product(self, factors):
+		result = self.one
+		for f in factors:
+			result = f if result is None else self.mul(result, f)
+		if result is None:
+			raise ValueError(f'Expected at least one factor in a ring without identity')
+		return result
+
+	def _operations(self):
+		ring = self.ring
+		subtract = ring.addition.inverse_mapping.mapping
+		zero = ring.addition.identity
+		return {
+			'add': ring.addition.mapping,
+			'sub': subtract,
+			'neg': lambda a: subtract(zero, a),
+			'mul': ring.multiplication.mapping
+		}
+
+	def _leaves(self, expression, assignment, kwargs):
+		expression = self._coerce(expression)
+		assignment = dict(assignment or {}, **kwargs)
+		nodes = expression.nodes()
+		for n in nodes:
+			if n.op == 'var' and n.args[0] not in assignment:
+				raise ValueError(f'Expected a value for variable {n.args[0]}')
+		return expression, nodes, assignment
+
+	def evaluate(self, expression, assignment=None, **kwargs):
+		expression, nodes, assignment = self._leaves(expression, assignment, kwargs)
+		aset = self.ring.aset
+		operations = self._operations()
+		open_products = self.ring.multiplication.range is not aset
+		# closed operations are trusted once the leaves are in the ring, so
+		# each variable is checked once however often it occurs
+		values = {}
+		for n in nodes:
+			if n.op == 'var':
+				value = assignment[n.args[0]]
+				if value not in aset:
+					raise DomainError(f'Expected {n.args[0]} = {value} to be in {aset}')
+			elif n.op == 'const':
+				value = n.args[0]
+			else:
+				value = operations[n.op](*(values[a.index] for a in n.args))
+				if open_products and n.op == 'mul' and value not in aset:
+					raise DomainError(f'Expected product {value} to be in {aset}')
+			values[n.index] = value
+		return values[expression.index]
+
+	def evaluate_batch(self, expression, columns=None, **kwargs):
+		expression, nodes, columns = self._leaves(expression, columns, kwargs)
+		columns = {name: tuple(column) for name, column in columns.items()}
+		sizes = {len(columns[n.args[0]]) for n in nodes if n.op == 'var'}
+		if len(sizes) > 1:
+			raise ValueError(f'Expected columns of equal length, got lengths {sorted(sizes)}')
+		size = sizes.pop() if sizes else 1
+		aset = self.ring.aset
+		operations = self._operations()
+		open_products = self.ring.multiplication.range is not aset
+		values = {}
+		for n in nodes:
+			if n.op == 'var':
+				value = columns[n.args[0]]
+				for v in value:
+					if v not in aset:
+						raise DomainError(f'Expected {n.args[0]} = {v} to be in {aset}')
+			elif n.op == 'const':
+				value = (n.args[0],) * size
+			else:
+				f = operations[n.op]
+				value = tuple(map(f, *(values[a.index] for a in n.args)))
+				if open_products and n.op == 'mul':
+					for v in value:
+						if v not in aset:
+							raise DomainError(f'Expected product {v} to be in {aset}')
+			values[n.index] = value
+		return list(values[expression.index])
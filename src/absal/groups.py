@@ -1,18 +1,79 @@
+import math
+import random
+import itertools
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 
-from algae.utils import typename
-from algae.algaeset import AlgaeSet
-from algae.maps import GroupOperation
+from ..utils import typename, factorize, crt
+from ..algaeset import AlgaeSet, FrozenAlgaeSet
+from ..maps import BinaryOperation, GroupOperation
+
+from .bitsets import Universe, Bitset, positions
+
+
+# subgroups are keyed by the bitmask of their element indices in the
+# Cayley table; the helpers below are module level so worker processes can
+# run them on a shared table
+
+def _join(table, key, generators, g):
+	# the subgroup generated by the subgroup `key` and the element g; the
+	# old members are already closed under the old generators
+	generators = generators + (g,)
+	frontier, step = positions(key), (g,)
+	while frontier:
+		fresh = []
+		for x in frontier:
+			row = table[x]
+			for s in step:
+				y = row[s]
+				if not key >> y & 1:
+					key |= 1 << y
+					fresh.append(y)
+		frontier, step = fresh, generators
+	return key, generators
+
+def _is_power(n, p):
+	while n % p == 0:
+		n //= p
+	return n == 1
+
+def _extend(table, cyclic, candidates):
+	joins = {}
+	for key, generators in candidates:
+		for c, g in cyclic:
+			if c & ~key:
+				joined, joined_generators = _join(table, key, generators, g)
+				joins.setdefault(joined, joined_generators)
+	return list(joins.items())
+
+_shared = None
+
+def _share(table, cyclic):
+	global _shared
+	_shared = (table, cyclic)
+
+def _extend_shared(candidates):
+	return _extend(*_shared, candidates)
 
 
 class Group:
 
-	def __init__(self, aset, binop):
+	__slots__ = ('aset', 'binop', 'generators', '_cache')
+
+	def __init__(self, aset, binop, generators=None):
 		if not isinstance(binop, GroupOperation):
 			raise TypeError(f'Expected a GroupOperation, not {typename(binop)}')
 		if binop.domain != aset:
 			raise ValueError(f'Expected binary operation\'s domain to be {aset}')
+		if generators is not None:
+			generators = tuple(generators)
+			for g in generators:
+				if g not in aset:
+					raise ValueError(f'Expected generator {g} to be in {aset}')
 		self.aset = aset
 		self.binop = binop
+		self.generators = generators
+		self._cache = {}
 
 	def has_subgroup(self, candidate):
 		if not isinstance(candidate, Group):
@@ -24,30 +85,498 @@ class Group:
 			raise TypeError(f'Expected Group, not {typename(candidate)}')
 		return self.aset.is_proper_subset(candidate.aset)
 
+	@property
+	def order(self):
+		if self.aset.is_infinite:
+			raise ValueError(f'Infinite group over {self.aset} has no finite order')
+		return len(self.aset.elements)
+
+	@property
+	def elements(self):
+		if 'elements' not in self._cache:
+			if self.aset.is_infinite:
+				raise ValueError(f'Cannot index the elements of infinite group over {self.aset}')
+			self._cache['elements'] = tuple(self.aset)
+		return self._cache['elements']
+
+	@property
+	def index(self):
+		if 'index' not in self._cache:
+			self._cache['index'] = {e: i for i, e in enumerate(self.elements)}
+		return self._cache['index']
+
+	def universe(self):
+		# subsets of a finite group share one element index with its Cayley
+		# table and subgroup keys
+		if 'universe' not in self._cache:
+			self._cache['universe'] = Universe(self.elements, self.index)
+		return self._cache['universe']
+
+	def bitset(self, subset):
+		return self.universe().subset(subset)
+
+	def cayley_table(self):
+		# row i, column j holds the index of elements[i] * elements[j]
+		if 'cayley_table' not in self._cache:
+			op, elements, index = self.binop.mapping, self.elements, self.index
+			self._cache['cayley_table'] = tuple(
+				tuple(index[op(a, b)] for b in elements) for a in elements
+			)
+		return self._cache['cayley_table']
+
+	def closure(self, generators):
+		op = self.binop.mapping
+		generators = tuple(generators)
+		members = {self.binop.identity}
+		frontier = list(members)
+		while frontier:
+			fresh = []
+			for x in frontier:
+				for s in generators:
+					y = op(x, s)
+					if y not in members:
+						members.add(y)
+						fresh.append(y)
+			frontier = fresh
+		return members
+
+	def generating_set(self):
+		if self.generators is not None:
+			return self.generators
+		if 'generators' not in self._cache:
+			generators, members = [], {self.binop.identity}
+			for g in self.elements:
+				if g not in members:
+					generators.append(g)
+					members = self.closure(generators)
+			self._cache['generators'] = tuple(generators)
+		return self._cache['generators']
+
+	def subgroup(self, generators):
+		generators = tuple(generators)
+		for g in generators:
+			if g not in self.aset:
+				raise ValueError(f'Expected generator {g} to be in {self.aset}')
+		return self._restricted(self.closure(generators), generators)
+
+	def _restricted(self, elements, generators=None):
+		# elements must already be closed under the operation
+		aset = FrozenAlgaeSet(*elements)
+		inverse_mapping = self.binop.inverse_mapping.mapping
+		return Group(
+			aset,
+			GroupOperation(
+				self.binop.mapping,
+				BinaryOperation(inverse_mapping, aset, aset),
+				aset,
+				self.binop.identity
+			),
+			generators
+		)
+
+	def _cyclic_keys(self, table, identity):
+		cyclic = {}
+		for g in range(len(table)):
+			cyclic.setdefault(_join(table, 1 << identity, (), g)[0], g)
+		return cyclic
+
+	def _subgroup_keys(self, processes=None, chunk_size=64):
+		# cyclic subgroups are joined upward one layer at a time; only the
+		# keys seen so far and the current layer are held in memory
+		table = self.cayley_table()
+		identity = self.index[self.binop.identity]
+		cyclic = tuple(self._cyclic_keys(table, identity).items())
+		seen = {1 << identity}
+		yield 1 << identity, ()
+		frontier = []
+		for key, g in cyclic:
+			if key not in seen:
+				seen.add(key)
+				frontier.append((key, (g,)))
+				yield key, (g,)
+		executor = None
+		if processes is not None and processes > 1:
+			executor = ProcessPoolExecutor(processes, initializer=_share, initargs=(table, cyclic))
+		try:
+			while frontier:
+				chunks = [frontier[i:i + chunk_size] for i in range(0, len(frontier), chunk_size)]
+				if executor is None:
+					results = (_extend(table, cyclic, chunk) for chunk in chunks)
+				else:
+					results = executor.map(_extend_shared, chunks)
+				frontier = []
+				for joins in results:
+					for key, generators in joins:
+						if key not in seen:
+							seen.add(key)
+							frontier.append((key, generators))
+							yield key, generators
+		finally:
+			if executor is not None:
+				executor.shutdown(cancel_futures=True)
+
+	def _from_key(self, key, generators=()):
+		elements = self.elements
+		return self._restricted(
+			(elements[i] for i in positions(key)), tuple(elements[i] for i in generators)
+		)
+
+	def subgroups(self, processes=None):
+		if processes is not None and not isinstance(processes, int):
+			raise TypeError(f'Expected int, not {typename(processes)}')
+		for key, generators in self._subgroup_keys(processes):
+			yield self._from_key(key, generators)
+
+	def subgroup_lattice(self, processes=None):
+		if processes is not None and not isinstance(processes, int):
+			raise TypeError(f'Expected int, not {typename(processes)}')
+		return SubgroupLattice(self, self._subgroup_keys(processes))
+
+	def sylow_subgroups(self, p):
+		if not isinstance(p, int):
+			raise TypeError(f'Expected int, not {typename(p)}')
+		if p < 2 or factorize(p) != {p: 1}:
+			raise ValueError(f'Expected a prime, not {p}')
+		order = self.order
+		target = 1
+		while order % p == 0:
+			order //= p
+			target *= p
+		table = self.cayley_table()
+		identity = self.index[self.binop.identity]
+		cyclic = [
+			(key, g) for key, g in self._cyclic_keys(table, identity).items()
+			if _is_power(key.bit_count(), p)
+		]
+		# some p-subgroup always extends by one cyclic p-subgroup of its
+		# normalizer, so growing greedily reaches a Sylow subgroup
+		key, generators = 1 << identity, ()
+		while key.bit_count() < target:
+			for c, g in cyclic:
+				if c & ~key:
+					joined, joined_generators = _join(table, key, generators, g)
+					if _is_power(joined.bit_count(), p):
+						key, generators = joined, joined_generators
+						break
+		# the Sylow p-subgroups are exactly the conjugates of one of them
+		members = positions(key)
+		inverses = [row.index(identity) for row in table]
+		seen = set()
+		for x in range(len(table)):
+			row, inverse = table[x], inverses[x]
+			conjugate = 0
+			for m in members:
+				conjugate |= 1 << table[row[m]][inverse]
+			if conjugate not in seen:
+				seen.add(conjugate)
+				yield self._from_key(conjugate, [table[table[x][g]][inverse] for g in generators])
+
+	def _class_labels(self):
+		# union-find over element indices; conjugating by a generating set
+		# already joins every conjugacy class
+		if 'class_labels' not in self._cache:
+			op, elements, index = self.binop.mapping, self.elements, self.index
+			parent = array('l', range(len(elements)))
+			def find(i):
+				while parent[i] != i:
+					parent[i] = parent[parent[i]]
+					i = parent[i]
+				return i
+			for s in self.generating_set():
+				s_inverse = self.inverse(s)
+				for i, x in enumerate(elements):
+					j = index[op(op(s, x), s_inverse)]
+					root_i, root_j = find(i), find(j)
+					if root_i != root_j:
+						parent[max(root_i, root_j)] = min(root_i, root_j)
+			labels = array('l', bytes(parent.itemsize * len(elements)))
+			roots = {}
+			for i in range(len(elements)):
+				labels[i] = roots.setdefault(find(i), len(roots))
+			# one label per element instead of one |G|-bit set per class,
+			# which would be quadratic for groups with many small classes
+			self._cache['class_labels'] = labels
+		return self._cache['class_labels']
+
+	def conjugacy_classes(self):
+		if 'conjugacy_classes' not in self._cache:
+			members = {}
+			for e, label in zip(self.elements, self._class_labels()):
+				members.setdefault(label, []).append(e)
+			self._cache['conjugacy_classes'] = tuple(
+				AlgaeSet(*c) for c in members.values()
+			)
+		return self._cache['conjugacy_classes']
+
+	def conjugacy_class(self, g):
+		if g not in self.aset:
+			raise ValueError(f'Expected {g} to be in {self.aset}')
+		return self.conjugacy_classes()[self._class_labels()[self.index[g]]]
+
+	def center(self):
+		if 'center' not in self._cache:
+			labels = self._class_labels()
+			sizes = {}
+			for label in labels:
+				sizes[label] = sizes.get(label, 0) + 1
+			self._cache['center'] = self._restricted(
+				e for e, label in zip(self.elements, labels) if sizes[label] == 1
+			)
+		return self._cache['center']
+
+	def centralizer(self, g):
+		if g not in self.aset:
+			raise ValueError(f'Expected {g} to be in {self.aset}')
+		centralizers = self._cache.setdefault('centralizers', {})
+		if g not in centralizers:
+			op = self.binop.mapping
+			centralizers[g] = self._restricted(
+				x for x in self.elements if op(x, g) == op(g, x)
+			)
+		return centralizers[g]
+
+	# the algorithms below run on the raw mapping: every intermediate product
+	# is an element of the group, so per-call domain and axiom checks would
+	# only repeat themselves
+
+	def inverse(self, g):
+		return self.binop.inverse_mapping.mapping(self.binop.identity, g)
+
+	def power(self, g, k):
+		if k < 0:
+			g, k = self.inverse(g), -k
+		op = self.binop.mapping
+		result = self.binop.identity
+		while k:
+			if k & 1:
+				result = op(result, g)
+			g = op(g, g)
+			k >>= 1
+		return result
+
+	def order_of(self, g, factorization=None):
+		if g not in self.aset:
+			raise ValueError(f'Expected {g} to be in {self.aset}')
+		if factorization is None:
+			factorization = factorize(self.order)
+		identity = self.binop.identity
+		order = math.prod(p**e for p, e in factorization.items())
+		if self.power(g, order) != identity:
+			raise ValueError(f'Expected the order of {g} to divide {order}')
+		for p in factorization:
+			while order % p == 0 and self.power(g, order // p) == identity:
+				order //= p
+		return order
+
+	def discrete_log(self, g, h, method='auto', factorization=None):
+		if method not in ('auto', 'bsgs', 'rho', 'pohlig_hellman'):
+			raise ValueError(f'Unknown discrete logarithm method {method!r}')
+		if h not in self.aset:
+			raise ValueError(f'Expected {h} to be in {self.aset}')
+		if factorization is None:
+			factorization = factorize(self.order)
+		order = self.order_of(g, factorization)
+		if method == 'bsgs':
+			x = self._baby_step_giant_step(g, h, order)
+		else:
+			factors = {}
+			for p in factorization:
+				m = order
+				while m % p == 0:
+					factors[p] = factors.get(p, 0) + 1
+					m //= p
+			x = self._pohlig_hellman(g, h, order, factors, method)
+		if x is None or self.power(g, x) != h:
+			raise ValueError(f'{h} is not a power of {g}')
+		return x
+
+	def _baby_step_giant_step(self, g, h, order):
+		op = self.binop.mapping
+		steps = math.isqrt(order - 1) + 1
+		table = {}
+		baby = self.binop.identity
+		for j in range(steps):
+			table.setdefault(baby, j)
+			baby = op(baby, g)
+		giant = self.power(g, -steps)
+		for i in range(steps):
+			if h in table:
+				return i * steps + table[h]
+			h = op(h, giant)
+		return None
+
+	def _pollard_rho(self, g, h, order, seed=0):
+		# only used on subgroups of prime order, where every nonzero
+		# coefficient is invertible
+		op = self.binop.mapping
+		rng = random.Random(seed)
+		def step(x, a, b):
+			branch = hash(x) % 3
+			if branch == 0:
+				return op(x, g), (a + 1) % order, b
+			if branch == 1:
+				return op(x, x), 2 * a % order, 2 * b % order
+			return op(x, h), a, (b + 1) % order
+		for _ in range(16):
+			a, b = rng.randrange(order), rng.randrange(order)
+			x = op(self.power(g, a), self.power(h, b))
+			slow, fast = (x, a, b), (x, a, b)
+			for _ in range(4 * math.isqrt(order) + 16):
+				slow = step(*slow)
+				fast = step(*step(*fast))
+				if slow[0] == fast[0]:
+					break
+			else:
+				continue
+			r = (slow[2] - fast[2]) % order
+			if r == 0:
+				continue
+			x = (fast[1] - slow[1]) * pow(r, -1, order) % order
+			if self.power(g, x) == h:
+				return x
+		return None
+
+	def _solve_prime_order(self, g, h, p, method):
+		# rho trades the O(sqrt(p)) table of baby-step giant-step for
+		# constant memory; tiny primes are cheaper to tabulate
+		if p >= 32 and (method == 'rho' or (method == 'auto' and p > 2**40)):
+			return self._pollard_rho(g, h, p)
+		return self._baby_step_giant_step(g, h, p)
+
+	def _pohlig_hellman(self, g, h, order, factors, method):
+		op = self.binop.mapping
+		residues, moduli = [], []
+		for p, e in factors.items():
+			cofactor = order // p**e
+			g_p, h_p = self.power(g, cofactor), self.power(h, cofactor)
+			gamma = self.power(g_p, p**(e - 1))
+			x = 0
+			for k in range(e):
+				target = self.power(op(self.power(g_p, -x), h_p), p**(e - 1 - k))
+				digit = self._solve_prime_order(gamma, target, p, method)
+				if digit is None:
+					return None
+				x += digit * p**k
+			residues.append(x)
+			moduli.append(p**e)
+		return crt(residues, moduli)
+
 	@classmethod
 	def Z_mod(cls, n):
 		if not isinstance(n, int):
 			raise TypeError(f'Z can only be partitioned by integer modulo')
 		if not n > 0:
 			raise ValueError(f'Z can only be partitioned by positive modulo')
-		aset = AlgaeSet(*range(n))
+		aset = FrozenAlgaeSet(*range(n))
 		return cls(
 			aset,
 			GroupOperation(
 				lambda a, b: (a + b) % n,
-				lambda a, b: (a - b) if a >= b else (a - b) + n
-				domain=aset,
-				identity=0
+				BinaryOperation(lambda a, b: (a - b) if a >= b else (a - b) + n, aset, aset),
+				aset,
+				0
+			),
+			(1,) if n > 1 else ()
+		)
+
+	@classmethod
+	def symmetric(cls, n):
+		if not isinstance(n, int):
+			raise TypeError(f'Expected int, not {typename(n)}')
+		if not n > 0:
+			raise ValueError(f'Symmetric groups act on a positive number of points')
+		aset = FrozenAlgaeSet(*itertools.permutations(range(n)))
+		compose = lambda a, b: tuple(a[i] for i in b)
+		def divide(a, b):
+			inverse = [0] * n
+			for i, j in enumerate(b):
+				inverse[j] = i
+			return compose(a, inverse)
+		transposition = (1, 0) + tuple(range(2, n)) if n > 1 else tuple(range(n))
+		cycle = tuple(range(1, n)) + (0,)
+		return cls(
+			aset,
+			GroupOperation(
+				compose,
+				BinaryOperation(divide, aset, aset),
+				aset,
+				tuple(range(n))
+			),
+			(transposition, cycle)
+		)
+
+	@classmethod
+	def units_mod(cls, n):
+		if not isinstance(n, int):
+			raise TypeError(f'Z can only be partitioned by integer modulo')
+		if not n > 1:
+			raise ValueError(f'Units are only defined modulo integers greater than one')
+		aset = FrozenAlgaeSet(*(a for a in range(1, n) if math.gcd(a, n) == 1))
+		return cls(
+			aset,
+			GroupOperation(
+				lambda a, b: a * b % n,
+				BinaryOperation(lambda a, b: a * pow(b, -1, n) % n, aset, aset),
+				aset,
+				1
 			)
 		)
 
 
+class SubgroupLattice:
+
+	__slots__ = ('group', 'keys', 'generators', '_covers')
+
+	def __init__(self, group, keys):
+		self.group = group
+		generators = dict(keys)
+		self.keys = tuple(sorted(generators, key=lambda k: (k.bit_count(), k)))
+		self.generators = tuple(generators[k] for k in self.keys)
+		self._covers = None
+
+	def __len__(self):
+		return len(self.keys)
+
+	def __getitem__(self, i):
+		return self.group._from_key(self.keys[i], self.generators[i])
+
+	def __iter__(self):
+		return (self[i] for i in range(len(self.keys)))
+
+	def order(self, i):
+		return self.keys[i].bit_count()
+
+	def bitset(self, i):
+		return Bitset(self.group.universe(), self.keys[i])
+
+	def covers(self):
+		# covers()[j] holds the maximal subgroups of subgroup j, by index
+		if self._covers is None:
+			keys, covers = self.keys, []
+			for j, k in enumerate(keys):
+				# every proper subgroup lies in a maximal one of larger order,
+				# so scanning by decreasing order only tests the maximal ones
+				maximal = []
+				for i in range(j - 1, -1, -1):
+					if not keys[i] & ~k and all(keys[i] & ~keys[h] for h in maximal):
+						maximal.append(i)
+				covers.append(tuple(sorted(maximal)))
+			self._covers = tuple(covers)
+		return self._covers
+
+	def edges(self):
+		for j, below in enumerate(self.covers()):
+			for i in below:
+				yield i, j
+
+
 class LieGroup(Group):
 
+	__slots__ = ()
+
 	def __init__(self, aset, binop):
 		if not isinstance(aset, AlgaeSet):
 			raise TypeError(f'Expected AlgaeSet, not {typename(aset)}')
 		if aset.is_finite:
 			raise ValueError(f'Expected infinite set, not {aset}')
 		super().__init__(aset, binop)
-		
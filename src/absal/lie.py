@@ -0,0 +1,415 @@
+
+import abc
+import math
+
+from ..utils import typename
+from ..algaeset import AlgaeSet, _numpy
+from ..maps import BinaryOperation, GroupOperation
+from ..properties import AssociativityError, IdentityError, InvertibilityError
+
+from .groups import LieGroup
+
+
+# below this angle the closed forms divide by almost zero, so their Taylor
+# expansions take over
+_SMALL_ANGLE = 1e-4
+
+def _close(a, b, tolerance, ndim):
+	np = _numpy()
+	axes = tuple(range(-ndim, 0))
+	return (np.abs(a - b) <= tolerance * (1 + np.abs(b))).all(axis=axes)
+
+def _hat(w):
+	np = _numpy()
+	x, y, z = w[..., 0], w[..., 1], w[..., 2]
+	zero = np.zeros_like(x)
+	return np.stack((
+		np.stack((zero, -z, y), axis=-1),
+		np.stack((z, zero, -x), axis=-1),
+		np.stack((-y, x, zero), axis=-1)
+	), axis=-2)
+
+def _vee(W):
+	np = _numpy()
+	return np.stack((W[..., 2, 1], W[..., 0, 2], W[..., 1, 0]), axis=-1)
+
+def _rotation_coefficients(theta):
+	# A = sin(t) / t, B = (1 - cos(t)) / t^2, C = (t - sin(t)) / t^3
+	np = _numpy()
+	small = theta < _SMALL_ANGLE
+	t = np.where(small, 1.0, theta)
+	t2 = theta * theta
+	A = np.where(small, 1 - t2 / 6, np.sin(t) / t)
+	B = np.where(small, 0.5 - t2 / 24, (1 - np.cos(t)) / (t * t))
+	C = np.where(small, 1 / 6 - t2 / 120, (t - np.sin(t)) / (t * t * t))
+	return A, B, C
+
+def _so3_exp(w):
+	np = _numpy()
+	theta = np.linalg.norm(w, axis=-1)
+	A, B, _ = _rotation_coefficients(theta)
+	W = _hat(w)
+	return np.eye(3) + A[..., None, None] * W + B[..., None, None] * (W @ W)
+
+def _so3_log(R):
+	np = _numpy()
+	skew = _vee(R - np.swapaxes(R, -1, -2))
+	# atan2 keeps full precision near a half turn, where arccos does not
+	cos = np.clip((np.trace(R, axis1=-2, axis2=-1) - 1) / 2, -1.0, 1.0)
+	sin = np.linalg.norm(skew, axis=-1) / 2
+	theta = np.arctan2(sin, cos)
+	small = theta < _SMALL_ANGLE
+	factor = np.where(small, 0.5 + theta * theta / 12, theta / (2 * np.where(small, 1.0, sin)))
+	w = factor[..., None] * skew
+	# near a half turn sin(t) vanishes and the axis is read off the
+	# symmetric part, R + R^T = 2 cos(t) I + 2 (1 - cos(t)) n n^T
+	flipped = theta > math.pi - _SMALL_ANGLE
+	if flipped.any():
+		S = (R[flipped] + np.swapaxes(R[flipped], -1, -2)) / 2
+		c = cos[flipped][:, None, None]
+		nn = (S - c * np.eye(3)) / (1 - c)
+		k = np.argmax(np.diagonal(nn, axis1=-2, axis2=-1), axis=-1)
+		rows = np.arange(len(k))
+		n = nn[rows, :, k] / np.sqrt(nn[rows, k, k])[:, None]
+		sign = np.where((n * skew[flipped]).sum(axis=-1) < 0, -1.0, 1.0)
+		w[flipped] = (sign * theta[flipped])[:, None] * n
+	return w
+
+
+class LieElement:
+
+	__slots__ = ('array', 'tolerance')
+
+	def __init__(self, array, tolerance):
+		np = _numpy()
+		array = np.array(array, dtype=float)
+		array.setflags(write=False)
+		self.array = array
+		self.tolerance = tolerance
+
+	@property
+	def shape(self):
+		return self.array.shape
+
+	def __repr__(self):
+		return f'LieElement({self.array.tolist()})'
+
+	# equality is approximate and not transitive, so no hash can agree with
+	# it; elements cannot be dict keys or members of finite sets
+	def __eq__(self, other):
+		if self is other:
+			return True
+		if not isinstance(other, LieElement) or self.shape != other.shape:
+			return False
+		return bool(_close(self.array, other.array, self.tolerance, self.array.ndim))
+
+	__hash__ = None
+
+
+class NumericLieGroup(LieGroup, abc.ABC):
+
+	__slots__ = ('tolerance',)
+
+	SHAPE = ()
+	DIMENSION = 0
+
+	def __init__(self, tolerance=1e-9):
+		_numpy()
+		if not isinstance(tolerance, (int, float)):
+			raise TypeError(f'Expected a float tolerance, not {typename(tolerance)}')
+		if not tolerance > 0:
+			raise ValueError(f'Expected a positive tolerance, not {tolerance}')
+		self.tolerance = tolerance
+		shape = self.SHAPE
+		aset = AlgaeSet.from_type(LieElement).such_that(
+			lambda g: g.shape == shape and bool(self.contains_batch(g.array))
+		).freeze()
+		super().__init__(
+			aset,
+			GroupOperation(
+				lambda a, b: self.wrap(self.compose_batch(a.array, b.array)),
+				BinaryOperation(
+					lambda a, b: self.wrap(self.compose_batch(a.array, self.inverse_batch(b.array))),
+					aset,
+					aset
+				),
+				aset,
+				self.wrap(self.identity_array())
+			)
+		)
+
+	def wrap(self, array):
+		return LieElement(array, self.tolerance)
+
+	def element(self, array):
+		g = self.wrap(array)
+		if g not in self.aset:
+			raise ValueError(f'Expected an element of {typename(self)}, not {g}')
+		return g
+
+	def exp(self, v):
+		np = _numpy()
+		v = np.asarray(v, dtype=float)
+		if v.shape != (self.DIMENSION,):
+			raise ValueError(f'Expected a tangent vector of shape {(self.DIMENSION,)}, not {v.shape}')
+		return self.wrap(self.exp_batch(v))
+
+	def log(self, g):
+		if g not in self.aset:
+			raise ValueError(f'Expected {g} to be in {typename(self)}')
+		return self.log_batch(g.array)
+
+	def act(self, g, points):
+		if g not in self.aset:
+			raise ValueError(f'Expected {g} to be in {typename(self)}')
+		return self.act_batch(g.array, points)
+
+	def check_axioms(self, samples):
+		# every sample is tested against its two cyclic successors, so one
+		# vectorized pass covers associativity, identity and inverses
+		np = _numpy()
+		a = np.asarray(samples, dtype=float)
+		if a.shape[1:] != self.SHAPE:
+			raise ValueError(f'Expected samples of shape (N, {", ".join(map(str, self.SHAPE))}), not {a.shape}')
+		if not self.contains_batch(a).all():
+			raise ValueError(f'Expected every sample to be in {typename(self)}')
+		b, c = np.roll(a, 1, axis=0), np.roll(a, 2, axis=0)
+		compose, ndim = self.compose_batch, len(self.SHAPE)
+		close = lambda x, y: _close(x, y, self.tolerance, ndim).all()
+		if not close(compose(compose(a, b), c), compose(a, compose(b, c))):
+			raise AssociativityError(f'Composition in {typename(self)} is not associative')
+		identity = np.broadcast_to(self.identity_array(), a.shape)
+		if not (close(compose(a, identity), a) and close(compose(identity, a), a)):
+			raise IdentityError(f'{typename(self)} does not have identity {self.identity_array().tolist()}')
+		if not close(compose(a, self.inverse_batch(a)), identity):
+			raise InvertibilityError(f'Inversion in {typename(self)} does not invert composition')
+
+	# batched operations take arrays of shape (..., *SHAPE) and tangent
+	# vectors of shape (..., DIMENSION) and broadcast over the leading axes
+
+	@abc.abstractmethod
+	def identity_array(self):
+		...
+
+	@abc.abstractmethod
+	def contains_batch(self, a):
+		...
+
+	def compose_batch(self, a, b):
+		np = _numpy()
+		return np.matmul(a, b)
+
+	@abc.abstractmethod
+	def inverse_batch(self, a):
+		...
+
+	@abc.abstractmethod
+	def exp_batch(self, v):
+		...
+
+	@abc.abstractmethod
+	def log_batch(self, a):
+		...
+
+	@abc.abstractmethod
+	def act_batch(self, a, points):
+		...
+
+
+class SO2(NumericLieGroup):
+
+	__slots__ = ()
+
+	SHAPE = (2, 2)
+	DIMENSION = 1
+
+	def identity_array(self):
+		np = _numpy()
+		return np.eye(2)
+
+	def contains_batch(self, a):
+		np = _numpy()
+		a = np.asarray(a, dtype=float)
+		orthogonal = _close(np.swapaxes(a, -1, -2) @ a, np.eye(2), self.tolerance, 2)
+		return orthogonal & (np.linalg.det(a) > 0)
+
+	def inverse_batch(self, a):
+		np = _numpy()
+		return np.swapaxes(a, -1, -2)
+
+	def exp_batch(self, v):
+		np = _numpy()
+		theta = np.asarray(v, dtype=float)[..., 0]
+		c, s = np.cos(theta), np.sin(theta)
+		return np.stack((np.stack((c, -s), axis=-1), np.stack((s, c), axis=-1)), axis=-2)
+
+	def log_batch(self, a):
+		np = _numpy()
+		return np.arctan2(a[..., 1, 0], a[..., 0, 0])[..., None]
+
+	def act_batch(self, a, points):
+		np = _numpy()
+		return (np.asarray(a) @ np.asarray(points, dtype=float)[..., None])[..., 0]
+
+
+class SO3(NumericLieGroup):
+
+	__slots__ = ()
+
+	SHAPE = (3, 3)
+	DIMENSION = 3
+
+	def identity_array(self):
+		np = _numpy()
+		return np.eye(3)
+
+	def contains_batch(self, a):
+		np = _numpy()
+		a = np.asarray(a, dtype=float)
+		orthogonal = _close(np.swapaxes(a, -1, -2) @ a, np.eye(3), self.tolerance, 2)
+		return orthogonal & (np.linalg.det(a) > 0)
+
+	def inverse_batch(self, a):
+		np = _numpy()
+		return np.swapaxes(a, -1, -2)
+
+	def exp_batch(self, v):
+		np = _numpy()
+		return _so3_exp(np.asarray(v, dtype=float))
+
+	def log_batch(self, a):
+		np = _numpy()
+		return _so3_log(np.asarray(a, dtype=float))
+
+	def act_batch(self, a, points):
+		np = _numpy()
+		return (np.asarray(a) @ np.asarray(points, dtype=float)[..., None])[..., 0]
+
+
+class SE3(NumericLieGroup):
+
+	__slots__ = ()
+
+	# homogeneous 4x4 transforms; tangent vectors are (translation, rotation)
+	SHAPE = (4, 4)
+	DIMENSION = 6
+
+	def identity_array(self):
+		np = _numpy()
+		return np.eye(4)
+
+	def contains_batch(self, a):
+		np = _numpy()
+		a = np.asarray(a, dtype=float)
+		R = a[..., :3, :3]
+		rotation = _close(np.swapaxes(R, -1, -2) @ R, np.eye(3), self.tolerance, 2)
+		rotation &= np.linalg.det(R) > 0
+		bottom = _close(a[..., 3, :], np.array([0.0, 0.0, 0.0, 1.0]), self.tolerance, 1)
+		return rotation & bottom
+
+	def inverse_batch(self, a):
+		np = _numpy()
+		a = np.asarray(a, dtype=float)
+		R_inverse = np.swapaxes(a[..., :3, :3], -1, -2)
+		inverse = np.zeros(a.shape)
+		inverse[..., :3, :3] = R_inverse
+		inverse[..., :3, 3] = -(R_inverse @ a[..., :3, 3, None])[..., 0]
+		inverse[..., 3, 3] = 1
+		return inverse
+
+	def exp_batch(self, v):
+		np = _numpy()
+		v = np.asarray(v, dtype=float)
+		rho, w = v[..., :3], v[..., 3:]
+		theta = np.linalg.norm(w, axis=-1)
+		A, B, C = _rotation_coefficients(theta)
+		W = _hat(w)
+		W2 = W @ W
+		V = np.eye(3) + B[..., None, None] * W + C[..., None, None] * W2
+		g = np.zeros(v.shape[:-1] + (4, 4))
+		g[..., :3, :3] = np.eye(3) + A[..., None, None] * W + B[..., None, None] * W2
+		g[..., :3, 3] = (V @ rho[..., None])[..., 0]
+		g[..., 3, 3] = 1
+		return g
+
+	def log_batch(self, a):
+		np = _numpy()
+		a = np.asarray(a, dtype=float)
+		w = _so3_log(a[..., :3, :3])
+		theta = np.linalg.norm(w, axis=-1)
+		A, B, _ = _rotation_coefficients(theta)
+		small = theta < _SMALL_ANGLE
+		t = np.where(small, 1.0, theta)
+		D = np.where(small, 1 / 12 + theta * theta / 720, (1 - A / (2 * B)) / (t * t))
+		W = _hat(w)
+		V_inverse = np.eye(3) - W / 2 + D[..., None, None] * (W @ W)
+		rho = (V_inverse @ a[..., :3, 3, None])[..., 0]
+		return np.concatenate((rho, w), axis=-1)
+
+	def act_batch(self, a, points):
+		np = _numpy()
+		a = np.asarray(a)
+		points = np.asarray(points, dtype=float)
+		return (a[..., :3, :3] @ points[..., None])[..., 0] + a[..., :3, 3]
+
+
+class UnitQuaternions(NumericLieGroup):
+
+	__slots__ = ()
+
+	# quaternions are stored as (w, x, y, z)
+	SHAPE = (4,)
+	DIMENSION = 3
+
+	def identity_array(self):
+		np = _numpy()
+		return np.array([1.0, 0.0, 0.0, 0.0])
+
+	def contains_batch(self, a):
+		np = _numpy()
+		norm = np.linalg.norm(np.asarray(a, dtype=float), axis=-1)
+		return np.abs(norm - 1) <= self.tolerance
+
+	def compose_batch(self, a, b):
+		np = _numpy()
+		a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+		w1, v1 = a[..., :1], a[..., 1:]
+		w2, v2 = b[..., :1], b[..., 1:]
+		w = w1 * w2 - (v1 * v2).sum(axis=-1, keepdims=True)
+		v = w1 * v2 + w2 * v1 + np.cross(v1, v2)
+		return np.concatenate((w, v), axis=-1)
+
+	def inverse_batch(self, a):
+		np = _numpy()
+		a = np.asarray(a, dtype=float)
+		return np.concatenate((a[..., :1], -a[..., 1:]), axis=-1)
+
+	def exp_batch(self, v):
+		np = _numpy()
+		v = np.asarray(v, dtype=float)
+		theta = np.linalg.norm(v, axis=-1)
+		A, _, _ = _rotation_coefficients(theta)
+		return np.concatenate((np.cos(theta)[..., None], A[..., None] * v), axis=-1)
+
+	def log_batch(self, a):
+		np = _numpy()
+		a = np.asarray(a, dtype=float)
+		w, v = a[..., 0], a[..., 1:]
+		n = np.linalg.norm(v, axis=-1)
+		theta = np.arctan2(n, w)
+		# around the identity theta / n tends to 1 / w
+		small = (n < _SMALL_ANGLE**2) & (w > 0)
+		factor = np.where(small, 1 / np.where(small, w, 1.0), theta / np.where(n == 0, 1.0, n))
+		return factor[..., None] * v
+
+	def act_batch(self, a, points):
+		np = _numpy()
+		a = np.asarray(a, dtype=float)
+		points = np.asarray(points, dtype=float)
+		w, v = a[..., :1], a[..., 1:]
+		t = 2 * np.cross(v, points)
+		return points + w * t + np.cross(v, t)
+
+	def to_rotation_batch(self, a):
+		# the rotation a unit quaternion acts by; q and -q give the same one
+		return _so3_exp(self.log_batch(a) * 2)
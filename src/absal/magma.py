@@ -1,11 +1,15 @@
 
-from algae.utils import typename
-from algae.algaeset import AlgaeSet
-import algae.maps as maps
+from ..utils import typename
+from ..algaeset import AlgaeSet, FrozenAlgaeSet
+from .. import maps
+
+from .rewriting import Word, RewritingSystem, MAX_RULES
 
 
 class Magma:
 
+	__slots__ = ('aset', 'binop', 'presentation')
+
 	def __init__(self, aset, binop):
 		if not isinstance(aset, AlgaeSet):
 			raise TypeError(f'Expected an AlgaeSet, not {typename(aset)}')
@@ -15,6 +19,7 @@ class Magma:
 			raise ValueError(f'Expected binary operation to be closed over {aset}, not {binop.domain}')
 		self.aset = aset
 		self.binop = binop
+		self.presentation = None
 
 	def __contains__(self, candidate):
 		return candidate in self.aset
@@ -22,26 +27,78 @@ class Magma:
 	def __call__(self, a, b):
 		return self.binop(a, b)
 
+	def word(self, letters):
+		if self.presentation is None:
+			raise TypeError(f'Expected a {typename(self)} given by a presentation')
+		return Word(self.presentation.reduce(letters))
+
 
 class Semigroup(Magma):
 
+	__slots__ = ()
+
 	def __init__(self, aset, binop):
-		if not isinstance(binop, maps.ClosedAssociativeOperation):
-			raise TypeError(f'Expected a ClosedAssociativeOperation, not {typename(binop)}')
+		if not isinstance(binop, maps.AssociativeOperation):
+			raise TypeError(f'Expected an AssociativeOperation, not {typename(binop)}')
 		super().__init__(aset, binop)
 
+	@classmethod
+	def from_presentation(cls, generators, relations, max_rules=MAX_RULES):
+		# elements are the nonempty words in normal form
+		relations = tuple(relations)
+		for relation in relations:
+			if isinstance(relation, str) or '' in relation:
+				raise ValueError(f'Semigroup relations must equate two nonempty words, not {relation!r}')
+		system = RewritingSystem(generators, relations, max_rules)
+		words = lambda: (Word(w) for w in system.normal_forms() if w)
+		if system.is_finite:
+			aset = FrozenAlgaeSet(*words())
+		else:
+			aset = AlgaeSet.from_type(Word).such_that(lambda w: len(w) > 0 and system.is_normal(w.letters))
+			aset.register_enumerator(words)
+		semigroup = cls(
+			aset,
+			maps.ClosedAssociativeOperation(lambda a, b: Word(system.reduce(a.letters + b.letters)), aset)
+		)
+		semigroup.presentation = system
+		return semigroup
+
 
 class UnitalMagma(Magma):
 
+	__slots__ = ()
+
 	def __init__(self, aset, binop):
-		if not isinstance(binop, maps.ClosedIdentityOperation):
-			raise TypeError(f'Expected a ClosedIdentityOperation, not {typename(binop)}')
+		if not isinstance(binop, maps.IdentityOperation):
+			raise TypeError(f'Expected an IdentityOperation, not {typename(binop)}')
 		super().__init__(aset, binop)
 
 
 class Monoid(UnitalMagma):
 
+	__slots__ = ()
+
 	def __init__(self, aset, binop):
 		if not isinstance(binop, maps.ClosedAssociativeIdentityOperation):
 			raise TypeError(f'Expected a ClosedAssociativeIdentityOperation, not {typename(binop)}')
 		super().__init__(aset, binop)
+
+	@classmethod
+	def from_presentation(cls, generators, relations, max_rules=MAX_RULES):
+		# elements are the words in normal form, the empty word is the
+		# identity and a bare word w stands for the relation w = 1
+		system = RewritingSystem(generators, relations, max_rules)
+		words = lambda: (Word(w) for w in system.normal_forms())
+		if system.is_finite:
+			aset = FrozenAlgaeSet(*words())
+		else:
+			aset = AlgaeSet.from_type(Word).such_that(lambda w: system.is_normal(w.letters))
+			aset.register_enumerator(words)
+		monoid = cls(
+			aset,
+			maps.ClosedAssociativeIdentityOperation(
+				lambda a, b: Word(system.reduce(a.letters + b.letters)), aset, Word('')
+			)
+		)
+		monoid.presentation = system
+		return monoid
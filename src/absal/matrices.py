@@ -0,0 +1,368 @@
+
+import math
+
+from ..utils import typename, factorize
+from ..algaeset import AlgaeSet, _numpy
+from ..maps import BinaryOperation, ClosedAssociativeIdentityOperation, GroupOperation
+
+from .groups import Group
+from .rings import UnitalRing
+
+
+def _dtype(modulus, n):
+	# a row-by-column product sums n products of two residues, which has
+	# to fit into int64 before it is reduced
+	np = _numpy()
+	return np.int64 if n * (modulus - 1)**2 < 2**63 else object
+
+def _power_mod(x, e, modulus):
+	np = _numpy()
+	result = np.ones_like(x)
+	while e:
+		if e & 1:
+			result = result * x % modulus
+		x = x * x % modulus
+		e >>= 1
+	return result
+
+def _pivot(a, j):
+	# moves the first row at or below j with a nonzero entry in column j
+	# into row j, for every matrix of the stack at once
+	np = _numpy()
+	nonzero = a[:, j:, j] != 0
+	found = nonzero.any(axis=1)
+	pivot = j + nonzero.argmax(axis=1)
+	swapped = np.flatnonzero(pivot != j)
+	if swapped.size:
+		rows = pivot[swapped]
+		a[swapped, j], a[swapped, rows] = a[swapped, rows].copy(), a[swapped, j].copy()
+	return found, swapped
+
+def matmul_mod(a, b, modulus):
+	np = _numpy()
+	return np.matmul(a, b) % modulus
+
+def det_mod(a, modulus):
+	np = _numpy()
+	a = np.array(a)
+	n = a.shape[-1]
+	batch_shape = a.shape[:-2]
+	a = a.reshape(-1, n, n) % modulus
+	det = np.ones(a.shape[0], dtype=a.dtype)
+	for j in range(n):
+		found, swapped = _pivot(a, j)
+		det[swapped] = -det[swapped] % modulus
+		det = det * a[:, j, j] % modulus
+		# a missing pivot leaves a zero diagonal entry, so elimination below
+		# it only ever subtracts zero rows
+		factors = a[:, j + 1:, j] * _power_mod(a[:, j, j], modulus - 2, modulus)[:, None] % modulus
+		a[:, j + 1:] = (a[:, j + 1:] - factors[:, :, None] * a[:, None, j]) % modulus
+	return det.reshape(batch_shape)
+
+def inverse_mod(a, modulus):
+	np = _numpy()
+	a = np.array(a)
+	n = a.shape[-1]
+	batch_shape = a.shape[:-2]
+	a = a.reshape(-1, n, n) % modulus
+	identity = np.broadcast_to(np.eye(n, dtype=a.dtype), a.shape)
+	augmented = np.concatenate((a, identity), axis=2)
+	for j in range(n):
+		found, _ = _pivot(augmented, j)
+		if not found.all():
+			raise ValueError(f'Matrix is not invertible modulo {modulus}')
+		pivots = _power_mod(augmented[:, j, j], modulus - 2, modulus)
+		augmented[:, j] = augmented[:, j] * pivots[:, None] % modulus
+		factors = augmented[:, :, j].copy()
+		factors[:, j] = 0
+		augmented = (augmented - factors[:, :, None] * augmented[:, None, j]) % modulus
+	return augmented[:, :, n:].reshape(batch_shape + (n, n))
+
+
+class Matrix:
+
+	__slots__ = ('array', 'modulus', '_hash')
+
+	def __init__(self, entries, modulus):
+		np = _numpy()
+		if not isinstance(modulus, int):
+			raise TypeError(f'Expected int, not {typename(modulus)}')
+		if modulus < 2:
+			raise ValueError(f'Expected a modulus greater than one, not {modulus}')
+		array = np.asarray(entries)
+		if array.ndim != 2 or array.shape[0] != array.shape[1]:
+			raise ValueError(f'Expected a square matrix, not shape {array.shape}')
+		array = np.mod(array, modulus).astype(_dtype(modulus, array.shape[0]))
+		self._adopt(array, modulus)
+
+	@classmethod
+	def from_array(cls, array, modulus):
+		# skips validation; array must already be reduced and of the right dtype
+		_obj = cls.__new__(cls)
+		_obj._adopt(array, modulus)
+		return _obj
+
+	def _adopt(self, array, modulus):
+		array.setflags(write=False)
+		self.array = array
+		self.modulus = modulus
+		key = tuple(array.flat) if array.dtype == object else array.tobytes()
+		self._hash = hash((modulus, array.shape, key))
+
+	@property
+	def shape(self):
+		return self.array.shape
+
+	def __repr__(self):
+		return f'Matrix({self.array.tolist()}, {self.modulus})'
+
+	def __eq__(self, other):
+		if self is other:
+			return True
+		if not isinstance(other, Matrix):
+			return False
+		return (
+			self._hash == other._hash
+			and self.modulus == other.modulus
+			and self.shape == other.shape
+			and bool((self.array == other.array).all())
+		)
+
+	def __hash__(self):
+		return self._hash
+
+
+def _modulus_of(ring):
+	# a unital ring on 0, ..., m - 1 whose addition steps by one is Z/mZ,
+	# and distributivity then leaves only one possible multiplication
+	if not isinstance(ring, UnitalRing):
+		raise TypeError(f'Expected UnitalRing, not {typename(ring)}')
+	if ring.is_infinite:
+		raise ValueError(f'Expected a finite base ring')
+	elements = set(ring.aset)
+	m = len(elements)
+	step = ring.addition.mapping
+	if (
+		m < 2
+		or elements != set(range(m))
+		or ring.addition.identity != 0
+		or ring.multiplication.identity != 1
+		or any(step(a, 1) != (a + 1) % m for a in range(m))
+	):
+		raise ValueError(f'Expected the integers modulo some n > 1 as base ring')
+	return m
+
+
+class MatrixRing(UnitalRing):
+
+	__slots__ = ('base_ring', 'n', 'modulus', 'dtype', 'is_prime')
+
+	def __init__(self, base_ring, n):
+		_numpy()
+		if not isinstance(n, int):
+			raise TypeError(f'Expected int, not {typename(n)}')
+		if n < 1:
+			raise ValueError(f'Expected a positive dimension, not {n}')
+		modulus = _modulus_of(base_ring)
+		self.base_ring = base_ring
+		self.n = n
+		self.modulus = modulus
+		self.dtype = _dtype(modulus, n)
+		self.is_prime = factorize(modulus) == {modulus: 1}
+		aset = AlgaeSet.from_type(Matrix).such_that(
+			lambda m: m.modulus == modulus and m.shape == (n, n)
+		).freeze()
+		super().__init__(
+			aset,
+			GroupOperation(
+				lambda a, b: self.wrap(self.add_batch(a.array, b.array)),
+				BinaryOperation(lambda a, b: self.wrap(self.sub_batch(a.array, b.array)), aset, aset),
+				aset,
+				self.zero
+			),
+			ClosedAssociativeIdentityOperation(
+				lambda a, b: self.wrap(self.mul_batch(a.array, b.array)),
+				aset,
+				self.identity
+			)
+		)
+		# membership is a predicate on shape and modulus, but there are
+		# only finitely many matrices
+		self.is_infinite = False
+		self.is_finite = True
+
+	@property
+	def order(self):
+		return self.modulus**(self.n * self.n)
+
+	@property
+	def zero(self):
+		np = _numpy()
+		return self.wrap(np.zeros((self.n, self.n), dtype=self.dtype))
+
+	@property
+	def identity(self):
+		np = _numpy()
+		return self.wrap(np.eye(self.n, dtype=self.dtype))
+
+	def matrix(self, entries):
+		m = Matrix(entries, self.modulus)
+		if m.shape != (self.n, self.n):
+			raise ValueError(f'Expected a {self.n}x{self.n} matrix, not shape {m.shape}')
+		return m
+
+	def wrap(self, array):
+		return Matrix.from_array(array, self.modulus)
+
+	def stack(self, matrices):
+		np = _numpy()
+		return np.stack([m.array for m in matrices]) if matrices else (
+			np.empty((0, self.n, self.n), dtype=self.dtype)
+		)
+
+	def unstack(self, arrays):
+		np = _numpy()
+		return tuple(self.wrap(a) for a in np.asarray(arrays, dtype=self.dtype).reshape(-1, self.n, self.n))
+
+	# the batched operations take stacks of shape (..., n, n) of reduced
+	# entries and broadcast over the leading axes without domain checks
+
+	def add_batch(self, a, b):
+		np = _numpy()
+		return np.add(a, b, dtype=self.dtype) % self.modulus
+
+	def sub_batch(self, a, b):
+		np = _numpy()
+		return np.subtract(a, b, dtype=self.dtype) % self.modulus
+
+	def mul_batch(self, a, b):
+		np = _numpy()
+		return matmul_mod(
+			np.asarray(a, dtype=self.dtype), np.asarray(b, dtype=self.dtype), self.modulus
+		)
+
+	def _require_prime(self):
+		if not self.is_prime:
+			raise ValueError(f'Determinants and inverses require a prime modulus, not {self.modulus}')
+
+	def det_batch(self, a):
+		np = _numpy()
+		self._require_prime()
+		return det_mod(np.asarray(a, dtype=self.dtype), self.modulus)
+
+	def inverse_batch(self, a):
+		np = _numpy()
+		self._require_prime()
+		return inverse_mod(np.asarray(a, dtype=self.dtype), self.modulus)
+
+	def det(self, m):
+		if m not in self.aset:
+			raise ValueError(f'Expected {m} to be in {self.aset}')
+		return int(self.det_batch(m.array))
+
+	def inverse(self, m):
+		if m not in self.aset:
+			raise ValueError(f'Expected {m} to be in {self.aset}')
+		return self.wrap(self.inverse_batch(m.array))
+
+
+class MatrixGroup(Group):
+
+	__slots__ = ('ring', 'special')
+
+	def __init__(self, ring, special=False, generators=None):
+		if not isinstance(ring, MatrixRing):
+			raise TypeError(f'Expected MatrixRing, not {typename(ring)}')
+		ring._require_prime()
+		if special:
+			aset = ring.aset.such_that(lambda m: ring.det_batch(m.array) == 1).freeze()
+		else:
+			aset = ring.aset.such_that(lambda m: ring.det_batch(m.array) != 0).freeze()
+		self.ring = ring
+		self.special = special
+		if generators is None:
+			generators = self._standard_generators()
+		super().__init__(
+			aset,
+			GroupOperation(
+				ring.multiplication.mapping,
+				BinaryOperation(
+					lambda a, b: ring.wrap(ring.mul_batch(a.array, ring.inverse_batch(b.array))),
+					aset,
+					aset
+				),
+				aset,
+				ring.identity
+			),
+			generators
+		)
+
+	@classmethod
+	def general_linear(cls, n, p):
+		return cls(MatrixRing(UnitalRing.Z_mod(p), n))
+
+	@classmethod
+	def special_linear(cls, n, p):
+		return cls(MatrixRing(UnitalRing.Z_mod(p), n), special=True)
+
+	def _standard_generators(self):
+		# elementary transvections generate SL(n, p); a diagonal matrix
+		# holding a primitive root adds every determinant for GL(n, p)
+		np = _numpy()
+		n, p, dtype = self.ring.n, self.ring.modulus, self.ring.dtype
+		generators = []
+		for i in range(n):
+			for j in range(n):
+				if i != j:
+					array = np.eye(n, dtype=dtype)
+					array[i, j] = 1
+					generators.append(self.ring.wrap(array))
+		if not self.special and p > 2:
+			factors = factorize(p - 1)
+			root = next(
+				g for g in range(2, p)
+				if all(pow(g, (p - 1) // q, p) != 1 for q in factors)
+			)
+			array = np.eye(n, dtype=dtype)
+			array[0, 0] = root
+			generators.append(self.ring.wrap(array))
+		return tuple(generators)
+
+	@property
+	def order(self):
+		n, p = self.ring.n, self.ring.modulus
+		order = math.prod(p**n - p**i for i in range(n))
+		return order // (p - 1) if self.special else order
+
+	@property
+	def elements(self):
+		if 'elements' not in self._cache:
+			self._cache['elements'] = tuple(sorted(
+				self.closure(self.generating_set()), key=lambda m: m.array.tolist()
+			))
+		return self._cache['elements']
+
+	def closure(self, generators):
+		# multiplies the whole frontier by every generator in one batch
+		ring = self.ring
+		generators = ring.stack(tuple(generators))
+		members = {self.binop.identity}
+		frontier = [self.binop.identity]
+		while frontier and len(generators):
+			products = ring.mul_batch(ring.stack(frontier)[:, None], generators[None])
+			fresh = []
+			for m in ring.unstack(products):
+				if m not in members:
+					members.add(m)
+					fresh.append(m)
+			frontier = fresh
+		return members
+
+	def mul_batch(self, a, b):
+		return self.ring.mul_batch(a, b)
+
+	def inverse_batch(self, a):
+		return self.ring.inverse_batch(a)
+
+	def det_batch(self, a):
+		return self.ring.det_batch(a)
@@ -0,0 +1,83 @@
+
+from ..utils import typename
+from ..algaeset import _numpy
+from ..maps import Mapping
+from ..properties import HomomorphismError
+from .groups import Group
+
+
+class Homomorphism(Mapping):
+
+	__slots__ = ('source', 'target', '_images')
+
+	def __init__(self, mapping, source, target):
+		if not isinstance(source, Group):
+			raise TypeError(f'Expected Group, not {typename(source)}')
+		if not isinstance(target, Group):
+			raise TypeError(f'Expected Group, not {typename(target)}')
+		super().__init__(mapping, [source.aset], [target.aset])
+		self.source = source
+		self.target = target
+		self._images = None
+		if not self.preserves_structure():
+			raise HomomorphismError(f'Mapping {mapping} does not preserve the operation of {source.aset}')
+
+	def __call__(self, a):
+		return super().__call__(a)
+
+	def images(self):
+		# one domain-checked pass over the source, shared by every query
+		if self._images is None:
+			self._images = tuple(self.batch(self.source.elements))
+		return self._images
+
+	def preserves_structure(self):
+		images = self.images()
+		if images[self.source.index[self.source.binop.identity]] != self.target.binop.identity:
+			return False
+		if self.source.generators is not None:
+			return self._preserves_generators(images)
+		return self._preserves_table(images)
+
+	def _preserves_generators(self, images):
+		# f(sx) = f(s)f(x) for every generator s and every x extends to all
+		# products by induction on word length
+		op, target_op = self.source.binop.mapping, self.target.binop.mapping
+		index, elements = self.source.index, self.source.elements
+		for s in self.source.generators:
+			f_s = images[index[s]]
+			for x, f_x in zip(elements, images):
+				if images[index[op(s, x)]] != target_op(f_s, f_x):
+					return False
+		return True
+
+	def _preserves_table(self, images):
+		table = self.source.cayley_table()
+		target_op = self.target.binop.mapping
+		try:
+			np = _numpy()
+		except ImportError:
+			for row, f_a in zip(table, images):
+				for j, k in enumerate(row):
+					if images[k] != target_op(f_a, images[j]):
+						return False
+			return True
+		# products are only evaluated between distinct images, then compared
+		# against the source table in one vectorized gather
+		distinct = tuple(dict.fromkeys(images))
+		position = {y: i for i, y in enumerate(distinct)}
+		image_table = np.array([
+			[position.get(target_op(a, b), -1) for b in distinct] for a in distinct
+		])
+		codes = np.array([position[y] for y in images])
+		expected = image_table[codes[:, None], codes[None, :]]
+		return bool(np.array_equal(codes[np.array(table)], expected))
+
+	def kernel(self):
+		identity = self.target.binop.identity
+		return self.source._restricted(
+			x for x, y in zip(self.source.elements, self.images()) if y == identity
+		)
+
+	def image(self):
+		return self.target._restricted(set(self.images()))
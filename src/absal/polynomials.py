@@ -0,0 +1,521 @@
+
+import heapq
+
+from ..utils import typename
+from ..algaeset import AlgaeSet
+from .. import maps
+
+from .rings import UnitalRing, DivisionRing, EuclideanRing, Ideal
+
+
+ORDERS = ('lex', 'grlex', 'grevlex')
+
+
+class Polynomial:
+
+	# terms maps packed monomials to nonzero coefficients and is never
+	# mutated once the polynomial exists
+
+	__slots__ = ('ring', 'terms', '_leading', '_hash')
+
+	def __init__(self, ring, terms):
+		self.ring = ring
+		self.terms = terms
+		self._leading = None
+		self._hash = None
+
+	def __repr__(self):
+		if not self.terms:
+			return '0'
+		ring = self.ring
+		parts = []
+		for m in sorted(self.terms, key=ring._key, reverse=True):
+			c = self.terms[m]
+			powers = [
+				v if e == 1 else f'{v}^{e}'
+				for v, e in zip(ring.variables, ring.exponents(m)) if e
+			]
+			if not powers:
+				parts.append(repr(c))
+			elif c == ring.one_coefficient:
+				parts.append('*'.join(powers))
+			else:
+				parts.append('*'.join([repr(c)] + powers))
+		return ' + '.join(parts)
+
+	def __eq__(self, other):
+		if isinstance(other, Polynomial):
+			return self.ring is other.ring and self.terms == other.terms
+		return False
+
+	def __hash__(self):
+		if self._hash is None:
+			self._hash = hash(frozenset(self.terms.items()))
+		return self._hash
+
+	def __bool__(self):
+		return bool(self.terms)
+
+	@property
+	def is_zero(self):
+		return not self.terms
+
+	def _lead(self):
+		if self._leading is None:
+			if not self.terms:
+				raise ValueError(f'The zero polynomial has no leading term')
+			self._leading = max(self.terms, key=self.ring._key)
+		return self._leading
+
+	@property
+	def leading_monomial(self):
+		return self.ring.exponents(self._lead())
+
+	@property
+	def leading_coefficient(self):
+		return self.terms[self._lead()]
+
+	@property
+	def degree(self):
+		if not self.terms:
+			return -1
+		return max(self.ring._degree(m) for m in self.terms)
+
+	def coefficient(self, exponents):
+		return self.terms.get(self.ring.monomial(exponents), self.ring.zero_coefficient)
+
+	def __add__(self, other):
+		return self.ring.add(self, other)
+
+	def __radd__(self, other):
+		return self.ring.add(other, self)
+
+	def __sub__(self, other):
+		return self.ring.sub(self, other)
+
+	def __rsub__(self, other):
+		return self.ring.sub(other, self)
+
+	def __neg__(self):
+		return self.ring.sub(self.ring.zero, self)
+
+	def __mul__(self, other):
+		return self.ring.mul(self, other)
+
+	def __rmul__(self, other):
+		return self.ring.mul(other, self)
+
+	def __pow__(self, k):
+		return self.ring.power(self, k)
+
+	def __call__(self, *values):
+		return self.ring.evaluate(self, values)
+
+
+class PolynomialRing(UnitalRing):
+
+	# monomials are packed into one int: a field of `bits` bits per
+	# variable, first variable most significant, with the total degree in
+	# a field above them all. the top bit of every field is a guard, so
+	# products, divisibility and lcms are word-parallel integer operations
+
+	__slots__ = (
+		'base', 'variables', 'order', 'bits', 'zero', 'one',
+		'zero_coefficient', 'one_coefficient', '_guard', '_variable_mask',
+		'_field', '_key', '_keys', '_coefficients'
+	)
+
+	def __init__(self, base, variables, order='grevlex', bits=16):
+		if not isinstance(base, UnitalRing):
+			raise TypeError(f'Expected UnitalRing, not {typename(base)}')
+		if isinstance(variables, str):
+			variables = tuple(variables)
+		variables = tuple(variables)
+		if not variables:
+			raise ValueError(f'Expected at least one variable')
+		if not all(isinstance(v, str) for v in variables) or len(set(variables)) != len(variables):
+			raise ValueError(f'Expected distinct variable names, not {variables}')
+		if order not in ORDERS:
+			raise ValueError(f'Unknown monomial order {order!r}, expected one of {ORDERS}')
+		if not isinstance(bits, int):
+			raise TypeError(f'Expected int, not {typename(bits)}')
+		if bits < 2:
+			raise ValueError(f'Expected at least two bits per exponent, not {bits}')
+		self.base = base
+		self.variables = variables
+		self.order = order
+		self.bits = bits
+		n = len(variables)
+		self._field = (1 << bits) - 1
+		self._guard = sum(1 << (bits * i + bits - 1) for i in range(n + 1))
+		self._variable_mask = (1 << (bits * n)) - 1
+		self._keys = {}
+		self._key = {
+			'lex': lambda m: m & self._variable_mask,
+			'grlex': lambda m: m,
+			'grevlex': self._grevlex_key
+		}[order]
+		self.zero_coefficient = base.addition.identity
+		self.one_coefficient = base.multiplication.identity
+		self._coefficients = (
+			base.addition.mapping,
+			base.addition.inverse_mapping.mapping,
+			base.multiplication.mapping,
+			_coefficient_inverse(base)
+		)
+		aset = AlgaeSet.from_type(Polynomial).such_that(lambda p: p.ring is self)
+		self.zero = Polynomial(self, {})
+		self.one = Polynomial(self, {0: self.one_coefficient})
+		operation = maps.AbelianGroupOperation if isinstance(
+			base.addition, maps.CommutativeOperation
+		) else maps.GroupOperation
+		super().__init__(
+			aset,
+			operation(
+				self._add,
+				maps.BinaryOperation(self._sub, aset, aset),
+				aset,
+				self.zero
+			),
+			maps.ClosedAssociativeIdentityOperation(self._mul, aset, self.one)
+		)
+
+	def __repr__(self):
+		return f'PolynomialRing({",".join(self.variables)}, {self.order})'
+
+	# packed monomials
+
+	def monomial(self, exponents):
+		exponents = tuple(exponents)
+		if len(exponents) != len(self.variables):
+			raise ValueError(f'Expected {len(self.variables)} exponents, got {len(exponents)}')
+		limit = self._field >> 1
+		m = 0
+		for e in exponents:
+			if not isinstance(e, int) or not 0 <= e <= limit:
+				raise ValueError(f'Expected exponents between 0 and {limit}, not {e}')
+			m = (m << self.bits) | e
+		degree = sum(exponents)
+		if degree > limit:
+			raise ValueError(f'Total degree {degree} does not fit in {self.bits} bits')
+		return m | degree << (self.bits * len(self.variables))
+
+	def exponents(self, m):
+		bits, field = self.bits, self._field
+		return tuple(
+			(m >> (bits * i)) & field for i in range(len(self.variables) - 1, -1, -1)
+		)
+
+	def _degree(self, m):
+		return m >> (self.bits * len(self.variables))
+
+	def _grevlex_key(self, m):
+		key = self._keys.get(m)
+		if key is None:
+			# larger exponents of later variables make a smaller monomial
+			bits, field = self.bits, self._field
+			key = self._degree(m)
+			for e in reversed(self.exponents(m)):
+				key = (key << bits) | (field - e)
+			self._keys[m] = key
+		return key
+
+	def _monomial_mul(self, a, b):
+		m = a + b
+		if m & self._guard:
+			raise ValueError(f'Exponent overflow, use more than {self.bits} bits per exponent')
+		return m
+
+	def _divides(self, a, b):
+		guard = self._guard
+		return ((b | guard) - a) & guard == guard
+
+	def _lcm(self, a, b):
+		guard, bits = self._guard, self.bits
+		# fields where a >= b keep their guard bit through the subtraction;
+		# spreading it over the field selects a's exponent there
+		keep = ((a | guard) - b) & guard
+		keep = (keep >> (bits - 1)) * self._field
+		m = ((a & keep) | (b & ~keep)) & self._variable_mask
+		return m | sum(self.exponents(m)) << (bits * len(self.variables))
+
+	# construction
+
+	def gens(self):
+		n = len(self.variables)
+		return tuple(
+			self._make({self.monomial(tuple(int(i == j) for j in range(n))): self.one_coefficient})
+			for i in range(n)
+		)
+
+	def variable(self, name):
+		if name not in self.variables:
+			raise ValueError(f'Unknown variable {name!r}')
+		return self.gens()[self.variables.index(name)]
+
+	def constant(self, c):
+		if c not in self.base.aset:
+			raise ValueError(f'Expected coefficient {c} to be in {self.base.aset}')
+		return self._make({0: c} if c != self.zero_coefficient else {})
+
+	def polynomial(self, terms):
+		# terms maps exponent tuples to coefficients
+		add = self._coefficients[0]
+		packed = {}
+		for exponents, c in dict(terms).items():
+			if c not in self.base.aset:
+				raise ValueError(f'Expected coefficient {c} to be in {self.base.aset}')
+			m = self.monomial(exponents)
+			packed[m] = add(packed.get(m, self.zero_coefficient), c)
+		return self._make({m: c for m, c in packed.items() if c != self.zero_coefficient})
+
+	def _make(self, terms):
+		return Polynomial(self, terms)
+
+	def _coerce(self, candidate):
+		if isinstance(candidate, Polynomial):
+			if candidate.ring is not self:
+				raise ValueError(f'Expected a polynomial of {self}')
+			return candidate
+		return self.constant(candidate)
+
+	# arithmetic on the raw term dictionaries
+
+	def _add(self, p, q):
+		add, zero = self._coefficients[0], self.zero_coefficient
+		terms = dict(p.terms)
+		for m, c in q.terms.items():
+			c = add(terms.get(m, zero), c)
+			if c == zero:
+				terms.pop(m, None)
+			else:
+				terms[m] = c
+		return self._make(terms)
+
+	def _sub(self, p, q):
+		sub, zero = self._coefficients[1], self.zero_coefficient
+		terms = dict(p.terms)
+		for m, c in q.terms.items():
+			c = sub(terms.get(m, zero), c)
+			if c == zero:
+				terms.pop(m, None)
+			else:
+				terms[m] = c
+		return self._make(terms)
+
+	def _mul(self, p, q):
+		add, _, mul, _ = self._coefficients
+		zero, monomial_mul = self.zero_coefficient, self._monomial_mul
+		terms = {}
+		for a, c in p.terms.items():
+			for b, d in q.terms.items():
+				m = monomial_mul(a, b)
+				terms[m] = add(terms.get(m, zero), mul(c, d))
+		return self._make({m: c for m, c in terms.items() if c != zero})
+
+	def _scale(self, p, c, shift):
+		mul, zero = self._coefficients[2], self.zero_coefficient
+		terms = {}
+		for m, d in p.terms.items():
+			d = mul(c, d)
+			if d != zero:
+				terms[self._monomial_mul(m, shift)] = d
+		return self._make(terms)
+
+	def add(self, a, b):
+		return self._add(self._coerce(a), self._coerce(b))
+
+	def sub(self, a, b):
+		return self._sub(self._coerce(a), self._coerce(b))
+
+	def mul(self, a, b):
+		return self._mul(self._coerce(a), self._coerce(b))
+
+	def power(self, p, k):
+		if not isinstance(k, int):
+			raise TypeError(f'Expected int, not {typename(k)}')
+		if k < 0:
+			raise ValueError(f'Expected a nonnegative exponent, not {k}')
+		p, result = self._coerce(p), self.one
+		while k:
+			if k & 1:
+				result = self._mul(result, p)
+			k >>= 1
+			if k:
+				p = self._mul(p, p)
+		return result
+
+	def evaluate(self, p, values):
+		p = self._coerce(p)
+		values = tuple(values)
+		if len(values) != len(self.variables):
+			raise ValueError(f'Expected {len(self.variables)} values, got {len(values)}')
+		for v in values:
+			if v not in self.base.aset:
+				raise ValueError(f'Expected {v} to be in {self.base.aset}')
+		add, _, mul, _ = self._coefficients
+		result = self.zero_coefficient
+		for m, c in p.terms.items():
+			for v, e in zip(values, self.exponents(m)):
+				for _ in range(e):
+					c = mul(c, v)
+			result = add(result, c)
+		return result
+
+	# Groebner bases
+
+	def _monic(self, p):
+		inverse = self._require_field()
+		return self._scale(p, inverse(p.leading_coefficient), 0)
+
+	def _require_field(self):
+		inverse = self._coefficients[3]
+		if inverse is None:
+			raise TypeError(f'Expected coefficients in a field, not {typename(self.base)}')
+		return inverse
+
+	def _s_polynomial(self, f, g):
+		inverse = self._require_field()
+		lf, lg = f._lead(), g._lead()
+		lcm = self._lcm(lf, lg)
+		return self._sub(
+			self._scale(f, inverse(f.terms[lf]), lcm - lf),
+			self._scale(g, inverse(g.terms[lg]), lcm - lg)
+		)
+
+	def reduce(self, p, basis):
+		# full division of p by basis; candidate leading monomials wait in a
+		# heap keyed by the monomial order, so each term is visited once
+		p = self._coerce(p)
+		inverse = self._require_field()
+		_, sub, mul, _ = self._coefficients
+		zero, key, divides = self.zero_coefficient, self._key, self._divides
+		divisors = [(g._lead(), g) for g in basis if g.terms]
+		work = dict(p.terms)
+		heap = [(-key(m), m) for m in work]
+		heapq.heapify(heap)
+		remainder = {}
+		while heap:
+			_, m = heapq.heappop(heap)
+			c = work.pop(m, None)
+			if c is None:
+				continue
+			for lead, g in divisors:
+				if divides(lead, m):
+					break
+			else:
+				remainder[m] = c
+				continue
+			factor = mul(c, inverse(g.terms[lead]))
+			shift = m - lead
+			for gm, gc in g.terms.items():
+				if gm == lead:
+					continue
+				t = self._monomial_mul(gm, shift)
+				v = sub(work.get(t, zero), mul(factor, gc))
+				if v == zero:
+					work.pop(t, None)
+				else:
+					if t not in work:
+						heapq.heappush(heap, (-key(t), t))
+					work[t] = v
+		return self._make(remainder)
+
+	def groebner_basis(self, generators):
+		# Buchberger's algorithm with the normal selection strategy and the
+		# Gebauer-Moller criteria for discarding pairs
+		polynomials = [self._coerce(g) for g in generators]
+		self._require_field()
+		key, lcm, divides = self._key, self._lcm, self._divides
+		basis, pairs = [], {}
+		found = []
+		def update(h):
+			nonlocal basis, pairs
+			lh = h._lead()
+			i = len(found)
+			found.append(h)
+			candidates = {j: lcm(lh, found[j]._lead()) for j in basis}
+			kept = {}
+			for j, l in candidates.items():
+				coprime = l == lh + found[j]._lead()
+				if coprime or not any(
+					k != j and divides(candidates[k], l) and (candidates[k] != l or k < j)
+					for k in candidates
+				):
+					kept[j] = l
+			new_pairs = {(j, i): l for j, l in kept.items() if l != lh + found[j]._lead()}
+			pairs = {
+				(a, b): l for (a, b), l in pairs.items()
+				if not divides(lh, l)
+				or lcm(found[a]._lead(), lh) == l
+				or lcm(found[b]._lead(), lh) == l
+			}
+			pairs.update(new_pairs)
+			basis = [j for j in basis if not divides(lh, found[j]._lead())] + [i]
+		for p in polynomials:
+			if p.terms:
+				update(self._monic(p))
+		while pairs:
+			(a, b), _ = min(pairs.items(), key=lambda pair: key(pair[1]))
+			del pairs[(a, b)]
+			h = self.reduce(self._s_polynomial(found[a], found[b]), [found[j] for j in basis])
+			if h.terms:
+				update(self._monic(h))
+		# interreduce into the unique reduced basis
+		reduced = [found[j] for j in basis]
+		reduced = [
+			g for g in reduced
+			if not any(f is not g and divides(f._lead(), g._lead()) for f in reduced)
+		]
+		result = []
+		for g in reduced:
+			others = [f for f in reduced if f is not g]
+			lead = g._lead()
+			terms = dict(self.reduce(self._make({m: c for m, c in g.terms.items() if m != lead}), others).terms)
+			terms[lead] = g.terms[lead]
+			result.append(self._make(terms))
+		return tuple(sorted(result, key=lambda g: key(g._lead()), reverse=True))
+
+	def ideal(self, *generators):
+		return PolynomialIdeal(self, generators)
+
+
+def _coefficient_inverse(base):
+	if isinstance(base, DivisionRing):
+		divide, one = base.multiplication.inverse_mapping.mapping, base.multiplication.identity
+		return lambda c: divide(one, c)
+	if isinstance(base, EuclideanRing) and base.is_field:
+		return base.inverse
+	return None
+
+
+class PolynomialIdeal(Ideal):
+
+	# membership is decided exactly by reduction modulo a Groebner basis
+	# rather than by the generator closure check of finite ideals
+
+	__slots__ = ('basis',)
+
+	def __init__(self, ring, generators):
+		if not isinstance(ring, PolynomialRing):
+			raise TypeError(f'Expected PolynomialRing, not {typename(ring)}')
+		self.ring = ring
+		self.generators = tuple(ring._coerce(g) for g in generators)
+		self.basis = ring.groebner_basis(self.generators)
+		self.aset = AlgaeSet.from_type(Polynomial).such_that(
+			lambda p: p.ring is ring and not ring.reduce(p, self.basis).terms
+		)
+		self.normal_form = lambda p: ring.reduce(p, self.basis)
+		self.representatives = None
+
+	def __contains__(self, candidate):
+		if not isinstance(candidate, Polynomial) or candidate.ring is not self.ring:
+			return False
+		return not self.ring.reduce(candidate, self.basis).terms
+
+	def cosets(self):
+		raise ValueError(f'Polynomial quotients have infinitely many cosets, use normal_form')
+
+	@property
+	def is_whole_ring(self):
+		return any(not g._lead() for g in self.basis)
@@ -0,0 +1,247 @@
+
+import heapq
+from collections import deque
+
+from ..utils import typename
+
+
+MAX_RULES = 1000
+
+
+def _alphabet(generators):
+	if isinstance(generators, str):
+		generators = tuple(generators)
+	generators = tuple(generators)
+	for g in generators:
+		if not isinstance(g, str) or len(g) != 1:
+			raise ValueError(f'Expected single character generators, not {g!r}')
+	if len(set(generators)) != len(generators):
+		raise ValueError(f'Expected distinct generators, got {generators}')
+	return generators
+
+
+class Word:
+
+	# a str is a Sequence, which mappings would read as a tuple of outputs,
+	# so elements of presented monoids wrap their letters
+
+	__slots__ = ('letters',)
+
+	def __init__(self, letters):
+		if not isinstance(letters, str):
+			raise TypeError(f'Expected str, not {typename(letters)}')
+		self.letters = letters
+
+	def __repr__(self):
+		return f'Word({self.letters!r})'
+
+	def __str__(self):
+		return self.letters
+
+	def __eq__(self, other):
+		return isinstance(other, Word) and self.letters == other.letters
+
+	def __hash__(self):
+		return hash(self.letters)
+
+	def __len__(self):
+		return len(self.letters)
+
+
+class RewritingSystem:
+
+	__slots__ = ('alphabet', 'rank', 'rules', 'max_rules', '_automaton')
+
+	def __init__(self, generators, relations, max_rules=MAX_RULES):
+		if not isinstance(max_rules, int):
+			raise TypeError(f'Expected int, not {typename(max_rules)}')
+		if max_rules < 1:
+			raise ValueError(f'Expected a positive rule budget, not {max_rules}')
+		self.alphabet = _alphabet(generators)
+		self.rank = {g: i for i, g in enumerate(self.alphabet)}
+		self.max_rules = max_rules
+		equations = []
+		for relation in relations:
+			u, v = (relation, '') if isinstance(relation, str) else relation
+			for word in (u, v):
+				self._check(word)
+			equations.append((u, v))
+		self.rules = self._complete(equations)
+		self._automaton = None
+
+	def _check(self, word):
+		if not isinstance(word, str):
+			raise TypeError(f'Expected str, not {typename(word)}')
+		for c in word:
+			if c not in self.rank:
+				raise ValueError(f'Expected {word!r} to be a word over {"".join(self.alphabet)}')
+
+	def key(self, word):
+		# shortlex: shorter words first, equal lengths by generator order
+		rank = self.rank
+		return len(word), tuple(rank[c] for c in word)
+
+	def _complete(self, equations):
+		# Knuth-Bendix completion with interreduction; the shortest pending
+		# equations are oriented first, which keeps intermediate rules small
+		rules = {}
+		lengths = {}
+		def rewrite(word):
+			changed = True
+			while changed:
+				changed = False
+				for n in sorted(lengths):
+					for i in range(len(word) - n + 1):
+						rhs = rules.get(word[i:i + n])
+						if rhs is not None:
+							word = word[:i] + rhs + word[i + n:]
+							changed = True
+							break
+					if changed:
+						break
+			return word
+		def forget(lhs):
+			del rules[lhs]
+			lengths[len(lhs)] -= 1
+			if not lengths[len(lhs)]:
+				del lengths[len(lhs)]
+		pending, counter = [], 0
+		def push(u, v):
+			nonlocal counter
+			heapq.heappush(pending, (max(len(u), len(v)), counter, u, v))
+			counter += 1
+		for u, v in equations:
+			push(u, v)
+		while pending:
+			_, _, u, v = heapq.heappop(pending)
+			u, v = rewrite(u), rewrite(v)
+			if u == v:
+				continue
+			lhs, rhs = (u, v) if self.key(u) > self.key(v) else (v, u)
+			for l, r in list(rules.items()):
+				if lhs in l:
+					forget(l)
+					push(l, r)
+				elif lhs in r:
+					rules[l] = r.replace(lhs, rhs)
+			rules[lhs] = rhs
+			lengths[len(lhs)] = lengths.get(len(lhs), 0) + 1
+			if len(rules) > self.max_rules:
+				raise ValueError(f'Knuth-Bendix completion exceeded the budget of {self.max_rules} rules')
+			for l, r in list(rules.items()):
+				for a, b, c, d in ((lhs, rhs, l, r), (l, r, lhs, rhs)):
+					# overlaps of a suffix of a with a prefix of c
+					for k in range(1, min(len(a), len(c))):
+						if a[-k:] == c[:k]:
+							push(b + c[k:], a[:-k] + d)
+		for l in list(rules):
+			rules[l] = rewrite(rules[l])
+		return tuple(sorted(rules.items(), key=lambda rule: self.key(rule[0])))
+
+	def automaton(self):
+		# Aho-Corasick automaton over the left-hand sides, completed into a
+		# transition table; match[s] is the rule whose left-hand side ends
+		# at state s, if any
+		if self._automaton is None:
+			rank, size = self.rank, len(self.alphabet)
+			goto, match = [{}], [None]
+			for r, (lhs, _) in enumerate(self.rules):
+				s = 0
+				for c in lhs:
+					c = rank[c]
+					if c not in goto[s]:
+						goto[s][c] = len(goto)
+						goto.append({})
+						match.append(None)
+					s = goto[s][c]
+				match[s] = r
+			delta = [None] * len(goto)
+			fail = [0] * len(goto)
+			delta[0] = [goto[0].get(c, 0) for c in range(size)]
+			queue = deque(goto[0].values())
+			while queue:
+				s = queue.popleft()
+				if match[s] is None:
+					match[s] = match[fail[s]]
+				row = list(delta[fail[s]])
+				for c, t in goto[s].items():
+					fail[t] = delta[fail[s]][c]
+					row[c] = t
+					queue.append(t)
+				delta[s] = row
+			self._automaton = (tuple(delta), tuple(match))
+		return self._automaton
+
+	def reduce(self, word):
+		self._check(word)
+		delta, match = self.automaton()
+		rank, rules = self.rank, self.rules
+		# the automaton state after every output letter is kept, so a
+		# rewrite only backs up over the letters it replaces
+		out, states = [], [0]
+		pending = list(reversed(word))
+		while pending:
+			c = pending.pop()
+			s = delta[states[-1]][rank[c]]
+			r = match[s]
+			if r is None:
+				out.append(c)
+				states.append(s)
+				continue
+			lhs, rhs = rules[r]
+			k = len(lhs) - 1
+			if k:
+				del out[-k:]
+				del states[-k:]
+			pending.extend(reversed(rhs))
+		return ''.join(out)
+
+	def is_normal(self, word):
+		if not isinstance(word, str) or any(c not in self.rank for c in word):
+			return False
+		delta, match = self.automaton()
+		rank, s = self.rank, 0
+		for c in word:
+			s = delta[s][rank[c]]
+			if match[s] is not None:
+				return False
+		return True
+
+	def equal(self, u, v):
+		return self.reduce(u) == self.reduce(v)
+
+	@property
+	def is_finite(self):
+		# finitely many normal forms exactly when the automaton restricted
+		# to non-matching states reachable from the start has no cycle
+		delta, match = self.automaton()
+		colour = {}
+		stack = [(0, iter(delta[0]))]
+		colour[0] = 1
+		while stack:
+			s, successors = stack[-1]
+			for t in successors:
+				if match[t] is not None:
+					continue
+				if colour.get(t) == 1:
+					return False
+				if t not in colour:
+					colour[t] = 1
+					stack.append((t, iter(delta[t])))
+					break
+			else:
+				colour[s] = 2
+				stack.pop()
+		return True
+
+	def normal_forms(self):
+		# breadth first over the automaton, so words come out in shortlex
+		# order; infinite when the presented monoid is
+		delta, match = self.automaton()
+		layer = [('', 0)]
+		while layer:
+			yield from (w for w, _ in layer)
+			layer = [
+				(w + g, t) for w, s in layer
+				for g, t in zip(self.alphabet, delta[s]) if match[t] is None
+			]
@@ -1,28 +1,38 @@
 
-from algae.utils import AlgaeSet
-from algae.properties import left_ideal_closure, right_ideal_closure, ideal_closure
-import algae.maps as maps
+import abc
+import math
 
-from magma import Semigroup, Monoid
-from groups import Group
+from ..utils import typename, factorize, crt
+from ..algaeset import AlgaeSet, FrozenAlgaeSet
+from ..properties import ClosureError
+from .. import maps
+from .. import algaeset
+
+from .magma import Semigroup, Monoid
+from .groups import Group
 
 
 class Ring:
 
-	def __init__(self, aset, addition, multiplication):
+	__slots__ = (
+		'aset', 'addition', 'additive_group', 'multiplication',
+		'multiplicative_semigroup', 'is_infinite', 'is_finite'
+	)
+
+	def __init__(self, aset, addition, multiplication, generators=None):
 		if not isinstance(aset, AlgaeSet):
 			raise TypeError(f'Expected AlgaeSet, not {aset}')
 		if not isinstance(addition, maps.GroupOperation):
 			raise TypeError(f'Expected GroupOperation, not {typename(addition)}')
-		if not isinstance(multiplication, maps.ClosedAssociativeOperation):
-			raise TypeError(f'Expected ClosedAssociativeOperation, not {typename(multiplication)}')
+		if not isinstance(multiplication, maps.AssociativeOperation):
+			raise TypeError(f'Expected AssociativeOperation, not {typename(multiplication)}')
 		if addition.domain != aset:
 			raise ValueError(f'Expected addition\'s domain to be {aset}')
 		if multiplication.domain != aset:
 			raise ValueError(f'Expected multiplication\'s domain to be {aset}')
 		self.aset = aset
 		self.addition = addition
-		self.additive_group = Group(aset, addition)
+		self.additive_group = Group(aset, addition, generators)
 		self.multiplication = multiplication
 		self.multiplicative_semigroup = Semigroup(aset, multiplication)
 		self.is_infinite = aset.is_infinite
@@ -30,12 +40,13 @@ class Ring:
 
 	@classmethod
 	def from_group(cls, addition_group, multiplication):
-		if not isinstance(multiplication, maps.ClosedAssociativeOperation):
-			raise TypeError(f'Expected ClosedAssociativeOperation, not {typename(multiplication)}')
+		if not isinstance(multiplication, maps.AssociativeOperation):
+			raise TypeError(f'Expected AssociativeOperation, not {typename(multiplication)}')
 		return cls(
 			addition_group.aset,
 			addition_group.binop,
-			multiplication
+			multiplication,
+			addition_group.generators
 		)
 
 	def add(self, a, b):
@@ -44,64 +55,433 @@ class Ring:
 	def mul(self, a, b):
 		return self.multiplication(a, b)
 
+	def quotient(self, ideal):
+		if not isinstance(ideal, Ideal):
+			raise TypeError(f'Expected Ideal, not {typename(ideal)}')
+		if ideal.ring is not self:
+			raise ValueError(f'Expected an ideal of this ring')
+		representatives, project = ideal.cosets()
+		index = {r: i for i, r in enumerate(representatives)}
+		add, mul = self.addition.mapping, self.multiplication.mapping
+		# every operation of the quotient is two lookups in a table that is
+		# built once from coset representatives
+		sums = tuple(
+			tuple(index[project(add(a, b))] for b in representatives)
+			for a in representatives
+		)
+		products = tuple(
+			tuple(index[project(mul(a, b))] for b in representatives)
+			for a in representatives
+		)
+		zero = project(self.addition.identity)
+		negatives = tuple(row.index(index[zero]) for row in sums)
+		aset = FrozenAlgaeSet(*representatives)
+		addition = maps.GroupOperation(
+			lambda a, b: representatives[sums[index[a]][index[b]]],
+			maps.BinaryOperation(
+				lambda a, b: representatives[sums[index[a]][negatives[index[b]]]],
+				aset,
+				aset
+			),
+			aset,
+			zero
+		)
+		multiply = lambda a, b: representatives[products[index[a]][index[b]]]
+		generators = None
+		if self.additive_group.generators is not None:
+			generators = tuple(dict.fromkeys(project(g) for g in self.additive_group.generators))
+		if isinstance(self, UnitalRing):
+			return UnitalRing(
+				aset,
+				addition,
+				maps.ClosedAssociativeIdentityOperation(
+					multiply, aset, project(self.multiplication.identity)
+				),
+				generators
+			)
+		return Ring(aset, addition, maps.ClosedAssociativeOperation(multiply, aset), generators)
+
 
 class UnitalRing(Ring):
 
-	def __init__(self, aset, addition, multiplication):
+	__slots__ = ('multiplicative_monoid',)
+
+	def __init__(self, aset, addition, multiplication, generators=None):
 		if not isinstance(multiplication, maps.ClosedAssociativeIdentityOperation):
 			raise TypeError(f'Expected ClosedAssociativeIdentityOperation, not {typename(multiplication)}')
 		self.multiplicative_monoid = Monoid(aset, multiplication)
-		super().__init__(aset, addition, multiplication)
+		super().__init__(aset, addition, multiplication, generators)
+
+	@classmethod
+	def Z_mod(cls, n, residues=False, factorization=None):
+		return IntegerModRing(n, residues, factorization)
 
 
 class DivisionRing(UnitalRing):
 
-	def __init__(self, aset, addition, multiplication):
+	__slots__ = ()
+
+	def __init__(self, aset, addition, multiplication, generators=None):
 		if not isinstance(multiplication, maps.GroupOperation):
 			raise TypeError(f'Expected GroupOperation, not {typename(multiplication)}')
-		super().__init__(aset, addition, multiplication)
+		super().__init__(aset, addition, multiplication, generators)
 
 
 class Field(DivisionRing):
 
-	def __init__(self, aset, addition, multiplication):
+	__slots__ = ()
+
+	def __init__(self, aset, addition, multiplication, generators=None):
 		if not isinstance(multiplication, maps.AbelianGroupOperation):
 			raise TypeError(f'Expected AbelianGroupOperation, not {typename(multiplication)}')
-		super().__init__(aset, addition, subtraction)
+		super().__init__(aset, addition, multiplication, generators)
 
 
-class RightIdeal:
+class EuclideanRing(UnitalRing, abc.ABC):
 
-	def __init__(self, ring, aset):
-		if not isinstance(ring, Ring):
-			raise TypeError(f'Expected Ring, not {typename(ring)}')
-		if not isinstance(aset, AlgaeSet):
-			raise TypeError(f'Expected AlgaeSet, not {typename(aset)}')
-		if not ring.additive_group.has_subgroup(Group(aset, ring.addition)):
-			raise ValueError(f'AlgaeSet {aset} does not satisfy ideal addition axiom')
-		ring.multiplication = right_ideal_closure(ring.aset, aset)(ring.multiplication)
-		self.ring = ring
-		self.aset = aset
+	# subclasses supply divmod(a, b) with a Euclidean remainder; gcds,
+	# Bezout coefficients, inverses and the CRT follow from it on the raw
+	# ring operations
+
+	__slots__ = ()
+
+	@property
+	def is_field(self):
+		return False
+
+	@abc.abstractmethod
+	def divmod(self, a, b):
+		...
+
+	def _normalize(self, g, s, t):
+		return g, s, t
+
+	def xgcd(self, a, b):
+		# returns g, s, t with s*a + t*b = g
+		for x in (a, b):
+			if x not in self.aset:
+				raise ValueError(f'Expected {x} to be in {self.aset}')
+		sub, mul = self.addition.inverse_mapping.mapping, self.multiplication.mapping
+		zero, one = self.addition.identity, self.multiplication.identity
+		r0, r1, s0, s1, t0, t1 = a, b, one, zero, zero, one
+		while r1 != zero:
+			q, r = self.divmod(r0, r1)
+			r0, r1 = r1, r
+			s0, s1 = s1, sub(s0, mul(q, s1))
+			t0, t1 = t1, sub(t0, mul(q, t1))
+		return self._normalize(r0, s0, t0)
+
+	def gcd(self, a, b):
+		return self.xgcd(a, b)[0]
+
+	def inverse(self, a):
+		# a is a unit exactly when it divides one
+		q, r = self.divmod(self.multiplication.identity, a)
+		if r != self.addition.identity:
+			raise ValueError(f'{a} is not a unit of {typename(self)}')
+		return q
+
+	def crt(self, residues, moduli):
+		residues, moduli = tuple(residues), tuple(moduli)
+		if len(residues) != len(moduli):
+			raise ValueError(f'Expected as many residues as moduli')
+		add, mul = self.addition.mapping, self.multiplication.mapping
+		sub = self.addition.inverse_mapping.mapping
+		x, m = self.addition.identity, self.multiplication.identity
+		for r, n in zip(residues, moduli):
+			g, s, _ = self.xgcd(m, n)
+			try:
+				g_inverse = self.inverse(g)
+			except ValueError:
+				raise ValueError(f'Expected pairwise coprime moduli, not {m} and {n}') from None
+			# x + m*s*(r - x)/g is r modulo n and x modulo m
+			x = add(x, mul(mul(m, s), mul(g_inverse, sub(r, x))))
+			m = mul(m, n)
+			x = self.divmod(x, m)[1]
+		return x
+
+
+class IntegerRing(EuclideanRing):
+
+	__slots__ = ()
+
+	def __init__(self):
+		Z = algaeset.Z
+		super().__init__(
+			Z,
+			maps.AbelianGroupOperation(
+				lambda a, b: a + b,
+				maps.BinaryOperation(lambda a, b: a - b, Z, Z),
+				Z,
+				0
+			),
+			maps.ClosedAssociativeIdentityOperation(lambda a, b: a * b, Z, 1),
+			(1,)
+		)
+
+	def divmod(self, a, b):
+		if b == 0:
+			raise ZeroDivisionError(f'Division of {a} by zero')
+		return divmod(a, b)
+
+	def _normalize(self, g, s, t):
+		if g < 0:
+			return -g, -s, -t
+		return g, s, t
+
+	def crt(self, residues, moduli):
+		return crt(tuple(residues), tuple(moduli))
+
+
+class Residues:
+
+	# an element of Z/nZ as its residues modulo the prime powers of n; a
+	# tuple would be read as several outputs by mappings
+
+	__slots__ = ('values',)
+
+	def __init__(self, values):
+		self.values = tuple(values)
 
+	def __repr__(self):
+		return f'Residues{self.values}'
 
-class LeftIdeal:
+	def __eq__(self, other):
+		return isinstance(other, Residues) and self.values == other.values
 
-	def __init__(self, ring, aset):
+	def __hash__(self):
+		return hash(self.values)
+
+
+class IntegerModRing(EuclideanRing):
+
+	# elements are 0, ..., n - 1, or their Residues modulo the prime power
+	# factors of n, on which multiplication, inversion and powers run
+	# componentwise on small moduli
+
+	__slots__ = ('n', 'moduli', 'residues', '_factorization')
+
+	ELEMENT_LIMIT = 2**16
+
+	def __init__(self, n, residues=False, factorization=None):
+		if not isinstance(n, int):
+			raise TypeError(f'Z can only be partitioned by integer modulo')
+		if not n > 0:
+			raise ValueError(f'Z can only be partitioned by positive modulo')
+		if factorization is not None and math.prod(p**e for p, e in factorization.items()) != n:
+			raise ValueError(f'Expected a factorization of {n}, not {factorization}')
+		self.n = n
+		self._factorization = factorization
+		self.moduli = None
+		self.residues = bool(residues)
+		if self.residues:
+			self.moduli = tuple(p**e for p, e in sorted(self.factorization.items()))
+		if self.residues:
+			moduli = self.moduli
+			add = lambda a, b: Residues((x + y) % m for x, y, m in zip(a.values, b.values, moduli))
+			sub = lambda a, b: Residues((x - y) % m for x, y, m in zip(a.values, b.values, moduli))
+			mul = lambda a, b: Residues(x * y % m for x, y, m in zip(a.values, b.values, moduli))
+			is_element = lambda a: len(a.values) == len(moduli) and all(
+				isinstance(x, int) and not isinstance(x, bool) and 0 <= x < m
+				for x, m in zip(a.values, moduli)
+			)
+			kind = Residues
+		else:
+			add = lambda a, b: (a + b) % n
+			sub = lambda a, b: (a - b) if a >= b else (a - b) + n
+			mul = lambda a, b: a * b % n
+			is_element = lambda a: not isinstance(a, bool) and 0 <= a < n
+			kind = int
+		# small rings list their elements so that tables, ideals and
+		# quotients work; large ones test membership arithmetically
+		if n <= self.ELEMENT_LIMIT:
+			aset = FrozenAlgaeSet(*(self.element(a) for a in range(n)))
+		else:
+			aset = AlgaeSet.from_type(kind).such_that(is_element)
+			aset.register_enumerator(lambda: (self.element(a) for a in range(n)))
+		zero, one = self.element(0), self.element(1)
+		super().__init__(
+			aset,
+			maps.AbelianGroupOperation(add, maps.BinaryOperation(sub, aset, aset), aset, zero),
+			maps.ClosedAssociativeIdentityOperation(mul, aset, one),
+			(one,) if n > 1 else ()
+		)
+		# large rings test membership with a predicate, but are finite
+		self.is_infinite = False
+		self.is_finite = True
+
+	@property
+	def factorization(self):
+		# factorize only trial divides, so large moduli should come with
+		# their factorization
+		if self._factorization is None:
+			self._factorization = factorize(self.n)
+		return self._factorization
+
+	@property
+	def is_field(self):
+		return list(self.factorization.values()) == [1]
+
+	def element(self, a):
+		if not isinstance(a, int) or isinstance(a, bool):
+			raise TypeError(f'Expected int, not {typename(a)}')
+		if self.residues:
+			return Residues(a % m for m in self.moduli)
+		return a % self.n
+
+	def value(self, a):
+		if a not in self.aset:
+			raise ValueError(f'Expected {a} to be in {self.aset}')
+		if self.residues:
+			return crt(a.values, self.moduli)
+		return a
+
+	def divmod(self, a, b):
+		# Euclidean division of the representatives; a = q*b + r also holds
+		# modulo n
+		q, r = divmod(self.value(a), self.value(b))
+		return self.element(q), self.element(r)
+
+	def xgcd(self, a, b):
+		# g generates the ideal (a, b) and is normalized to a divisor of n
+		x, y = self.value(a), self.value(b)
+		g, s, t = _integer_xgcd(x, y)
+		h, u, _ = _integer_xgcd(g, self.n)
+		return self.element(h), self.element(u * s), self.element(u * t)
+
+	def gcd(self, a, b):
+		return self.element(math.gcd(self.value(a), self.value(b), self.n))
+
+	def inverse(self, a):
+		if a not in self.aset:
+			raise ValueError(f'Expected {a} to be in {self.aset}')
+		try:
+			if self.residues:
+				return Residues(pow(x, -1, m) for x, m in zip(a.values, self.moduli))
+			return pow(a, -1, self.n)
+		except ValueError:
+			raise ValueError(f'{a} is not a unit modulo {self.n}') from None
+
+	def power(self, a, k):
+		if a not in self.aset:
+			raise ValueError(f'Expected {a} to be in {self.aset}')
+		if not isinstance(k, int):
+			raise TypeError(f'Expected int, not {typename(k)}')
+		if k < 0:
+			a, k = self.inverse(a), -k
+		if self.residues:
+			return Residues(pow(x, k, m) for x, m in zip(a.values, self.moduli))
+		return pow(a, k, self.n)
+
+	def crt(self, residues, moduli):
+		moduli = tuple(moduli)
+		if self.n % math.lcm(*moduli):
+			raise ValueError(f'Expected moduli dividing {self.n}, not {moduli}')
+		return self.element(crt(tuple(self.value(r) for r in residues), moduli))
+
+
+def _integer_xgcd(a, b):
+	s0, s1, t0, t1 = 1, 0, 0, 1
+	while b:
+		q, r = divmod(a, b)
+		a, b = b, r
+		s0, s1 = s1, s0 - q * s1
+		t0, t1 = t1, t0 - q * t1
+	return a, s0, t0
+
+
+class _Ideal:
+
+	__slots__ = ('ring', 'aset', 'generators', 'normal_form', 'representatives')
+
+	SIDES = ()
+
+	def __init__(self, ring, aset, generators=None, normal_form=None, representatives=None):
 		if not isinstance(ring, Ring):
 			raise TypeError(f'Expected Ring, not {typename(ring)}')
 		if not isinstance(aset, AlgaeSet):
 			raise TypeError(f'Expected AlgaeSet, not {typename(aset)}')
-		if not ring.additive_group.has_subgroup(Group(aset, ring.addition)):
-			raise ValueError(f'AlgaeSet {aset} does not satisfy ideal addition axiom')
-		ring.multiplication = left_ideal_closure(ring.aset, aset)(ring.multiplication)
+		if normal_form is not None and not callable(normal_form):
+			raise TypeError(f'Expected callable normal form, not {typename(normal_form)}')
 		self.ring = ring
 		self.aset = aset
+		self.normal_form = normal_form
+		self.representatives = None if representatives is None else tuple(representatives)
+		if aset.is_finite:
+			self.generators = self._additive_generators()
+		elif generators is None:
+			raise ValueError(f'Expected generators for the infinite ideal {aset}')
+		else:
+			self.generators = tuple(generators)
+			for g in self.generators:
+				if g not in aset or g not in ring.aset:
+					raise ValueError(f'Expected generator {g} to be in {aset}')
+		self._check_closure()
 
+	def __contains__(self, candidate):
+		return candidate in self.aset
+
+	def _additive_generators(self):
+		elements = tuple(self.aset)
+		for e in elements:
+			if e not in self.ring.aset:
+				raise ValueError(f'Expected {e} to be in {self.ring.aset}')
+		group = self.ring.additive_group
+		if group.closure(elements) != set(elements):
+			raise ValueError(f'AlgaeSet {self.aset} does not satisfy ideal addition axiom')
+		return group._restricted(elements).generating_set()
+
+	def _check_closure(self):
+		# multiplication distributes over addition, so products of additive
+		# generators decide closure once and for all
+		witnesses = self.ring.additive_group.generators
+		if witnesses is None:
+			if self.ring.is_infinite:
+				raise ValueError(f'Expected a ring with additive generators to check {self.aset}')
+			witnesses = self.ring.additive_group.generating_set()
+		mul = self.ring.multiplication.mapping
+		for a in self.generators:
+			for r in witnesses:
+				if 'right' in self.SIDES and mul(a, r) not in self.aset:
+					raise ClosureError(f'{typename(self)} over {self.aset} is not closed under right multiplication')
+				if 'left' in self.SIDES and mul(r, a) not in self.aset:
+					raise ClosureError(f'{typename(self)} over {self.aset} is not closed under left multiplication')
+
+	def cosets(self):
+		# returns coset representatives and the map sending each ring
+		# element to its representative
+		if self.normal_form is not None:
+			if self.representatives is None:
+				raise ValueError(f'Expected representatives alongside the normal form')
+			return self.representatives, self.normal_form
+		if self.ring.is_infinite:
+			raise ValueError(f'Expected a normal form for cosets of the infinite ring')
+		add = self.ring.addition.mapping
+		members = tuple(self.aset)
+		representative = {}
+		for x in self.ring.aset:
+			if x not in representative:
+				for i in members:
+					representative[add(x, i)] = x
+		return tuple(dict.fromkeys(representative.values())), representative.__getitem__
 
-class Ideal(RightIdeal, LeftIdeal):
 
-	def __init__(self, ring, aset):
-		ring.multiplication = left_ideal_closure(ring.aset, aset)(ring.multiplication)
-		super().__init__(ring, aset)
+class RightIdeal(_Ideal):
+
+	__slots__ = ()
+
+	SIDES = ('right',)
+
+
+class LeftIdeal(_Ideal):
+
+	__slots__ = ()
+
+	SIDES = ('left',)
+
+
+class Ideal(RightIdeal, LeftIdeal):
 
+	__slots__ = ()
 
+	SIDES = ('left', 'right')
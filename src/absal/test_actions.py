@@ -0,0 +1,69 @@
+
+import itertools
+from pytest import raises
+
+from .actions import *
+from .groups import Group
+from ..algaeset import AlgaeSet
+from ..maps import Mapping
+from ..properties import IdentityError
+
+
+def permutation_action(n):
+	S = Group.symmetric(n)
+	points = AlgaeSet(*range(n))
+	return GroupAction(S, points, Mapping(lambda g, x: g[x], [S.aset, points], [points]))
+
+def necklace_action(length, colours):
+	Z = Group.Z_mod(length)
+	points = AlgaeSet(*itertools.product(range(colours), repeat=length))
+	rotate = lambda k, x: x[-k:] + x[:-k] if k else x
+	return GroupAction(Z, points, Mapping(rotate, [Z.aset, points], [points]))
+
+
+class TestGroupAction:
+
+	def test_transitive_action(self):
+		action = permutation_action(4)
+		assert action.orbit(0) == AlgaeSet(0, 1, 2, 3)
+		assert len(list(action.orbits())) == 1
+
+	def test_stabilizer(self):
+		action = permutation_action(4)
+		stabilizer = action.stabilizer(0)
+		assert stabilizer.order == 6
+		assert all(g[0] == 0 for g in stabilizer.elements)
+
+	def test_orbits_partition_points(self):
+		action = necklace_action(4, 2)
+		orbits = list(action.orbits())
+		assert len(orbits) == 6
+		assert sum(len(o.elements) for o in orbits) == 16
+
+	def test_orbit_bitset(self):
+		action = necklace_action(4, 2)
+		orbit = action.orbit_bitset((0, 0, 1, 1))
+		assert orbit.to_aset() == action.orbit((0, 0, 1, 1))
+		assert len(orbit) == 4 and orbit.universe is action.universe
+
+	def test_necklace_stabilizer(self):
+		action = necklace_action(4, 2)
+		assert action.stabilizer((0, 1, 0, 1)).aset == AlgaeSet(0, 2)
+		assert action.stabilizer((0, 0, 0, 0)).aset == AlgaeSet(0, 1, 2, 3)
+
+	def test_orbit_stabilizer_theorem(self):
+		action = necklace_action(6, 2)
+		for x in [(0, 0, 1, 0, 0, 1), (0, 1, 1, 0, 1, 0), (1,) * 6]:
+			orbit = action.orbit(x)
+			assert len(orbit.elements) * action.stabilizer(x).order == 6
+
+	def test_burnside_count(self):
+		assert necklace_action(4, 2).count_orbits() == 6
+		assert necklace_action(6, 3).count_orbits() == 130
+		assert permutation_action(5).count_orbits() == 1
+
+	def test_requires_identity_to_act_trivially(self):
+		Z = Group.Z_mod(3)
+		points = AlgaeSet(0, 1, 2)
+		with raises(IdentityError):
+			GroupAction(Z, points, Mapping(lambda g, x: (g + x + 1) % 3, [Z.aset, points], [points]))
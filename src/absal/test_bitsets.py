@@ -0,0 +1,78 @@
+
+from pytest import raises, importorskip
+
+from .bitsets import *
+from .groups import Group
+from .rings import UnitalRing
+from ..algaeset import AlgaeSet
+
+
+class TestBitset:
+
+	def test_set_algebra(self):
+		G = Group.Z_mod(12)
+		a, b = G.bitset(AlgaeSet(0, 2, 4, 6, 8, 10)), G.bitset(AlgaeSet(0, 3, 6, 9))
+		assert set(a & b) == {0, 6}
+		assert set(a | b) == {0, 2, 3, 4, 6, 8, 9, 10}
+		assert set(a - b) == {2, 4, 8, 10}
+		assert set(~a) == {1, 3, 5, 7, 9, 11}
+		assert len(a) == 6 and 4 in a and 5 not in a
+		assert (a & b) <= a and (a & b) < b and not a <= b
+		assert a.isdisjoint(~a)
+
+	def test_aset_roundtrip(self):
+		G = Group.symmetric(3)
+		H = G.subgroup([(1, 2, 0)])
+		b = Bitset.from_aset(G, H.aset)
+		assert G.bitset(H) == b
+		assert b.to_aset() == H.aset
+
+	def test_rings_are_indexed_by_their_additive_group(self):
+		Z6 = UnitalRing.Z_mod(6)
+		b = universe(Z6).subset([0, 2, 4])
+		assert b.universe is Z6.additive_group.universe()
+
+	def test_subgroup_lattice_keys(self):
+		G = Group.symmetric(4)
+		lattice = G.subgroup_lattice()
+		for i, H in enumerate(lattice):
+			assert lattice.bitset(i) == G.bitset(H)
+		assert all(lattice.bitset(i) <= lattice.bitset(j) for i, j in lattice.edges())
+
+	def test_universes_do_not_mix(self):
+		a = Group.Z_mod(4).bitset([1])
+		with raises(ValueError):
+			a | Group.Z_mod(4).bitset([1])
+		with raises(ValueError):
+			Group.Z_mod(4).bitset([7])
+		with raises(ValueError):
+			universe(AlgaeSet.from_type(int))
+
+
+class TestBitsetFamily:
+
+	def test_family_operations(self):
+		np = importorskip('numpy')
+		G = Group.symmetric(4)
+		U = G.universe()
+		family = U.family(G.subgroups())
+		assert len(family) == 30 and U.words == 1
+		orders = sorted(family.cardinalities().tolist())
+		assert orders == sorted(H.order for H in G.subgroups())
+		A4 = G.bitset(next(H for H in G.subgroups() if H.order == 12))
+		assert family.subsets_of(A4).sum() == 10
+		assert family.supersets_of(U.empty()).all()
+		assert family.containing((1, 0, 2, 3)).sum() == 6
+		assert family[0] == list(family)[0]
+
+	def test_wide_universe(self):
+		np = importorskip('numpy')
+		U = Universe(range(200))
+		subsets = [U.subset(range(k, 200, 7)) for k in range(7)]
+		family = BitsetFamily.from_bitsets(U, subsets)
+		assert family.words.shape == (7, 4)
+		assert [family[k] for k in range(7)] == subsets
+		assert family.cardinalities().sum() == 200
+		assert family.intersects(U.subset([0])).tolist() == [True] + [False] * 6
+		assert (family | U.subset([199]))[0] == subsets[0] | U.subset([199])
+		assert len((family & family).unique()) == 7
@@ -0,0 +1,83 @@
+
+from pytest import raises
+
+from .expressions import *
+from .rings import UnitalRing
+from .test_rings import integers
+from ..properties import DomainError
+
+
+class TestRingExpressions:
+
+	def test_hash_consing(self):
+		E = RingExpressions(UnitalRing.Z_mod(7))
+		x, y = E.variables('x', 'y')
+		assert x + y is x + y
+		assert (x + y) * (x + y) is (x + y) ** 2
+		assert E.variable('x') is x
+
+	def test_identities_are_eliminated(self):
+		E = RingExpressions(integers())
+		x, y = E.variables('x', 'y')
+		assert x + 0 is x and 1 * x is x
+		assert x * 0 is E.zero
+		assert x - x is E.zero and x + -x is E.zero
+		assert -(-x) is x
+		assert (-x) * (-y) is x * y
+		assert (E.constant(2) + 3).value == 5
+
+	def test_distributivity_factors_common_terms(self):
+		E = RingExpressions(integers())
+		x, y, z = E.variables('x', 'y', 'z')
+		expression = x * y + x * z
+		assert expression.op == 'mul'
+		assert sum(n.op == 'mul' for n in expression.nodes()) == 1
+		assert expression.evaluate(x=2, y=3, z=4) == 14
+
+	def test_evaluate(self):
+		E = RingExpressions(UnitalRing.Z_mod(11))
+		x, y = E.variables('x', 'y')
+		expression = (x + y) ** 5 - 3 * x * y + 7
+		for a in range(11):
+			for b in range(11):
+				assert expression.evaluate({'x': a, 'y': b}) == ((a + b) ** 5 - 3 * a * b + 7) % 11
+
+	def test_shared_subterms_are_evaluated_once(self):
+		calls = []
+		ring = integers()
+		add = ring.addition.mapping
+		ring.addition.mapping = lambda a, b: calls.append(1) or add(a, b)
+		E = RingExpressions(ring)
+		x, y = E.variables('x', 'y')
+		s = x + y
+		assert (s * s + s).evaluate(x=1, y=2) == 12
+		assert len(calls) == 2
+
+	def test_leaves_are_checked(self):
+		E = RingExpressions(UnitalRing.Z_mod(5))
+		x = E.variable('x')
+		with raises(DomainError):
+			(x * x).evaluate(x=5)
+		with raises(DomainError):
+			E.constant(9)
+		with raises(ValueError):
+			(x + 1).evaluate()
+
+	def test_evaluate_batch(self):
+		E = RingExpressions(UnitalRing.Z_mod(13))
+		x, y = E.variables('x', 'y')
+		expression = x * x * y + 2 * y + 1
+		xs, ys = list(range(13)), list(range(12, -1, -1))
+		assert expression.evaluate_batch(x=xs, y=ys) == [
+			expression.evaluate(x=a, y=b) for a, b in zip(xs, ys)
+		]
+		assert E.constant(4).evaluate_batch() == [4]
+		with raises(ValueError):
+			expression.evaluate_batch(x=[1, 2], y=[1])
+
+	def test_rejects_foreign_expressions(self):
+		x = RingExpressions(UnitalRing.Z_mod(5)).variable('x')
+		with raises(ValueError):
+			RingExpressions(UnitalRing.Z_mod(5)).variable('y') + x
+		with raises(TypeError):
+			RingExpressions(None)
@@ -0,0 +1,181 @@
+
+from pytest import raises
+
+from .groups import *
+from ..algaeset import AlgaeSet
+
+
+class TestGroup:
+
+	def test_Z_mod(self):
+		Z5 = Group.Z_mod(5)
+		assert Z5.binop(3, 4) == 2
+		assert Z5.binop.identity == 0
+
+	def test_Z_mod_requires_positive_modulo(self):
+		with raises(ValueError):
+			Group.Z_mod(0)
+
+	def test_has_no_instance_dict(self):
+		assert not hasattr(Group.Z_mod(3), '__dict__')
+
+
+class TestElementOrder:
+
+	def test_order(self):
+		assert Group.Z_mod(12).order == 12
+		assert Group.units_mod(15).order == 8
+
+	def test_order_of(self):
+		Z12 = Group.Z_mod(12)
+		assert Z12.order_of(0) == 1
+		assert Z12.order_of(1) == 12
+		assert Z12.order_of(3) == 4
+		assert Z12.order_of(8) == 3
+
+	def test_order_of_units(self):
+		U = Group.units_mod(101)
+		assert U.order_of(2) == 100
+		assert U.order_of(100) == 2
+
+	def test_order_of_with_known_factorization(self):
+		U = Group.units_mod(101)
+		assert U.order_of(2, factorization={2: 2, 5: 2}) == 100
+
+	def test_order_of_requires_member(self):
+		with raises(ValueError):
+			Group.Z_mod(5).order_of(7)
+
+
+class TestDiscreteLog:
+
+	def test_additive(self):
+		Z12 = Group.Z_mod(12)
+		assert Z12.discrete_log(3, 9) == 3
+		assert Z12.discrete_log(5, 1) == 5
+
+	def test_methods_agree(self):
+		U = Group.units_mod(1019)
+		h = pow(2, 777, 1019)
+		for method in ('auto', 'bsgs', 'rho', 'pohlig_hellman'):
+			assert U.discrete_log(2, h, method=method) == 777
+
+	def test_large_prime_subgroup_with_rho(self):
+		U = Group.units_mod(2039)
+		g = 4
+		order = U.order_of(g)
+		assert order == 1019
+		assert U.discrete_log(g, pow(g, 1000, 2039), method='rho') == 1000
+
+	def test_no_solution(self):
+		with raises(ValueError):
+			Group.Z_mod(12).discrete_log(4, 1)
+
+	def test_unknown_method(self):
+		with raises(ValueError):
+			Group.Z_mod(12).discrete_log(1, 1, method='index_calculus')
+
+
+class TestSubgroups:
+
+	def test_closure(self):
+		assert Group.Z_mod(12).closure([8]) == {0, 4, 8}
+
+	def test_subgroup(self):
+		H = Group.Z_mod(12).subgroup([3])
+		assert H.aset == AlgaeSet(0, 3, 6, 9)
+		assert H.generators == (3,)
+
+	def test_generating_set(self):
+		U = Group.units_mod(8)
+		assert U.closure(U.generating_set()) == set(U.elements)
+		assert Group.Z_mod(5).generating_set() == (1,)
+
+	def test_cayley_table(self):
+		Z3 = Group.Z_mod(3)
+		table = Z3.cayley_table()
+		for i, a in enumerate(Z3.elements):
+			for j, b in enumerate(Z3.elements):
+				assert Z3.elements[table[i][j]] == (a + b) % 3
+
+
+class TestConjugacy:
+
+	def test_symmetric_group(self):
+		S4 = Group.symmetric(4)
+		assert S4.order == 24
+		assert S4.closure(S4.generators) == set(S4.elements)
+
+	def test_conjugacy_classes_of_symmetric_groups(self):
+		# one class per cycle type, i.e. per partition of n
+		assert len(Group.symmetric(3).conjugacy_classes()) == 3
+		assert len(Group.symmetric(5).conjugacy_classes()) == 7
+		sizes = sorted(len(c.elements) for c in Group.symmetric(4).conjugacy_classes())
+		assert sizes == [1, 3, 6, 6, 8]
+
+	def test_conjugacy_class(self):
+		S3 = Group.symmetric(3)
+		assert S3.conjugacy_class((1, 0, 2)) == AlgaeSet((1, 0, 2), (0, 2, 1), (2, 1, 0))
+
+	def test_abelian_classes_are_singletons(self):
+		Z6 = Group.Z_mod(6)
+		assert len(Z6.conjugacy_classes()) == 6
+		assert Z6.center().aset == Z6.aset
+
+	def test_center(self):
+		assert Group.symmetric(3).center().aset == AlgaeSet((0, 1, 2))
+
+	def test_centralizer(self):
+		S3 = Group.symmetric(3)
+		assert S3.centralizer((1, 2, 0)).aset == AlgaeSet((0, 1, 2), (1, 2, 0), (2, 0, 1))
+		assert S3.centralizer((0, 1, 2)).aset == S3.aset
+
+	def test_results_are_cached(self):
+		S4 = Group.symmetric(4)
+		assert S4.conjugacy_classes() is S4.conjugacy_classes()
+		assert S4.center() is S4.center()
+		assert S4.centralizer((1, 0, 2, 3)) is S4.centralizer((1, 0, 2, 3))
+
+	def test_large_abelian_group(self):
+		Z = Group.Z_mod(100000)
+		assert len(Z.conjugacy_classes()) == 100000
+
+
+class TestSubgroupLattice:
+
+	def test_counts(self):
+		assert len(list(Group.Z_mod(12).subgroups())) == 6
+		assert len(list(Group.symmetric(4).subgroups())) == 30
+
+	def test_subgroups_are_closed(self):
+		G = Group.symmetric(3)
+		for H in G.subgroups():
+			assert G.order % H.order == 0
+			assert G.closure(H.aset) == set(H.aset)
+
+	def test_streams(self):
+		subgroups = Group.symmetric(4).subgroups()
+		assert next(subgroups).order == 1
+
+	def test_lattice(self):
+		lattice = Group.Z_mod(12).subgroup_lattice()
+		orders = [lattice.order(i) for i in range(len(lattice))]
+		assert orders == [1, 2, 3, 4, 6, 12]
+		edges = {(orders[i], orders[j]) for i, j in lattice.edges()}
+		assert edges == {(1, 2), (1, 3), (2, 4), (2, 6), (3, 6), (4, 12), (6, 12)}
+		assert set(lattice[3].aset) == {0, 3, 6, 9}
+
+	def test_parallel_search_agrees(self):
+		G = Group.symmetric(4)
+		serial = {frozenset(H.aset) for H in G.subgroups()}
+		assert {frozenset(H.aset) for H in G.subgroups(processes=2)} == serial
+
+	def test_sylow_subgroups(self):
+		S4 = Group.symmetric(4)
+		assert [H.order for H in S4.sylow_subgroups(2)] == [8] * 3
+		assert [H.order for H in S4.sylow_subgroups(3)] == [3] * 4
+		assert [H.order for H in Group.Z_mod(12).sylow_subgroups(5)] == [1]
+
+	def test_sylow_requires_prime(self):
+		with raises(ValueError):
+			next(Group.Z_mod(12).sylow_subgroups(4))
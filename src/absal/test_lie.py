@@ -0,0 +1,105 @@
+
+import math
+from pytest import raises, importorskip
+
+np = importorskip('numpy')
+
+from .lie import *
+from ..properties import AssociativityError
+
+
+def random_tangents(group, size, seed=0):
+	return np.random.default_rng(seed).normal(size=(size, group.DIMENSION))
+
+
+class TestLieElement:
+
+	def test_equality_is_approximate(self):
+		assert LieElement([1.0, 0.0], 1e-9) == LieElement([1.0 + 1e-12, 0.0], 1e-9)
+		assert LieElement([1.0, 0.0], 1e-9) != LieElement([1.0 + 1e-6, 0.0], 1e-9)
+
+	def test_unhashable(self):
+		with raises(TypeError):
+			hash(LieElement([1.0, 0.0], 1e-9))
+
+	def test_read_only(self):
+		g = LieElement([1.0, 0.0], 1e-9)
+		with raises(ValueError):
+			g.array[0] = 2.0
+
+
+class TestNumericLieGroups:
+
+	def test_exp_log_roundtrip(self):
+		for group in (SO2(), SO3(), SE3(), UnitQuaternions()):
+			g = group.exp_batch(random_tangents(group, 500))
+			assert group.contains_batch(g).all()
+			assert np.allclose(group.exp_batch(group.log_batch(g)), g, atol=1e-10)
+
+	def test_axioms_hold(self):
+		for group in (SO2(), SO3(), SE3(), UnitQuaternions()):
+			group.check_axioms(group.exp_batch(random_tangents(group, 200)))
+
+	def test_broken_composition_is_caught(self):
+		class Skewed(SO2):
+			__slots__ = ()
+			def compose_batch(self, a, b):
+				return np.matmul(a, np.matmul(a, b))
+		group = Skewed()
+		with raises(AssociativityError):
+			group.check_axioms(group.exp_batch(random_tangents(group, 10)))
+
+	def test_checked_operation_tolerates_rounding(self):
+		group = SO3()
+		a, b = group.exp([0.1, 0.2, 0.3]), group.exp([-0.4, 0.0, 1.0])
+		assert group.binop(group.binop(a, b), group.inverse(b)) == a
+
+	def test_membership(self):
+		group = SO3()
+		assert group.identity_array().tolist() == np.eye(3).tolist()
+		assert group.exp([0.0, 0.0, 1.0]) in group.aset
+		assert group.wrap(2 * np.eye(3)) not in group.aset
+		with raises(ValueError):
+			group.element(np.diag([1.0, 1.0, -1.0]))
+
+	def test_is_lie_group(self):
+		assert SE3().aset.is_infinite
+
+	def test_so3_log_near_half_turn(self):
+		group = SO3()
+		w = np.array([[math.pi, 0, 0], [0, math.pi - 1e-7, 0], [0, 0, 1e-9]])
+		assert np.allclose(np.abs(group.log_batch(group.exp_batch(w))), np.abs(w))
+
+	def test_se3_transforms_points(self):
+		group = SE3()
+		g = group.element([
+			[0.0, -1.0, 0.0, 1.0],
+			[1.0, 0.0, 0.0, 2.0],
+			[0.0, 0.0, 1.0, 3.0],
+			[0.0, 0.0, 0.0, 1.0]
+		])
+		assert np.allclose(group.exp_batch(group.log(g)), g.array)
+		assert np.allclose(group.act(g, [1.0, 0.0, 0.0]), [1.0, 3.0, 3.0])
+
+	def test_quaternions_agree_with_rotations(self):
+		quaternions = UnitQuaternions()
+		q = quaternions.exp_batch(random_tangents(quaternions, 100))
+		points = np.random.default_rng(1).normal(size=(100, 3))
+		rotated = SO3().act_batch(quaternions.to_rotation_batch(q), points)
+		assert np.allclose(quaternions.act_batch(q, points), rotated)
+
+	def test_batches_broadcast(self):
+		group = SE3()
+		g = group.exp_batch(random_tangents(group, 7))
+		points = np.random.default_rng(2).normal(size=(7, 3))
+		expected = [group.act_batch(x, p) for x, p in zip(g, points)]
+		assert np.allclose(group.act_batch(g, points), expected)
+		assert group.compose_batch(g, group.inverse_batch(g)).shape == (7, 4, 4)
+
+	def test_abstract(self):
+		with raises(TypeError):
+			NumericLieGroup()
+
+	def test_rejects_bad_tolerance(self):
+		with raises(ValueError):
+			SO2(tolerance=0)
@@ -0,0 +1,102 @@
+
+from pytest import raises, importorskip
+
+np = importorskip('numpy')
+
+from .matrices import *
+from .rings import UnitalRing
+from .groups import Group
+
+
+class TestMatrix:
+
+	def test_entries_are_reduced(self):
+		assert Matrix([[4, -1], [0, 3]], 3) == Matrix([[1, 2], [0, 0]], 3)
+
+	def test_hashable(self):
+		assert len({Matrix([[1, 0], [0, 1]], 5), Matrix([[6, 5], [0, 1]], 5)}) == 1
+
+	def test_requires_square_entries(self):
+		with raises(ValueError):
+			Matrix([[1, 2, 3]], 5)
+
+	def test_entries_are_read_only(self):
+		m = Matrix([[1, 2], [3, 4]], 5)
+		with raises(ValueError):
+			m.array[0, 0] = 0
+
+
+class TestMatrixRing:
+
+	def test_requires_integers_modulo_n(self):
+		with raises(TypeError):
+			MatrixRing(Group.Z_mod(5), 2)
+		with raises(ValueError):
+			MatrixRing(UnitalRing.Z_mod(1), 2)
+
+	def test_operations(self):
+		R = MatrixRing(UnitalRing.Z_mod(6), 2)
+		a, b = R.matrix([[1, 2], [3, 4]]), R.matrix([[0, 1], [1, 0]])
+		assert R.add(a, b) == R.matrix([[1, 3], [4, 4]])
+		assert R.mul(a, b) == R.matrix([[2, 1], [4, 3]])
+		assert R.mul(a, R.identity) == a
+		assert a in R.aset and Matrix([[1]], 6) not in R.aset
+		assert R.order == 6**4
+
+	def test_batched_multiplication(self):
+		R = MatrixRing(UnitalRing.Z_mod(7), 3)
+		rng = np.random.default_rng(0)
+		a, b = rng.integers(0, 7, (50, 3, 3)), rng.integers(0, 7, (50, 3, 3))
+		products = R.mul_batch(a, b)
+		assert products.shape == (50, 3, 3)
+		for x, y, z in zip(a.tolist(), b.tolist(), products.tolist()):
+			assert z == [
+				[sum(x[i][k] * y[k][j] for k in range(3)) % 7 for j in range(3)]
+				for i in range(3)
+			]
+
+	def test_determinants(self):
+		R = MatrixRing(UnitalRing.Z_mod(101), 4)
+		a = np.random.default_rng(1).integers(0, 101, (200, 4, 4))
+		expected = np.array([round(d) for d in np.linalg.det(a)]) % 101
+		assert (R.det_batch(a) == expected).all()
+		assert R.det(R.matrix([[1, 2, 3, 4]] * 4)) == 0
+
+	def test_inverses(self):
+		R = MatrixRing(UnitalRing.Z_mod(13), 3)
+		a = np.random.default_rng(2).integers(0, 13, (200, 3, 3))
+		a = a[R.det_batch(a) != 0]
+		identity = np.broadcast_to(np.eye(3, dtype=int), a.shape)
+		assert (R.mul_batch(a, R.inverse_batch(a)) == identity).all()
+		with raises(ValueError):
+			R.inverse(R.zero)
+
+	def test_determinants_require_prime_modulus(self):
+		R = MatrixRing(UnitalRing.Z_mod(6), 2)
+		with raises(ValueError):
+			R.det(R.identity)
+
+
+class TestMatrixGroup:
+
+	def test_orders(self):
+		assert len(MatrixGroup.general_linear(2, 3).elements) == 48
+		assert len(MatrixGroup.special_linear(2, 3).elements) == 24
+		assert len(MatrixGroup.general_linear(3, 2).elements) == 168
+
+	def test_membership(self):
+		G = MatrixGroup.special_linear(2, 5)
+		assert G.ring.matrix([[2, 0], [0, 3]]) in G.aset
+		assert G.ring.matrix([[2, 0], [0, 1]]) not in G.aset
+
+	def test_group_structure(self):
+		G = MatrixGroup.general_linear(2, 3)
+		g = G.ring.matrix([[1, 1], [0, 1]])
+		assert G.order_of(g) == 3
+		assert G.binop(g, G.inverse(g)) == G.binop.identity
+		assert G.center().order == 2
+		assert len(G.conjugacy_classes()) == 8
+
+	def test_requires_prime_modulus(self):
+		with raises(ValueError):
+			MatrixGroup(MatrixRing(UnitalRing.Z_mod(4), 2))
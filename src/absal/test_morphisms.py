@@ -0,0 +1,53 @@
+
+from pytest import raises
+
+from .morphisms import *
+from .groups import Group
+from ..algaeset import AlgaeSet
+from ..properties import HomomorphismError
+
+LOG_3_MOD_7 = {1: 0, 3: 1, 2: 2, 6: 3, 4: 4, 5: 5}
+
+
+class TestHomomorphism:
+
+	def test_reduction_mod_4(self):
+		f = Homomorphism(lambda x: x % 4, Group.Z_mod(12), Group.Z_mod(4))
+		assert f(7) == 3
+
+	def test_outputs_outside_source(self):
+		f = Homomorphism(lambda x: 2 * x % 4, Group.Z_mod(2), Group.Z_mod(4))
+		assert f(1) == 2
+		assert f.image().aset == AlgaeSet(0, 2)
+
+	def test_kernel_and_image(self):
+		f = Homomorphism(lambda x: x % 4, Group.Z_mod(12), Group.Z_mod(4))
+		assert f.kernel().aset == AlgaeSet(0, 4, 8)
+		assert f.image().aset == AlgaeSet(0, 1, 2, 3)
+
+	def test_exponential_into_units(self):
+		f = Homomorphism(lambda x: pow(3, x, 7), Group.Z_mod(6), Group.units_mod(7))
+		assert f.kernel().aset == AlgaeSet(0)
+		assert f.image().order == 6
+
+	def test_checked_without_generators(self):
+		U7 = Group.units_mod(7)
+		assert U7.generators is None
+		f = Homomorphism(lambda x: LOG_3_MOD_7[x], U7, Group.Z_mod(6))
+		assert f(6) == 3
+
+	def test_squaring_has_nontrivial_kernel(self):
+		U7 = Group.units_mod(7)
+		f = Homomorphism(lambda x: x * x % 7, U7, U7)
+		assert f.kernel().aset == AlgaeSet(1, 6)
+		assert f.image().aset == AlgaeSet(1, 2, 4)
+
+	def test_rejects_non_homomorphisms(self):
+		with raises(HomomorphismError):
+			Homomorphism(lambda x: (x + 1) % 4, Group.Z_mod(12), Group.Z_mod(4))
+		with raises(HomomorphismError):
+			Homomorphism(lambda x: 1 if x == 3 else x, Group.units_mod(7), Group.units_mod(7))
+
+	def test_requires_groups(self):
+		with raises(TypeError):
+			Homomorphism(lambda x: x, AlgaeSet(0), Group.Z_mod(1))
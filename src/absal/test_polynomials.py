@@ -0,0 +1,133 @@
+
+from itertools import combinations
+from pytest import raises
+
+from .polynomials import *
+from .rings import Field, UnitalRing
+from .groups import Group
+from .. import maps
+
+
+def GF(p):
+	additive_group = Group.Z_mod(p)
+	aset = additive_group.aset
+	return Field(
+		aset,
+		additive_group.binop,
+		maps.AbelianGroupOperation(
+			lambda a, b: a * b % p,
+			maps.BinaryOperation(lambda a, b: a * pow(b, -1, p) % p, aset, aset),
+			aset,
+			1
+		),
+		additive_group.generators
+	)
+
+F = GF(32003)
+
+
+def is_groebner_basis(ring, basis):
+	return all(
+		not ring.reduce(ring._s_polynomial(f, g), basis)
+		for f, g in combinations(basis, 2)
+	)
+
+
+class TestPolynomialRing:
+
+	def test_arithmetic(self):
+		P = PolynomialRing(F, 'xy')
+		x, y = P.gens()
+		assert (x + y) * (x - y) == x**2 - y**2
+		assert (x + 1)**3 == x**3 + 3 * x**2 + 3 * x + 1
+		assert (x - x).is_zero and P.sub(1, 1) == P.zero
+		assert (3 * x**2 * y + 2)(2, 5) == 62
+		assert P.mul(x, y) == P.multiplication(x, y)
+
+	def test_packed_monomials(self):
+		P = PolynomialRing(F, 'xyz')
+		a, b = P.monomial((2, 0, 1)), P.monomial((1, 3, 0))
+		assert P.exponents(a) == (2, 0, 1)
+		assert P._lcm(a, b) == P.monomial((2, 3, 1))
+		assert P._divides(P.monomial((1, 0, 1)), a)
+		assert not P._divides(b, a)
+		with raises(ValueError):
+			P.monomial((2**15, 0, 0))
+		with raises(ValueError):
+			PolynomialRing(F, 'x', bits=4).variable('x')**8
+
+	def test_orders(self):
+		for order, lead in (('lex', (1, 0, 0)), ('grlex', (0, 2, 0)), ('grevlex', (0, 2, 0))):
+			x, y, z = PolynomialRing(F, 'xyz', order).gens()
+			assert (x + y**2 + y * z).leading_monomial == lead
+		x, y, z = PolynomialRing(F, 'xyz', 'grlex').gens()
+		assert (x * z**2 + y**3).leading_monomial == (1, 0, 2)
+		x, y, z = PolynomialRing(F, 'xyz', 'grevlex').gens()
+		assert (x * z**2 + y**3).leading_monomial == (0, 3, 0)
+
+	def test_rejects_bad_arguments(self):
+		with raises(ValueError):
+			PolynomialRing(F, 'xx')
+		with raises(ValueError):
+			PolynomialRing(F, 'xy', 'revlex')
+		with raises(ValueError):
+			PolynomialRing(F, 'x').gens()[0] + PolynomialRing(F, 'x').gens()[0]
+
+
+class TestGroebnerBases:
+
+	def test_reduced_basis(self):
+		P = PolynomialRing(F, 'xyz', 'lex')
+		x, y, z = P.gens()
+		basis = P.groebner_basis([x**2 + y**2 + z**2 - 1, x * y - z, y - z**2])
+		assert is_groebner_basis(P, basis)
+		assert all(g.leading_coefficient == 1 for g in basis)
+		assert basis[-1] == z**7 + z**5 - z**3 + z
+
+	def test_cyclic_five(self):
+		P = PolynomialRing(F, 'abcde')
+		a, b, c, d, e = P.gens()
+		variables = [a, b, c, d, e]
+		cyclic = [a * b * c * d * e - 1]
+		for k in range(1, 5):
+			f = P.zero
+			for i in range(5):
+				term = P.one
+				for j in range(k):
+					term = term * variables[(i + j) % 5]
+				f = f + term
+			cyclic.append(f)
+		basis = P.groebner_basis(cyclic)
+		assert len(basis) == 20
+		assert is_groebner_basis(P, basis)
+
+	def test_prime_residue_field(self):
+		P = PolynomialRing(UnitalRing.Z_mod(101), 'xy')
+		x, y = P.gens()
+		assert P.groebner_basis([x * y - 1, x**2 - y]) == (x**2 - y, x * y - 1, y**2 - x)
+
+	def test_requires_field(self):
+		P = PolynomialRing(UnitalRing.Z_mod(6), 'x')
+		with raises(TypeError):
+			P.groebner_basis([P.gens()[0]])
+
+
+class TestPolynomialIdeal:
+
+	def test_membership(self):
+		P = PolynomialRing(F, 'xyz')
+		x, y, z = P.gens()
+		f, g, h = x**2 + y**2 + z**2 - 1, x * y - z, y - z**2
+		I = P.ideal(f, g, h)
+		assert f * (x + 3) + h * y**2 in I
+		assert x not in I and 1 not in I
+		assert f * z in I.aset
+		assert not I.is_whole_ring
+
+	def test_normal_forms(self):
+		P = PolynomialRing(F, 'xy')
+		x, y = P.gens()
+		I = P.ideal(x**2 - 2, y**2 - 3)
+		assert I.normal_form((x + y)**2) == 2 * x * y + 5
+		assert I.normal_form(x**5) == 4 * x
+		assert P.ideal(x * y - 1, x).is_whole_ring
@@ -0,0 +1,82 @@
+
+import time
+from itertools import islice
+from pytest import raises
+
+from .rewriting import *
+from .magma import Monoid, Semigroup
+
+
+def free_abelian():
+	return Monoid.from_presentation('aAbB', [
+		'aA', 'Aa', 'bB', 'Bb', ('ba', 'ab'), ('Ba', 'aB'), ('bA', 'Ab'), ('BA', 'AB')
+	])
+
+
+class TestRewritingSystem:
+
+	def test_completion(self):
+		system = RewritingSystem('ab', ['aa', 'bbb', 'abab'])
+		assert system.rules == (
+			('aa', ''), ('aba', 'bb'), ('abb', 'ba'), ('bab', 'a'), ('bba', 'ab'), ('bbb', '')
+		)
+		assert system.is_finite
+		assert list(system.normal_forms()) == ['', 'a', 'b', 'ab', 'ba', 'bb']
+
+	def test_reduce(self):
+		system = RewritingSystem('aAbB', ['aA', 'Aa', 'bB', 'Bb'])
+		assert system.reduce('abBAab') == 'ab'
+		assert system.equal('aAb', 'bBb')
+		assert system.is_normal('abAB') and not system.is_normal('abBA')
+		assert not system.is_finite
+
+	def test_shortlex(self):
+		system = RewritingSystem('ab', [('b', 'aa')])
+		assert system.rules == (('aa', 'b'), ('ba', 'ab'))
+		assert system.key('b') < system.key('aa') < system.key('ab')
+
+	def test_reduction_is_linear(self):
+		system = RewritingSystem('ab', ['aa', 'bbb', 'abab'])
+		start = time.perf_counter()
+		assert system.reduce('ab' * 50000) == ''
+		assert time.perf_counter() - start < 1.0
+
+	def test_rule_budget(self):
+		with raises(ValueError):
+			RewritingSystem('ab', [('aba', 'bab')], max_rules=20)
+
+	def test_rejects_bad_words(self):
+		with raises(ValueError):
+			RewritingSystem('ab', ['ac'])
+		with raises(ValueError):
+			RewritingSystem(['ab'], [])
+		with raises(TypeError):
+			RewritingSystem('ab', [('a', 1)])
+
+
+class TestPresentations:
+
+	def test_finite_monoid(self):
+		S3 = Monoid.from_presentation('ab', ['aa', 'bbb', 'abab'])
+		assert S3.aset.is_finite and len(set(S3.aset)) == 6
+		assert S3(S3.word('ab'), S3.word('ab')) == Word('')
+		assert S3.word('bab') == Word('a')
+
+	def test_infinite_monoid(self):
+		Z2 = free_abelian()
+		assert Z2.aset.is_infinite
+		assert Z2(Z2.word('bA'), Z2.word('aB')) == Word('')
+		assert Word('ab') in Z2.aset and Word('ba') not in Z2.aset
+		assert [str(w) for w in islice(Z2.aset, 5)] == ['', 'a', 'A', 'b', 'B']
+
+	def test_semigroup(self):
+		S = Semigroup.from_presentation('ab', [('aa', 'a'), ('bb', 'b'), ('aba', 'a'), ('bab', 'b')])
+		assert {str(w) for w in S.aset} == {'a', 'b', 'ab', 'ba'}
+		assert S(S.word('ab'), S.word('a')) == Word('a')
+		with raises(ValueError):
+			Semigroup.from_presentation('a', ['aa'])
+
+	def test_word_requires_presentation(self):
+		M = free_abelian()
+		with raises(TypeError):
+			Monoid(M.aset, M.binop).word('a')
@@ -0,0 +1,168 @@
+
+from pytest import raises
+
+from .rings import *
+from ..algaeset import AlgaeSet, Z
+from ..properties import ClosureError
+from .. import maps
+
+
+def integers():
+	return UnitalRing(
+		Z,
+		maps.GroupOperation(
+			lambda a, b: a + b,
+			maps.BinaryOperation(lambda a, b: a - b, Z, Z),
+			Z,
+			0
+		),
+		maps.ClosedAssociativeIdentityOperation(lambda a, b: a * b, Z, 1),
+		(1,)
+	)
+
+
+class TestRing:
+
+	def test_Z_mod(self):
+		Z6 = UnitalRing.Z_mod(6)
+		assert Z6.add(4, 5) == 3
+		assert Z6.mul(4, 5) == 2
+
+
+class TestIdeal:
+
+	def test_finite_ideal(self):
+		Z12 = UnitalRing.Z_mod(12)
+		ideal = Ideal(Z12, AlgaeSet(0, 4, 8))
+		assert ideal.generators in ((4,), (8,))
+		assert 8 in ideal and 3 not in ideal
+
+	def test_does_not_touch_the_ring(self):
+		Z12 = UnitalRing.Z_mod(12)
+		multiplication = Z12.multiplication
+		Ideal(Z12, AlgaeSet(0, 3, 6, 9))
+		Ideal(Z12, AlgaeSet(0, 6))
+		assert Z12.multiplication is multiplication
+
+	def test_requires_additive_subgroup(self):
+		with raises(ValueError):
+			Ideal(UnitalRing.Z_mod(12), AlgaeSet(0, 4))
+
+	def test_requires_closure(self):
+		S = UnitalRing.Z_mod(6)
+		with raises(ClosureError):
+			Ideal(
+				Ring(
+					S.aset,
+					S.addition,
+					maps.AssociativeOperation(lambda a, b: a, S.aset, S.aset)
+				),
+				AlgaeSet(0, 3)
+			)
+
+	def test_one_sided_ideals(self):
+		S = UnitalRing.Z_mod(6)
+		left_projection = Ring(
+			S.aset,
+			S.addition,
+			maps.AssociativeOperation(lambda a, b: a, S.aset, S.aset)
+		)
+		assert RightIdeal(left_projection, AlgaeSet(0, 3)).SIDES == ('right',)
+		with raises(ClosureError):
+			LeftIdeal(left_projection, AlgaeSet(0, 3))
+
+	def test_infinite_ideal_needs_generators(self):
+		with raises(ValueError):
+			Ideal(integers(), Z.such_that(lambda e: e % 5 == 0))
+
+
+class TestQuotient:
+
+	def test_finite_quotient(self):
+		Z12 = UnitalRing.Z_mod(12)
+		Z4 = Z12.quotient(Ideal(Z12, AlgaeSet(0, 4, 8)))
+		assert Z4.aset == AlgaeSet(0, 1, 2, 3)
+		assert Z4.add(3, 2) == 1
+		assert Z4.mul(3, 3) == 1
+		assert Z4.multiplication.identity == 1
+
+	def test_integers_mod_n(self):
+		ring = integers()
+		nZ = Ideal(
+			ring,
+			Z.such_that(lambda e: e % 7 == 0),
+			generators=(7,),
+			normal_form=lambda e: e % 7,
+			representatives=range(7)
+		)
+		Z7 = ring.quotient(nZ)
+		assert isinstance(Z7, UnitalRing)
+		assert Z7.add(5, 4) == 2
+		assert Z7.mul(3, 5) == 1
+		assert Z7.additive_group.binop.inverse_mapping(2, 5) == 4
+
+	def test_requires_own_two_sided_ideal(self):
+		Z12 = UnitalRing.Z_mod(12)
+		with raises(TypeError):
+			Z12.quotient(RightIdeal(Z12, AlgaeSet(0, 6)))
+		with raises(ValueError):
+			Z12.quotient(Ideal(UnitalRing.Z_mod(12), AlgaeSet(0, 6)))
+
+
+class TestEuclidean:
+
+	def test_integers(self):
+		Z = IntegerRing()
+		g, s, t = Z.xgcd(240, 46)
+		assert g == 2 and 240 * s + 46 * t == 2
+		assert Z.gcd(-12, 18) == 6
+		assert Z.inverse(-1) == -1
+		with raises(ValueError):
+			Z.inverse(2)
+		assert Z.crt([2, 3, 2], [3, 5, 7]) == 23
+
+	def test_abstract(self):
+		with raises(TypeError):
+			EuclideanRing(Z, None, None)
+
+	def test_generic_crt(self):
+		Z = IntegerRing()
+		assert EuclideanRing.crt(Z, [2, 3, 2], [3, 5, 7]) == 23
+		with raises(ValueError):
+			EuclideanRing.crt(Z, [1, 2], [4, 6])
+
+	def test_integers_mod_n(self):
+		Z12 = UnitalRing.Z_mod(12)
+		g, s, t = Z12.xgcd(8, 6)
+		assert g == 2 and (8 * s + 6 * t) % 12 == 2
+		assert Z12.gcd(8, 6) == 2
+		assert Z12.inverse(5) == 5
+		with raises(ValueError):
+			Z12.inverse(4)
+		assert Z12.crt([1, 2], [4, 3]) == 5
+		assert Z12.power(7, -3) == pow(7, -3, 12)
+		assert not Z12.is_field and UnitalRing.Z_mod(13).is_field
+
+	def test_residue_representation(self):
+		R = UnitalRing.Z_mod(12, residues=True)
+		assert R.moduli == (4, 3)
+		assert R.element(7) == Residues((3, 1))
+		assert R.value(R.add(R.element(7), R.element(8))) == 3
+		assert R.value(R.mul(R.element(5), R.element(11))) == 7
+		assert R.value(R.inverse(R.element(7))) == 7
+		assert len(set(R.aset)) == 12
+
+	def test_large_composite_modulus(self):
+		factorization = {2**61 - 1: 1, 2**89 - 1: 1, 1000003: 1}
+		n = (2**61 - 1) * (2**89 - 1) * 1000003
+		R = UnitalRing.Z_mod(n, residues=True, factorization=factorization)
+		S = UnitalRing.Z_mod(n)
+		assert R.is_finite and not R.is_infinite and R.element(n - 1) in R.aset
+		assert True not in S.aset and n - 1 in S.aset
+		with raises(TypeError):
+			S.element(True)
+		a = 123456789123456789
+		assert R.value(R.power(R.element(a), 10**40)) == S.power(a, 10**40) == pow(a, 10**40, n)
+		assert R.value(R.mul(R.inverse(R.element(a)), R.element(a))) == 1
+		with raises(ValueError):
+			UnitalRing.Z_mod(12, factorization={2: 2})
@@ -1,6 +1,47 @@
 
-from utils import chain, typename, is_predicate
+import itertools
 
+from .utils import chain, typename, is_predicate
+
+
+# numpy is optional and slow to import, so it is only loaded by the array
+# methods that need it
+def _numpy():
+	try:
+		import numpy
+	except ImportError:
+		raise ImportError(f'Array support requires numpy') from None
+	return numpy
+
+
+def as_column(values):
+	# numbers become a numeric array; anything else, including tuples,
+	# becomes a one-dimensional object array
+	np = _numpy()
+	if isinstance(values, np.ndarray) and values.ndim == 1:
+		return values
+	values = list(values)
+	if all(isinstance(v, (int, float, complex)) and not isinstance(v, bool) for v in values):
+		return np.array(values)
+	column = np.empty(len(values), dtype=object)
+	for i, v in enumerate(values):
+		column[i] = v
+	return column
+
+def _elementwise(predicate, array, vectorize=False):
+	np = _numpy()
+	if vectorize and array.dtype.kind in 'biufc':
+		# numeric predicates usually broadcast; anything that does not
+		# answer with one boolean per element falls back to a Python loop
+		try:
+			with np.errstate(all='ignore'):
+				mask = np.asarray(predicate(array))
+			if mask.shape == array.shape and mask.dtype == bool:
+				return mask
+		except Exception:
+			pass
+	# tolist hands the predicate Python scalars rather than numpy ones
+	return np.fromiter(map(predicate, array.ravel().tolist()), bool, array.size).reshape(array.shape)
 
 def get_restricted_type(_type, restriction):
 	if not isinstance(_type, type):
@@ -24,21 +65,38 @@ def get_restricted_type(_type, restriction):
 
 class AlgaeSet:
 
+	__slots__ = ('types', 'elements', 'exclusions', 'enumerator', 'sampler', 'parent')
+
 	def __init__(self, *elements):
 		if any(isinstance(e, type) for e in elements):
 			raise TypeError(f'Expected objects, not types')
-		self.types = []
-		self.elements = list(set(elements))
-		self.exclusions = []
+		self.types = ()
+		self.elements = tuple(set(elements))
+		self.exclusions = ()
+		self.enumerator = None
+		self.sampler = None
+		self.parent = None
 
 	@classmethod
 	def from_type(cls, _type):
 		if not isinstance(_type, type):
 			raise TypeError(f'Expected a class identifier, not an object')
 		_obj = cls()
-		_obj.types.append(_type)
+		_obj.types = (_type,)
 		return _obj
 
+	@classmethod
+	def from_iterable(cls, iterable):
+		_obj = cls()
+		_obj.update(iterable)
+		return _obj
+
+	@classmethod
+	def from_array(cls, array):
+		np = _numpy()
+		# deduplication happens in numpy before any Python objects exist
+		return cls.from_iterable(np.unique(np.asarray(array)).tolist())
+
 	@property
 	def is_infinite(self):
 		return bool(self.types)
@@ -51,88 +109,232 @@ class AlgaeSet:
 		return f'AlgaeSet{tuple(chain(self.types, self.elements))}'
 
 	def __eq__(self, other):
-		if not isinstance(other, self.__class__):
+		if self is other:
+			return True
+		if not isinstance(other, AlgaeSet):
 			return False
 		equal_types = set(self.types) == set(other.types)
 		equal_elements = set(self.elements) == set(other.elements)
 		equal_exclusions = set(self.exclusions) == set(other.exclusions)
 		return equal_types and equal_elements and equal_exclusions
 
+	def __iter__(self):
+		exclusions = self.exclusions
+		for e in self.elements:
+			if e not in exclusions:
+				yield e
+		if self.is_finite:
+			return
+		if self.enumerator is None:
+			raise TypeError(f'No enumerator registered for infinite {self}')
+		# enumerators may range over a superset, so members are re-checked
+		listed = set(self.elements)
+		for e in self.enumerator():
+			if e in self and e not in listed:
+				yield e
+
+	def register_enumerator(self, enumerator):
+		if not callable(enumerator):
+			raise TypeError(f'Expected callable, not {typename(enumerator)}')
+		self.enumerator = enumerator
+
+	def register_sampler(self, sampler):
+		if not callable(sampler):
+			raise TypeError(f'Expected callable, not {typename(sampler)}')
+		self.sampler = sampler
+
+	def sample(self, size, rng=None, max_rounds=100):
+		np = _numpy()
+		rng = np.random.default_rng(rng)
+		if self.is_finite:
+			members = tuple(self)
+			if not members:
+				raise ValueError(f'Cannot sample from the empty set')
+			return as_column(members)[rng.integers(0, len(members), size)]
+		if self.sampler is None:
+			raise TypeError(f'No sampler registered for infinite {self}')
+		# samplers may range over a superset, so each batch is filtered by
+		# membership until enough candidates are accepted
+		accepted, count = [], 0
+		for _ in range(max_rounds):
+			batch = as_column(self.sampler(rng, size))
+			batch = batch[self.contains_array(batch)]
+			accepted.append(batch)
+			count += len(batch)
+			if count >= size:
+				return np.concatenate(accepted)[:size]
+		raise ValueError(f'Rejection sampling from {self} accepted {count} of {size} candidates')
+
+	def window(self, start, stop=None, step=1):
+		if stop is None:
+			start, stop = 0, start
+		return itertools.islice(self, start, stop, step)
+
+	def chunks(self, size):
+		if not isinstance(size, int):
+			raise TypeError(f'Expected int, not {typename(size)}')
+		if size < 1:
+			raise ValueError(f'Expected a positive chunk size, not {size}')
+		iterator = iter(self)
+		while chunk := tuple(itertools.islice(iterator, size)):
+			yield chunk
+
 	def __contains__(self, candidate):
 		captured_by_type = any(isinstance(candidate, t) for t in self.types)
 		in_elements = candidate in self.elements
 		in_exclusions = candidate in self.exclusions
 		return (captured_by_type or in_elements) and not in_exclusions
 
+	def contains_array(self, array):
+		np = _numpy()
+		array = np.asarray(array)
+		if self.parent is None:
+			return _elementwise(self.__contains__, array)
+		parent, restriction = self.parent
+		mask = parent.contains_array(array)
+		mask[mask] = _elementwise(restriction, array[mask], vectorize=True)
+		return mask
+
 	def add(self, element):
-		if any(isinstance(element, t) for t in self.types):
-			return
-		if element in self.exclusions:
-			self.exclusions.remove(element)
-			return
-		self.elements.append(element)
+		self.update((element,))
+
+	def update(self, iterable):
+		types = self.types
+		present = set(self.elements)
+		excluded = set(self.exclusions)
+		lifted, fresh = set(), []
+		for e in iterable:
+			if isinstance(e, type):
+				raise TypeError(f'Expected objects, not types')
+			if e in excluded:
+				excluded.discard(e)
+				lifted.add(e)
+			# a lifted exclusion of a finite element has to be listed again
+			if e in present or any(isinstance(e, t) for t in types):
+				continue
+			present.add(e)
+			fresh.append(e)
+		if lifted:
+			self.exclusions = tuple(e for e in self.exclusions if e not in lifted)
+		if fresh:
+			self.elements += tuple(fresh)
 
 	def add_type(self, _type):
 		if not isinstance(_type, type):
 			raise TypeError(f'Expected a class identifier, not an object')
-		self.types.append(_type)
+		self.types += (_type,)
 
 	def remove(self, element):
 		if element not in self:
 			raise ValueError(f'{element} not in {self}')
-		if element in self.exclusions:
-			return
-		if element in self.elements:
-			self.elements.remove(element)
-		self.exclusions.append(element)
+		self.difference_update((element,))
+
+	def difference_update(self, iterable):
+		types = self.types
+		present = set(self.elements)
+		excluded = set(self.exclusions)
+		doomed, fresh = set(), []
+		for e in iterable:
+			if e in excluded:
+				continue
+			if e in present:
+				doomed.add(e)
+			elif not any(isinstance(e, t) for t in types):
+				continue
+			excluded.add(e)
+			fresh.append(e)
+		if doomed:
+			self.elements = tuple(e for e in self.elements if e not in doomed)
+		if fresh:
+			self.exclusions += tuple(fresh)
 
 	def remove_type(self, _type):
 		if not isinstance(_type, type):
 			raise TypeError(f'Expected a class identifier, not an object')
-		self.types.remove(_type)
+		if _type not in self.types:
+			raise ValueError(f'{_type} not in {self}')
+		self.types = tuple(t for t in self.types if t != _type)
 
 	def __or__(self, other):
 		if not isinstance(other, AlgaeSet):
 			raise TypeError(f'Expected AlgaeSet, not {typename(other)}')
 		if self.is_infinite and other.is_finite:
 			if all(any(isinstance(e, t) for t in self.types) for e in other.elements):
-				return self
-			union = self.__class__(*other.elements)
+				return AlgaeSet.copy(self)
+			union = AlgaeSet(*other.elements)
 			union.types = self.types
+			union.enumerator = self.enumerator
+			union.sampler = self.sampler
 			return union
 		if other.is_infinite and self.is_finite:
 			if all(any(isinstance(e, t) for t in other.types) for e in self.elements):
-				return other
-			union = self.__class__(*self.elements)
+				return AlgaeSet.copy(other)
+			union = AlgaeSet(*self.elements)
 			union.types = other.types
+			union.enumerator = other.enumerator
+			union.sampler = other.sampler
 			return union
-		union = self.__class__(*list(chain(self.elements, other.elements)))
-		union.types = list(chain(self.types, other.types))
-		union.exclusions = list(chain(self.exclusions, other.exclusions))
+		union = AlgaeSet(*chain(self.elements, other.elements))
+		union.types = tuple(chain(self.types, other.types))
+		union.exclusions = tuple(chain(self.exclusions, other.exclusions))
 		return union
 
 	def __and__(self, other):
 		if not isinstance(other, AlgaeSet):
 			raise TypeError(f'Expected AlgaeSet, not {typename(other)}')
-		intersection = self.__class__(*[
+		intersection = AlgaeSet(*[
 			e for e in self.elements if e in other.elements
 		])
-		intersection.types = [
+		intersection.types = tuple(
 			t for t in self.types if t in other.types
-		]
-		intersection.exclusions = [
+		)
+		intersection.exclusions = tuple(
 			t for t in self.exclusions if t in other.exclusions
-		]
+		)
+		intersection.enumerator = self.enumerator or other.enumerator
+		intersection.sampler = self.sampler or other.sampler
 		return intersection
 
 	def such_that(self, restriction):
 		if not is_predicate(restriction):
 			raise TypeError(f'Expected restriction to be a valid predicate')
 		restricted_elements = [e for e in self.elements if restriction(e)]
-		_obj = self.__class__(*restricted_elements)
-		_obj.types = [get_restricted_type(t, restriction) for t in self.types]
+		_obj = AlgaeSet(*restricted_elements)
+		_obj.types = tuple(get_restricted_type(t, restriction) for t in self.types)
+		_obj.enumerator = self.enumerator
+		_obj.sampler = self.sampler
+		# purely type-defined sets remember how they were restricted, so
+		# membership of whole arrays can reuse the parent's
+		if not self.elements and not self.exclusions:
+			_obj.parent = (self, restriction)
+		return _obj
+
+	# components are tuples, so copies share them instead of duplicating
+	def copy(self):
+		_obj = AlgaeSet.__new__(AlgaeSet)
+		_obj.types = self.types
+		_obj.elements = self.elements
+		_obj.exclusions = self.exclusions
+		_obj.enumerator = self.enumerator
+		_obj.sampler = self.sampler
+		_obj.parent = self.parent
 		return _obj
 
+	def freeze(self):
+		frozen = FrozenAlgaeSet.__new__(FrozenAlgaeSet)
+		frozen.types = self.types
+		frozen.elements = self.elements
+		frozen.exclusions = self.exclusions
+		frozen.enumerator = self.enumerator
+		frozen.sampler = self.sampler
+		frozen.parent = self.parent
+		frozen.fingerprint
+		return frozen
+
+	def lazy(self):
+		from .setexpressions import SetLeaf
+		return SetLeaf(self)
+
 	def has_subset(self, other):
 		if not isinstance(other, AlgaeSet):
 			raise TypeError(f'Expected AlgaeSet, not {typename(other)}')
@@ -186,8 +388,264 @@ class AlgaeSet:
 		return self.is_subset(other)
 
 
-C = AlgaeSet.from_type(int) | AlgaeSet.from_type(float) | AlgaeSet.from_type(complex)
-R = C.such_that(lambda e: e.imag == 0 if isinstance(e, complex) else True)
-Z = R.such_that(lambda e: e % 1 == 0)
-N = Z.such_that(lambda e: e >= 0)
+class FrozenAlgaeSet(AlgaeSet):
+
+	__slots__ = ('_fingerprint', '_derived')
+
+	DERIVED_CACHE_SIZE = 64
+
+	def __init__(self, *elements):
+		super().__init__(*elements)
+		self.fingerprint
+
+	@classmethod
+	def from_type(cls, _type):
+		return AlgaeSet.from_type(_type).freeze()
+
+	@classmethod
+	def from_iterable(cls, iterable):
+		return AlgaeSet.from_iterable(iterable).freeze()
+
+	# components are assignable only until the fingerprint seals them
+	def __setattr__(self, name, value):
+		if name in ('types', 'elements', 'exclusions'):
+			if getattr(self, '_fingerprint', None) is not None:
+				raise TypeError(f'Cannot reassign {name} of a frozen set')
+		super().__setattr__(name, value)
+
+	@property
+	def fingerprint(self):
+		if getattr(self, '_fingerprint', None) is None:
+			self._fingerprint = hash((
+				frozenset(self.types),
+				frozenset(self.elements),
+				frozenset(self.exclusions)
+			))
+		return self._fingerprint
+
+	def __hash__(self):
+		return self.fingerprint
+
+	def __eq__(self, other):
+		if self is other:
+			return True
+		if isinstance(other, FrozenAlgaeSet) and self.fingerprint != other.fingerprint:
+			return False
+		return super().__eq__(other)
+
+	def freeze(self):
+		return self
+
+	def copy(self):
+		return self
+
+	# neither operand can change, so derived sets are computed only once
+	def _derive(self, key, derive):
+		derived = getattr(self, '_derived', None)
+		if derived is None:
+			derived = self._derived = {}
+		if key not in derived:
+			if len(derived) >= self.DERIVED_CACHE_SIZE:
+				derived.clear()
+			derived[key] = derive()
+		return derived[key]
+
+	def _covers(self, other):
+		# finite operands are tested by membership, which NumericSets answer
+		# on their fast path
+		if other.is_finite:
+			return all(e in self for e in other)
+		return self.has_subset(other)
+
+	# frozen sets are safe to alias, so an operand that adds nothing leaves
+	# the result as the very same set
+	def __or__(self, other):
+		if isinstance(other, AlgaeSet) and self._covers(other):
+			return self
+		derive = lambda: super(FrozenAlgaeSet, self).__or__(other).freeze()
+		if not isinstance(other, FrozenAlgaeSet):
+			return derive()
+		return self._derive(('or', other), derive)
+
+	def __and__(self, other):
+		if isinstance(other, FrozenAlgaeSet) and other._covers(self):
+			return self
+		if isinstance(other, FrozenAlgaeSet) and self._covers(other):
+			return other
+		derive = lambda: super(FrozenAlgaeSet, self).__and__(other).freeze()
+		if not isinstance(other, FrozenAlgaeSet):
+			return derive()
+		return self._derive(('and', other), derive)
+
+	def such_that(self, restriction):
+		derive = lambda: super(FrozenAlgaeSet, self).such_that(restriction).freeze()
+		return self._derive(('such_that', restriction), derive)
+
+	def add(self, element):
+		raise TypeError(f'Cannot add to a frozen set')
+
+	def update(self, iterable):
+		raise TypeError(f'Cannot add to a frozen set')
+
+	def add_type(self, _type):
+		raise TypeError(f'Cannot add to a frozen set')
+
+	def remove(self, element):
+		raise TypeError(f'Cannot remove from a frozen set')
+
+	def difference_update(self, iterable):
+		raise TypeError(f'Cannot remove from a frozen set')
+
+	def remove_type(self, _type):
+		raise TypeError(f'Cannot remove from a frozen set')
+
+
+def _in_C(e):
+	return isinstance(e, (int, float, complex))
+
+def _in_R(e):
+	if isinstance(e, (int, float)):
+		return True
+	return isinstance(e, complex) and e.imag == 0
+
+def _in_Z(e):
+	if isinstance(e, int):
+		return True
+	if isinstance(e, float):
+		return e.is_integer()
+	return isinstance(e, complex) and e.imag == 0 and e.real.is_integer()
+
+def _in_N(e):
+	return _in_Z(e) and e.real >= 0
+
+
+class NumericSet(FrozenAlgaeSet):
+
+	# kinds ordered by inclusion, N < Z < R < C
+	KINDS = ('N', 'Z', 'R', 'C')
+	MEMBERSHIP = {'N': _in_N, 'Z': _in_Z, 'R': _in_R, 'C': _in_C}
+
+	__slots__ = ('kind', '_contains')
+
+	def __init__(self, kind, aset):
+		if kind not in self.KINDS:
+			raise ValueError(f'Expected one of {self.KINDS}, not {kind!r}')
+		if not isinstance(aset, AlgaeSet):
+			raise TypeError(f'Expected AlgaeSet, not {typename(aset)}')
+		# the predicate-built components are kept so that such_that, | and
+		# & keep working; only membership and inclusion take the fast path
+		self.types = aset.types
+		self.elements = aset.elements
+		self.exclusions = aset.exclusions
+		self.enumerator = aset.enumerator
+		self.sampler = aset.sampler
+		self.parent = aset.parent
+		self.kind = kind
+		self._contains = self.MEMBERSHIP[kind]
+		self.fingerprint
+
+	def __repr__(self):
+		return f'NumericSet({self.kind})'
+
+	def __contains__(self, candidate):
+		return self._contains(candidate)
+
+	# equality and hash both go by kind, so a NumericSet only ever equals
+	# the NumericSet of the same kind
+	def __eq__(self, other):
+		return isinstance(other, NumericSet) and self.kind == other.kind
+
+	def __hash__(self):
+		return hash((NumericSet, self.kind))
+
+	def has_subset(self, other):
+		if isinstance(other, NumericSet):
+			return self.KINDS.index(other.kind) <= self.KINDS.index(self.kind)
+		return super().has_subset(other)
+
+	def is_subset(self, other):
+		if isinstance(other, NumericSet):
+			return other.has_subset(self)
+		return super().is_subset(other)
+
+	def contains_array(self, array):
+		np = _numpy()
+		array = np.asarray(array)
+		kind = array.dtype.kind
+		if kind == 'O':
+			return np.fromiter(map(self._contains, array.flat), bool, array.size).reshape(array.shape)
+		if kind not in 'biufc':
+			return np.zeros(array.shape, bool)
+		if self.kind == 'C':
+			return np.ones(array.shape, bool)
+		if kind == 'c':
+			real = array.real
+			mask = array.imag == 0
+		else:
+			real = array
+			mask = np.ones(array.shape, bool)
+		if self.kind == 'R':
+			return mask
+		if kind == 'f' or kind == 'c':
+			mask &= np.isfinite(real) & (real == np.floor(real))
+		if self.kind == 'N' and kind != 'u':
+			mask &= real >= 0
+		return mask
+
+
+def _enumerate_integers():
+	yield 0
+	for n in itertools.count(1):
+		yield n
+		yield -n
+
+# samplers draw magnitudes log-uniformly, so small values and edge cases
+# such as zero turn up as often as large ones
+
+def _sample_naturals(rng, size):
+	return rng.integers(0, 2**rng.integers(1, 20, size))
+
+def _sample_integers(rng, size):
+	return _sample_naturals(rng, size) * rng.choice((-1, 1), size)
+
+def _sample_reals(rng, size):
+	return rng.standard_normal(size) * 10.0**rng.integers(-3, 4, size)
+
+def _sample_complexes(rng, size):
+	return _sample_reals(rng, size) + 1j * _sample_reals(rng, size)
+
+def _complexes():
+	C = NumericSet('C', AlgaeSet.from_type(int) | AlgaeSet.from_type(float) | AlgaeSet.from_type(complex))
+	C.register_sampler(_sample_complexes)
+	return C
+
+def _reals():
+	R = NumericSet('R', _standard_set('C').such_that(lambda e: e.imag == 0 if isinstance(e, complex) else True))
+	R.register_sampler(_sample_reals)
+	return R
+
+def _integers():
+	Z = NumericSet('Z', _standard_set('R').such_that(lambda e: e % 1 == 0))
+	Z.register_enumerator(_enumerate_integers)
+	Z.register_sampler(_sample_integers)
+	return Z
+
+def _naturals():
+	N = NumericSet('N', _standard_set('Z').such_that(lambda e: e >= 0))
+	N.register_enumerator(lambda: itertools.count(0))
+	N.register_sampler(_sample_naturals)
+	return N
+
+_STANDARD_SETS = {'C': _complexes, 'R': _reals, 'Z': _integers, 'N': _naturals}
+
+# C, R, Z and N are built on first access and then stored as ordinary
+# module attributes, so later lookups bypass __getattr__
+def _standard_set(name):
+	if name not in globals():
+		globals()[name] = _STANDARD_SETS[name]()
+	return globals()[name]
 
+def __getattr__(name):
+	if name in _STANDARD_SETS:
+		return _standard_set(name)
+	raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,13 +1,15 @@
 
 from collections.abc import Sequence
 
-from utils import typename, num_kwargs, num_args
-from algaeset import AlgaeSet
-from properties import DomainError, commutative, associative, indempotent, identity, invertible
+from .utils import typename, num_kwargs, num_args
+from .algaeset import AlgaeSet
+from .properties import DomainError, commutative, associative, indempotent, has_identity, has_inverse
 
 
 class Mapping:
 
+	__slots__ = ('mapping', 'domains', 'codomains', 'input_dim', 'output_dim', 'verifier', 'witness_cache')
+
 	def __init__(self, mapping, domains, codomains):
 		if not callable(mapping):
 			raise TypeError(f'Expected callable, not {typename(mapping)}')
@@ -27,10 +29,12 @@ class Mapping:
 			raise ValueError(f'Cannot specify more input domains than there are mapping inputs')
 		
 		self.mapping = mapping
-		self.domains = domains
-		self.codomains = codomains
+		self.domains = tuple(domains)
+		self.codomains = tuple(codomains)
 		self.input_dim = len(self.domains)
 		self.output_dim = len(self.codomains)
+		self.verifier = None
+		self.witness_cache = None
 
 	def __call__(self, *args):
 		if len(args) != self.input_dim:
@@ -46,8 +50,8 @@ class Mapping:
 		if self.output_dim == 1:
 			if isinstance(output, Sequence) and len(output) != 1:
 				raise DomainError(f'Expected output to be strictly one-dimensional')
-			if output not in self.domains[0]:
-				raise DomainError(f'Expected output {output} to be in {self.domains[0]}')
+			if output not in self.codomains[0]:
+				raise DomainError(f'Expected output {output} to be in {self.codomains[0]}')
 			return output
 		if len(output) != self.output_dim:
 			raise DomainError(f'Expected output to be strictly {self.output_dim}-dimensional')
@@ -56,9 +60,39 @@ class Mapping:
 				raise DomainError(f'Expected output {result} to be in {codomain}')
 		return output
 
+	def batch(self, *columns):
+		# evaluates many argument tuples with the domain checks hoisted out
+		# of the per-call path; axiom checks of subclasses stay per-call
+		if len(columns) != self.input_dim:
+			raise ValueError(f'Expected {self.input_dim} columns, got {len(columns)} columns')
+		columns = [tuple(column) for column in columns]
+		if len({len(column) for column in columns}) > 1:
+			raise ValueError(f'Expected columns of equal length, got lengths {[len(c) for c in columns]}')
+		for column, domain in zip(columns, self.domains):
+			for arg in column:
+				if arg not in domain:
+					raise DomainError(f'Expected argument {arg} to be in {domain}')
+		mapping = self.mapping
+		outputs = [mapping(*args) for args in zip(*columns)]
+		if self.output_dim == 1:
+			codomain = self.codomains[0]
+			for output in outputs:
+				if output not in codomain:
+					raise DomainError(f'Expected output {output} to be in {codomain}')
+			return outputs
+		for output in outputs:
+			if len(output) != self.output_dim:
+				raise DomainError(f'Expected output to be strictly {self.output_dim}-dimensional')
+			for result, codomain in zip(output, self.codomains):
+				if result not in codomain:
+					raise DomainError(f'Expected output {result} to be in {codomain}')
+		return outputs
+
 
 class Endomorphism(Mapping):
 
+	__slots__ = ('domain', 'range')
+
 	def __init__(self, mapping, domain):
 		super().__init__(mapping, [domain], [domain])
 		self.domain = domain
@@ -70,6 +104,8 @@ class Endomorphism(Mapping):
 
 class BinaryOperation(Mapping):
 
+	__slots__ = ('domain', 'range')
+
 	def __init__(self, mapping, domain, codomain):
 		super().__init__(mapping, [domain, domain], [codomain])
 		self.domain = domain
@@ -81,12 +117,16 @@ class BinaryOperation(Mapping):
 
 class ClosedOperation(BinaryOperation):
 
+	__slots__ = ()
+
 	def __init__(self, mapping, domain):
 		super().__init__(mapping, domain, domain)
 
 
 class CommutativeOperation(BinaryOperation):
 
+	__slots__ = ()
+
 	@commutative
 	def __call__(self, a, b):
 		return super().__call__(a, b)
@@ -94,20 +134,26 @@ class CommutativeOperation(BinaryOperation):
 
 class ClosedCommutativeOperation(CommutativeOperation):
 
+	__slots__ = ()
+
 	def __init__(self, mapping, domain):
 		super().__init__(mapping, domain, domain)
 
 
 class AbelianOperation(CommutativeOperation):
-	...
+
+	__slots__ = ()
 
 
 class ClosedAbelianOperation(ClosedCommutativeOperation):
-	...
+
+	__slots__ = ()
 
 
 class AssociativeOperation(BinaryOperation):
 
+	__slots__ = ()
+
 	@associative
 	def __call__(self, a, b):
 		return super().__call__(a, b)
@@ -115,12 +161,16 @@ class AssociativeOperation(BinaryOperation):
 
 class ClosedAssociativeOperation(AssociativeOperation):
 
+	__slots__ = ()
+
 	def __init__(self, mapping, domain):
 		super().__init__(mapping, domain, domain)
 
 
 class IndempotentOperation(BinaryOperation):
 
+	__slots__ = ()
+
 	@indempotent
 	def __call__(self, a, b):
 		return super().__call__(a, b)
@@ -128,29 +178,42 @@ class IndempotentOperation(BinaryOperation):
 
 class ClosedIndempotentOperation(IndempotentOperation):
 
+	__slots__ = ()
+
 	def __init__(self, mapping, domain):
 		super().__init__(mapping, domain, domain)
 
 
 class IdentityOperation(BinaryOperation):
 
+	__slots__ = ('identity',)
+
 	def __init__(self, mapping, domain, codomain, identity):
-		super().__init__(mapping, domain, codomain)
+		# called explicitly so that subclasses mixing in Closed* bases keep
+		# a consistent constructor chain
+		BinaryOperation.__init__(self, mapping, domain, codomain)
 		if identity not in domain:
 			raise ValueError(f'Expected identity {identity} to be in domain {domain}')
 		if identity not in codomain:
 			raise ValueError(f'Expected identity {identity} to be in codomain {codomain}')
 		self.identity = identity
-		self.__call__ = lambda self, a, b: identity(self.identity)(super().__call__)(a, b)
+
+	@has_identity
+	def __call__(self, a, b):
+		return super().__call__(a, b)
 
 
 class ClosedIdentityOperation(IdentityOperation):
 
+	__slots__ = ()
+
 	def __init__(self, mapping, domain, identity):
 		super().__init__(mapping, domain, domain, identity)
 
 
-class AssociativeIdentityOperation(IdentityOperation, AssociativeOperation):
+class AssociativeIdentityOperation(AssociativeOperation, IdentityOperation):
+
+	__slots__ = ()
 
 	def __init__(self, mapping, domain, codomain, identity):
 		super().__init__(mapping, domain, codomain, identity)
@@ -158,14 +221,18 @@ class AssociativeIdentityOperation(IdentityOperation, AssociativeOperation):
 
 class ClosedAssociativeIdentityOperation(AssociativeIdentityOperation):
 
+	__slots__ = ()
+
 	def __init__(self, mapping, domain, identity):
 		super().__init__(mapping, domain, domain, identity)
 
 
 class InvertibleOperation(IdentityOperation):
 
+	__slots__ = ('inverse_mapping',)
+
 	def __init__(self, mapping, inverse_mapping, domain, codomain, identity):
-		super().__init__(mapping, domain, codomain, identity)
+		IdentityOperation.__init__(self, mapping, domain, codomain, identity)
 		if not isinstance(inverse_mapping, BinaryOperation):
 			raise TypeError(f'Expected BinaryOperation, not {typename(inverse_mapping)}')
 		if inverse_mapping.domain != codomain:
@@ -173,23 +240,28 @@ class InvertibleOperation(IdentityOperation):
 		if inverse_mapping.range != domain:
 			raise ValueError(f'Expected domain of {inverse_mapping} to be the domain of {mapping}')
 		self.inverse_mapping = inverse_mapping
-		self.__call__ = lambda self, a, b: invertible(self.identity, self.inverse_mapping)(super().__call__)(a, b)
+
+	@has_inverse
+	def __call__(self, a, b):
+		return super().__call__(a, b)
 
 
 class ClosedInvertibleOperation(InvertibleOperation):
 
+	__slots__ = ()
+
 	def __init__(self, mapping, inverse_mapping, domain, identity):
 		super().__init__(mapping, inverse_mapping, domain, domain, identity)
 
 
-class GroupOperation(ClosedInvertibleOperation):
+class GroupOperation(ClosedAssociativeIdentityOperation, ClosedInvertibleOperation):
+
+	__slots__ = ()
+
+	def __init__(self, mapping, inverse_mapping, domain, identity):
+		ClosedInvertibleOperation.__init__(self, mapping, inverse_mapping, domain, identity)
 
-	@associative
-	def __call__(self, a, b):
-		return super().__call__(a, b)
 
 class AbelianGroupOperation(GroupOperation, ClosedAbelianOperation):
 
-	@commutative
-	def __call__(self, a, b):
-		return super().__call__(a, b)
+	__slots__ = ()
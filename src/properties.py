@@ -1,8 +1,11 @@
 
+import collections
 import functools
 import itertools
+import queue
+import threading
 
-from utils import typename, num_args
+from .utils import typename, num_args
 
 
 class DomainError(ValueError):
@@ -36,51 +39,206 @@ class InvertibilityError(PropertyError):
 class IdentityError(PropertyError):
 	...
 
+
+class HomomorphismError(PropertyError):
+	...
+
+
+class DistributivityError(PropertyError):
+	...
+
+
+# marks the thread of a BackgroundVerifier; operations called while checking
+# a witness are the witness's own subexpressions and are not checked again
+_verifying = threading.local()
+
+# witnesses kept per check of each instance; checks are cubic in their
+# witnesses and every copy travels through the verifier queue
+MAX_WITNESSES = 12
+
+
+class BackgroundVerifier:
+
+	def __init__(self, maxsize=1024, policy='block', callback=None):
+		if not isinstance(maxsize, int):
+			raise TypeError(f'Expected int, not {typename(maxsize)}')
+		if maxsize < 1:
+			raise ValueError(f'Expected a positive queue size, not {maxsize}')
+		if policy not in ('block', 'drop'):
+			raise ValueError(f'Expected policy to be \'block\' or \'drop\', not {policy!r}')
+		if callback is not None and not callable(callback):
+			raise TypeError(f'Expected callable, not {typename(callback)}')
+		self.policy = policy
+		self.callback = callback
+		self.dropped = 0
+		self.violations = []
+		self._queue = queue.Queue(maxsize)
+		self._lock = threading.Lock()
+		self._closed = False
+		self._worker = threading.Thread(target=self._drain, daemon=True)
+		self._worker.start()
+
+	def _drain(self):
+		_verifying.active = True
+		while True:
+			job = self._queue.get()
+			try:
+				if job is None:
+					return
+				check, witness = job
+				try:
+					check(*witness)
+				except Exception as error:
+					self._report(error)
+			finally:
+				self._queue.task_done()
+
+	def _report(self, error):
+		if self.callback is not None:
+			try:
+				self.callback(error)
+				return
+			except Exception as failure:
+				# a failing callback must not stop the worker, or blocked
+				# submits and join would wait on it forever
+				error = failure
+		with self._lock:
+			self.violations.append(error)
+
+	def submit(self, check, *witness):
+		if self._closed:
+			raise RuntimeError(f'Cannot submit to a closed {typename(self)}')
+		if self.policy == 'block':
+			self._queue.put((check, witness))
+			return True
+		try:
+			self._queue.put_nowait((check, witness))
+		except queue.Full:
+			with self._lock:
+				self.dropped += 1
+			return False
+		return True
+
+	def raise_pending(self):
+		with self._lock:
+			if not self.violations:
+				return
+			error = self.violations.pop(0)
+		raise error
+
+	def join(self):
+		self._queue.join()
+		self.raise_pending()
+
+	def close(self):
+		if self._closed:
+			return
+		self._closed = True
+		self._queue.put(None)
+		self._worker.join()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+		if exc_type is None:
+			self.raise_pending()
+
+
+def _verify(_obj, check, *witness):
+	verifier = getattr(_obj, 'verifier', None)
+	if verifier is None:
+		_verifying.active = True
+		try:
+			check(*witness)
+		finally:
+			_verifying.active = False
+		return
+	verifier.raise_pending()
+	verifier.submit(check, *witness)
+
+def _witnesses(_obj, check, left, right):
+	# every instance keeps the most recent witnesses of each of its checks;
+	# witnesses outside its domain would only fail the check spuriously
+	caches = _obj.witness_cache
+	if caches is None:
+		caches = _obj.witness_cache = {}
+	cache = caches.get(check)
+	if cache is None:
+		cache = caches[check] = collections.deque(maxlen=MAX_WITNESSES)
+	domain = getattr(_obj, 'domain', None)
+	for w in (left, right):
+		if domain is None or w in domain:
+			cache.append(w)
+	return tuple(cache)
+
+def _checked(_op, check):
+	@functools.wraps(_op)
+	def operation(_obj, left, right):
+		if getattr(_verifying, 'active', False):
+			return _op(_obj, left, right)
+		_verify(_obj, check, _obj, _witnesses(_obj, check, left, right))
+		return _op(_obj, left, right)
+	return operation
+
 def associative(_op):
 	# TODO: ensure that _op must be a bound method
 	if num_args(_op) < 3:
 		raise ValueError(f'Expected bound method to take at least two arguments')
-	input_cache = []
-	@functools.wraps(_op)
-	def operation(_obj, left, right):
-		input_cache.append(left)
-		input_cache.append(right)
-		if len(input_cache) >= 3:
-			for a, b, c in itertools.permutations(input_cache, 3):
+	def check(_obj, witnesses):
+		if len(witnesses) >= 3:
+			for a, b, c in itertools.permutations(witnesses, 3):
 				if not _op(_obj, _op(_obj, a, b), c) == _op(_obj, a, _op(_obj, b, c)):
 					raise AssociativityError(f'Operation {_op} is not associative')
-		return _op(_obj, left, right)
-	return operation
+	return _checked(_op, check)
 
 def commutative(_op):
 	# TODO: ensure that _op must be a bound method
 	if num_args(_op) < 3:
 		raise ValueError(f'Expected bound method to take at least two arguments')
-	input_cache = []
-	@functools.wraps(_op)
-	def operation(_obj, left, right):
-		input_cache.append(left)
-		input_cache.append(right)
-		for a, b in itertools.permutations(input_cache, 2):
+	def check(_obj, witnesses):
+		for a, b in itertools.permutations(witnesses, 2):
 			if not _op(_obj, a, b) == _op(_obj, b, a):
 				raise CommutativityError(f'Operation {_op} is not commutative')
-		return _op(_obj, left, right)
-	return operation
+	return _checked(_op, check)
 
 def indempotent(_op):
 	# TODO: ensure that _op must be a bound method
 	if num_args(_op) < 3:
 		raise ValueError(f'Expected bound method to take at least two arguments')
-	input_cache = []
-	@functools.wraps(_op)
-	def operation(_obj, left, right):
-		input_cache.append(left)
-		input_cache.append(right)
-		for e in input_cache:
+	def check(_obj, witnesses):
+		for e in witnesses:
 			if not _op(_obj, e, e) == e:
 				raise IndempotencyError(f'Operation {_op} is not indempotent')
-		return _op(_obj, left, right)
-	return operation
+	return _checked(_op, check)
+
+def has_identity(_op):
+	# reads the identity off the bound object, so one decorated method
+	# serves every instance
+	if num_args(_op) < 3:
+		raise ValueError(f'Expected bound method to take at least two arguments')
+	def check(_obj, witnesses):
+		for e in witnesses:
+			if not _op(_obj, _obj.identity, e) == e:
+				raise IdentityError(f'Operation {_op} does not have left identity {_obj.identity}')
+			if not _op(_obj, e, _obj.identity) == e:
+				raise IdentityError(f'Operation {_op} does not have right identity {_obj.identity}')
+	return _checked(_op, check)
+
+def has_inverse(_op):
+	# reads the identity and inverse operation off the bound object
+	if num_args(_op) < 3:
+		raise ValueError(f'Expected bound method to take at least two arguments')
+	def check(_obj, witnesses):
+		_inv_op = _obj.inverse_mapping
+		for a, b in itertools.permutations(witnesses, 2):
+			if not _inv_op(_op(_obj, a, b), b) == a:
+				raise InvertibilityError(f'Operation {_op} is not right invertible via {_inv_op}')
+		for e in witnesses:
+			if not _inv_op(e, e) == _obj.identity:
+				raise IdentityError(f'Operation {_op} with inverse operation {_inv_op} does not have identity {_obj.identity}')
+	return _checked(_op, check)
 
 def identity(candidate):
 	def decorator(_op):
@@ -115,7 +273,7 @@ def invertible(identity, _inv_op):
 			if len(input_cache) >= 3:
 				for a, b, c in itertools.permutations(input_cache, 3):
 					if a != _inv_op(c, b):
-						raise InvertiblityError(f'Operation {_op} is not right invertible via {_inv_op}')
+						raise InvertibilityError(f'Operation {_op} is not right invertible via {_inv_op}')
 					if b != _inv_op(c, a):
 						raise InvertibilityError(f'Operation {_op} is not left invertible via {_inv_op}')
 			for e in input_cache:
@@ -0,0 +1,282 @@
+
+import abc
+
+from .utils import typename, is_predicate
+from .algaeset import AlgaeSet
+
+
+class SetExpression(abc.ABC):
+
+	__slots__ = ('key', '_membership', '_elements')
+
+	def __init__(self, key):
+		self.key = key
+		self._membership = None
+		self._elements = None
+
+	def __repr__(self):
+		return f'{typename(self)}{self.key}'
+
+	def __eq__(self, other):
+		if not isinstance(other, SetExpression):
+			return False
+		return self.key == other.key
+
+	def __hash__(self):
+		return hash(self.key)
+
+	def __or__(self, other):
+		return union(self, as_expression(other))
+
+	def __ror__(self, other):
+		return union(as_expression(other), self)
+
+	def __and__(self, other):
+		return intersection(self, as_expression(other))
+
+	def __rand__(self, other):
+		return intersection(as_expression(other), self)
+
+	def __sub__(self, other):
+		return intersection(self, complement(as_expression(other)))
+
+	def __rsub__(self, other):
+		return intersection(as_expression(other), complement(self))
+
+	def __invert__(self):
+		return complement(self)
+
+	def such_that(self, restriction):
+		if not is_predicate(restriction):
+			raise TypeError(f'Expected restriction to be a valid predicate')
+		return restrict(self, (restriction,))
+
+	@property
+	@abc.abstractmethod
+	def is_finite(self):
+		...
+
+	@property
+	def is_infinite(self):
+		return not self.is_finite
+
+	def membership(self):
+		if self._membership is None:
+			self._membership = self._compile()
+		return self._membership
+
+	def __contains__(self, candidate):
+		return self.membership()(candidate)
+
+	def elements(self):
+		if not self.is_finite:
+			raise TypeError(f'Cannot list the elements of infinite {self}')
+		if self._elements is None:
+			self._elements = frozenset(self._finite_elements())
+		return self._elements
+
+	def __iter__(self):
+		return iter(self.elements())
+
+	def evaluate(self):
+		return AlgaeSet(*self.elements())
+
+	@abc.abstractmethod
+	def _compile(self):
+		...
+
+	@abc.abstractmethod
+	def _finite_elements(self):
+		...
+
+
+class SetLeaf(SetExpression):
+
+	__slots__ = ('aset',)
+
+	def __init__(self, aset):
+		if not isinstance(aset, AlgaeSet):
+			raise TypeError(f'Expected AlgaeSet, not {typename(aset)}')
+		# leaves snapshot their set, and the frozen snapshot is its own key,
+		# so structurally equal leaves are one operand
+		aset = aset.freeze()
+		super().__init__(('leaf', aset))
+		self.aset = aset
+
+	def __repr__(self):
+		return f'SetLeaf({self.aset})'
+
+	@property
+	def is_finite(self):
+		return self.aset.is_finite
+
+	def _compile(self):
+		if self.aset.is_finite:
+			elements = self.elements()
+			return elements.__contains__
+		return self.aset.__contains__
+
+	def _finite_elements(self):
+		exclusions = self.aset.exclusions
+		return (e for e in self.aset.elements if e not in exclusions)
+
+
+class SetRestriction(SetExpression):
+
+	__slots__ = ('child', 'predicates')
+
+	def __init__(self, child, predicates):
+		super().__init__(('such_that', child.key, tuple(predicates)))
+		self.child = child
+		self.predicates = predicates
+
+	@property
+	def is_finite(self):
+		return self.child.is_finite
+
+	def _compile(self):
+		if self.is_finite:
+			return self.elements().__contains__
+		inner = self.child.membership()
+		predicates = self.predicates
+		return lambda x: inner(x) and all(p(x) for p in predicates)
+
+	def _finite_elements(self):
+		predicates = self.predicates
+		return (
+			e for e in self.child.elements() if all(p(e) for p in predicates)
+		)
+
+
+class SetComplement(SetExpression):
+
+	__slots__ = ('child',)
+
+	def __init__(self, child):
+		super().__init__(('not', child.key))
+		self.child = child
+
+	@property
+	def is_finite(self):
+		return False
+
+	def _compile(self):
+		inner = self.child.membership()
+		return lambda x: not inner(x)
+
+	def _finite_elements(self):
+		# complements are never finite, so elements() never gets here
+		return ()
+
+
+class SetUnion(SetExpression):
+
+	__slots__ = ('children',)
+
+	def __init__(self, children):
+		super().__init__(('or', frozenset(c.key for c in children)))
+		self.children = children
+
+	@property
+	def is_finite(self):
+		return all(c.is_finite for c in self.children)
+
+	def _compile(self):
+		if self.is_finite:
+			return self.elements().__contains__
+		# every finite operand collapses into one hash lookup tried first
+		finite = frozenset().union(*(
+			c.elements() for c in self.children if c.is_finite
+		))
+		tests = tuple(
+			c.membership() for c in self.children if not c.is_finite
+		)
+		return lambda x: x in finite or any(t(x) for t in tests)
+
+	def _finite_elements(self):
+		return frozenset().union(*(c.elements() for c in self.children))
+
+
+class SetIntersection(SetExpression):
+
+	__slots__ = ('children',)
+
+	def __init__(self, children):
+		super().__init__(('and', frozenset(c.key for c in children)))
+		self.children = children
+
+	@property
+	def is_finite(self):
+		return any(c.is_finite for c in self.children)
+
+	def _compile(self):
+		if self.is_finite:
+			return self.elements().__contains__
+		tests = tuple(c.membership() for c in self.children)
+		return lambda x: all(t(x) for t in tests)
+
+	def _finite_elements(self):
+		# the smallest finite operand is scanned once against the others
+		finite = min(
+			(c for c in self.children if c.is_finite),
+			key=lambda c: len(c.elements())
+		)
+		tests = tuple(c.membership() for c in self.children if c is not finite)
+		return (e for e in finite.elements() if all(t(e) for t in tests))
+
+
+def as_expression(candidate):
+	if isinstance(candidate, SetExpression):
+		return candidate
+	if isinstance(candidate, AlgaeSet):
+		return SetLeaf(candidate)
+	raise TypeError(f'Expected AlgaeSet or SetExpression, not {typename(candidate)}')
+
+def _flatten(kind, operands):
+	for o in operands:
+		if isinstance(o, kind):
+			yield from o.children
+		else:
+			yield o
+
+def _unique(operands):
+	seen = {}
+	for o in operands:
+		seen.setdefault(o.key, o)
+	return tuple(seen.values())
+
+def union(*operands):
+	children = _unique(_flatten(SetUnion, operands))
+	keys = {c.key for c in children}
+	# absorption: A | (A & B) = A
+	children = tuple(
+		c for c in children
+		if not (isinstance(c, SetIntersection) and any(g.key in keys for g in c.children))
+	)
+	if len(children) == 1:
+		return children[0]
+	return SetUnion(children)
+
+def intersection(*operands):
+	children = _unique(_flatten(SetIntersection, operands))
+	keys = {c.key for c in children}
+	# absorption: A & (A | B) = A
+	children = tuple(
+		c for c in children
+		if not (isinstance(c, SetUnion) and any(g.key in keys for g in c.children))
+	)
+	if len(children) == 1:
+		return children[0]
+	return SetIntersection(children)
+
+def complement(operand):
+	# involution: ~~A = A
+	if isinstance(operand, SetComplement):
+		return operand.child
+	return SetComplement(operand)
+
+def restrict(operand, predicates):
+	# predicate fusion: restrictions of restrictions become one restriction
+	if isinstance(operand, SetRestriction):
+		return SetRestriction(operand.child, operand.predicates + predicates)
+	return SetRestriction(operand, predicates)
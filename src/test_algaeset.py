@@ -1,7 +1,8 @@
 
-from pytest import fixture, raises
+from pytest import fixture, raises, importorskip
 
 from .algaeset import *
+from . import algaeset
 
 @fixture
 def C():
@@ -115,3 +116,235 @@ class TestAlgaeSet:
         assert AlgaeSet(1, 2, 3).has_subset(AlgaeSet(1, 2, 3))
         assert R.is_subset(R)
         assert R.has_subset(R)
+
+    def test_has_no_instance_dict(self):
+        assert not hasattr(AlgaeSet(1, 2), '__dict__')
+
+    def test_empty_components_are_shared(self):
+        assert AlgaeSet(1).types is AlgaeSet(2).types
+        assert AlgaeSet(1).exclusions is AlgaeSet(2).exclusions
+
+    def test_union_does_not_alias_mutations(self, R):
+        union = R | AlgaeSet('x')
+        union.add_type(str)
+        assert 'a' not in R
+
+
+class TestEnumeration:
+
+    def test_finite_set_enumerates_in_index_order(self):
+        s = AlgaeSet(3, 1, 2)
+        assert list(s) == list(s.elements)
+
+    def test_finite_enumeration_skips_exclusions(self):
+        s = AlgaeSet(1, 2, 3)
+        s.remove(2)
+        assert sorted(s) == [1, 3]
+
+    def test_infinite_set_without_enumerator(self, R):
+        with raises(TypeError):
+            next(iter(R))
+
+    def test_integers(self):
+        assert list(algaeset.Z.window(5)) == [0, 1, -1, 2, -2]
+
+    def test_restrictions_inherit_enumerator(self):
+        is_prime = lambda n: n > 1 and all(n % d for d in range(2, int(n**0.5) + 1))
+        primes = algaeset.N.such_that(is_prime)
+        assert list(primes.window(6)) == [2, 3, 5, 7, 11, 13]
+        assert list(primes.window(2, 4)) == [5, 7]
+
+    def test_finite_part_is_enumerated_first(self):
+        s = AlgaeSet(0.5) | algaeset.N
+        assert list(s.window(4)) == [0.5, 0, 1, 2]
+
+    def test_chunks(self):
+        assert list(algaeset.N.such_that(lambda e: e < 5).window(5)) == [0, 1, 2, 3, 4]
+        chunks = algaeset.N.chunks(3)
+        assert next(chunks) == (0, 1, 2)
+        assert next(chunks) == (3, 4, 5)
+        assert list(AlgaeSet(1, 2, 3).chunks(2))[-1] in {(1,), (2,), (3,)}
+
+    def test_chunks_rejects_nonpositive_size(self):
+        with raises(ValueError):
+            next(algaeset.N.chunks(0))
+
+
+class TestBulkOperations:
+
+    def test_update_deduplicates(self):
+        s = AlgaeSet(1)
+        s.update([1, 2, 2, 3, 3, 3])
+        assert s == AlgaeSet(1, 2, 3)
+        assert len(s.elements) == 3
+
+    def test_update_skips_type_captured_elements(self):
+        s = AlgaeSet.from_type(int)
+        s.update([1, 2, 'a'])
+        assert s.elements == ('a',)
+
+    def test_update_lifts_exclusions(self):
+        s = AlgaeSet(1, 2)
+        s.remove(1)
+        s.update([1])
+        assert 1 in s
+        ints = AlgaeSet.from_type(int)
+        ints.difference_update([3, 4])
+        ints.update([3])
+        assert 3 in ints and 4 not in ints
+
+    def test_update_rejects_types(self):
+        with raises(TypeError):
+            AlgaeSet().update([1, int])
+
+    def test_difference_update(self):
+        s = AlgaeSet(1, 2, 3, 4)
+        s.difference_update([2, 4, 5])
+        assert set(s) == {1, 3}
+        ints = AlgaeSet.from_type(int)
+        ints.difference_update(range(10))
+        assert 9 not in ints and 10 in ints
+
+    def test_from_iterable(self):
+        s = AlgaeSet.from_iterable(x % 7 for x in range(100))
+        assert s == AlgaeSet(*range(7))
+        assert list(s) == list(range(7))
+        assert isinstance(FrozenAlgaeSet.from_iterable([1, 2]), FrozenAlgaeSet)
+
+    def test_from_array(self):
+        np = importorskip('numpy')
+        s = AlgaeSet.from_array(np.array([[3, 1], [1, 2]]))
+        assert s == AlgaeSet(1, 2, 3)
+        assert all(type(e) is int for e in s)
+
+    def test_frozen_sets_reject_bulk_mutation(self):
+        with raises(TypeError):
+            FrozenAlgaeSet(1).update([2])
+        with raises(TypeError):
+            FrozenAlgaeSet(1).difference_update([1])
+
+
+class TestFrozenAlgaeSet:
+
+    def test_equal_sets_share_fingerprint_and_hash(self):
+        assert FrozenAlgaeSet(1, 2, 3).fingerprint == FrozenAlgaeSet(3, 2, 1).fingerprint
+        assert hash(FrozenAlgaeSet(1, 2)) == hash(AlgaeSet(2, 1).freeze())
+
+    def test_usable_as_dict_key(self):
+        cache = {FrozenAlgaeSet(1, 2): 'structure'}
+        assert cache[AlgaeSet(2, 1).freeze()] == 'structure'
+
+    def test_equality(self):
+        assert FrozenAlgaeSet(1, 2) == FrozenAlgaeSet(2, 1)
+        assert FrozenAlgaeSet(1, 2) != FrozenAlgaeSet(1, 3)
+        assert FrozenAlgaeSet(1, 2) == AlgaeSet(1, 2)
+        assert AlgaeSet(1, 2) == FrozenAlgaeSet(1, 2)
+
+    def test_infinite_frozen_sets(self):
+        assert FrozenAlgaeSet.from_type(int) == AlgaeSet.from_type(int).freeze()
+        assert 3 in FrozenAlgaeSet.from_type(int)
+
+    def test_rejects_mutation(self):
+        s = FrozenAlgaeSet(1, 2)
+        with raises(TypeError):
+            s.add(3)
+        with raises(TypeError):
+            s.remove(1)
+        with raises(TypeError):
+            s.add_type(int)
+        with raises(TypeError):
+            s.elements = (4,)
+
+    def test_freeze_keeps_enumerator(self):
+        assert list(algaeset.N.freeze().window(3)) == [0, 1, 2]
+
+    def test_mutable_sets_stay_unhashable(self):
+        with raises(TypeError):
+            hash(AlgaeSet(1))
+
+    def test_copies_are_free(self):
+        s = FrozenAlgaeSet(1, 2)
+        assert s.copy() is s
+        t = AlgaeSet(1, 2)
+        assert t.copy() is not t and t.copy().elements is t.elements
+
+    def test_union_never_aliases_mutable_operand(self):
+        ints = AlgaeSet.from_type(int)
+        union = ints | AlgaeSet(1, 2)
+        assert union is not ints
+        union.add_type(str)
+        assert 'a' not in ints
+
+    def test_derived_sets_are_cached(self):
+        s, t = FrozenAlgaeSet(1, 2, 3), FrozenAlgaeSet(3, 4)
+        assert (s | t) is (s | t)
+        assert (s & t) is (s & FrozenAlgaeSet(4, 3))
+        odd = lambda e: e % 2 == 1
+        assert s.such_that(odd) is s.such_that(odd)
+        assert s.such_that(odd) == AlgaeSet(1, 3)
+
+    def test_derived_sets_share_components(self):
+        ints = FrozenAlgaeSet.from_type(int)
+        union = ints | FrozenAlgaeSet(1.5)
+        assert union.types is ints.types
+
+    def test_derived_sets_stay_frozen(self):
+        s = FrozenAlgaeSet(1, 2, 3)
+        assert isinstance(s | AlgaeSet(4), FrozenAlgaeSet)
+        assert isinstance(s & AlgaeSet(1), FrozenAlgaeSet)
+        assert s.such_that(lambda e: e > 1) == AlgaeSet(2, 3)
+
+
+class TestNumericSet:
+
+    def test_standard_sets_are_numeric(self):
+        for s in (algaeset.C, algaeset.R, algaeset.Z, algaeset.N):
+            assert isinstance(s, NumericSet)
+
+    def test_membership(self):
+        Z, N = algaeset.Z, algaeset.N
+        assert 3 in Z and -3 in Z and True in Z
+        assert 3.0 in Z and 3.5 not in Z
+        assert float('inf') not in Z and float('nan') not in Z
+        assert (2 + 0j) in Z and (2 + 1j) not in Z
+        assert -1 not in N and 0 in N
+        assert '1' not in algaeset.C
+        assert 1j in algaeset.C and 1j not in algaeset.R
+
+    def test_agrees_with_predicates(self, Z):
+        for e in (0, 1, -1, 2.0, 2.5, -3.0, float('inf')):
+            assert (e in Z) == (e in algaeset.Z)
+
+    def test_subset_relations(self):
+        C, R, Z, N = algaeset.C, algaeset.R, algaeset.Z, algaeset.N
+        assert C.has_subset(R) and R.has_subset(Z) and Z.has_subset(N)
+        assert N.is_subset(C)
+        assert not N.has_subset(Z)
+        assert not C.is_subset(R)
+        assert Z.has_proper_subset(N)
+
+    def test_equal_sets_hash_equal(self):
+        Z = algaeset.Z
+        rebuilt = NumericSet('Z', Z.such_that(lambda e: True))
+        assert rebuilt == Z and hash(rebuilt) == hash(Z)
+        assert {Z: 1}[rebuilt] == 1
+        assert Z != algaeset.N
+
+    def test_covered_operands_keep_the_set(self):
+        R, Z = algaeset.R, algaeset.Z
+        assert (R | AlgaeSet(1.0)) is R
+        assert (R | Z) is R and (R & Z) is Z and (Z & R) is Z
+        union = R | AlgaeSet(1j)
+        assert union is not R and 1j in union and 2.5 in union
+
+    def test_restrictions_still_work(self):
+        evens = algaeset.Z.such_that(lambda e: e % 2 == 0)
+        assert 4 in evens and 3 not in evens
+
+    def test_contains_array(self):
+        np = importorskip('numpy')
+        Z, N, R = algaeset.Z, algaeset.N, algaeset.R
+        assert list(Z.contains_array(np.array([1.0, 1.5, np.inf]))) == [True, False, False]
+        assert list(N.contains_array(np.array([-1, 0, 1]))) == [False, True, True]
+        assert list(R.contains_array(np.array([1 + 0j, 1j]))) == [True, False]
+        assert list(Z.contains_array(np.array([1, 'a'], dtype=object))) == [True, False]
@@ -1,12 +1,12 @@
 
-from maps import *
+from .maps import *
 
 import math
 import cmath
 from pytest import raises
 
-from algaeset import C, R, Z, N
-from properties import *
+from .algaeset import C, R, Z, N
+from .properties import *
 
 
 class TestMapping:
@@ -205,14 +205,14 @@ class TestGroupOperation:
 		assert add(3, 5) == 8
 
 	def test_not_invertible(self):
-		add = GroupOperation(
+		bad_add = GroupOperation(
 			lambda a, b: a + b, 
-			BinaryOperation(lambda a, b: a - b, R, R), 
+			BinaryOperation(lambda a, b: a * b, R, R), 
 			R, 0
 		)
 		with raises(InvertibilityError):
-			assert add(12, 13) == 25
-			assert add(3, 5) == 8
+			assert bad_add(12, 13) == 25
+			assert bad_add(3, 5) == 8
 
 	def test_has_identity(self):
 		add = GroupOperation(
@@ -247,6 +247,57 @@ class TestGroupOperation:
 			BinaryOperation(lambda a, b: a + b, R, R), 
 			R, 0
 		)
+		# witnesses are per instance, and 0 passes the identity and inverse
+		# checks, so the second call gives associativity three witnesses
+		# before anything else can fail
+		assert sub(0, 0) == 0
 		with raises(AssociativityError):
-			assert sub(1, 2) == -1
-			assert sub(12, 3) == 9
+			sub(1, 2)
+
+
+class TestFootprint:
+
+	def test_operations_have_no_instance_dict(self):
+		add = GroupOperation(
+			lambda a, b: a + b,
+			BinaryOperation(lambda a, b: a - b, R, R),
+			R, 0
+		)
+		assert not hasattr(add, '__dict__')
+		assert not hasattr(BinaryOperation(lambda a, b: a, R, R), '__dict__')
+
+	def test_witnesses_are_per_instance_and_bounded(self):
+		add = AssociativeOperation(lambda a, b: a + b, R, R)
+		mul = AssociativeOperation(lambda a, b: a * b, R, R)
+		for a in range(100):
+			add(a, 1)
+		mul(2, 3)
+		assert [len(c) for c in add.witness_cache.values()] == [MAX_WITNESSES]
+		assert sorted(*mul.witness_cache.values()) == [2, 3]
+
+	def test_identity_check_is_not_bound_per_instance(self):
+		add = IdentityOperation(lambda a, b: a + b, R, R, identity=0)
+		assert type(add).__call__ is IdentityOperation.__call__
+
+
+class TestBatch:
+
+	def test_batch_evaluation(self):
+		square = Mapping(lambda x: x**2, [Z], [N])
+		assert square.batch(next(N.chunks(4))) == [0, 1, 4, 9]
+
+	def test_batch_checks_domains(self):
+		add = BinaryOperation(lambda a, b: a + b, N, N)
+		assert add.batch([1, 2], [3, 4]) == [4, 6]
+		with raises(DomainError):
+			add.batch([1, -2], [3, 4])
+
+	def test_batch_rejects_unequal_columns(self):
+		add = BinaryOperation(lambda a, b: a + b, N, N)
+		with raises(ValueError):
+			add.batch([1, 2, 3], [3, 4])
+
+	def test_batch_requires_every_column(self):
+		add = BinaryOperation(lambda a, b: a + b, N, N)
+		with raises(ValueError):
+			add.batch([1, 2])
@@ -0,0 +1,82 @@
+
+import threading
+from pytest import raises
+
+from .properties import *
+from .maps import AssociativeOperation, CommutativeOperation
+from .algaeset import R
+
+
+class TestBackgroundVerifier:
+
+	def test_rejects_unknown_policy(self):
+		with raises(ValueError):
+			BackgroundVerifier(policy='spill')
+
+	def test_rejects_nonpositive_size(self):
+		with raises(ValueError):
+			BackgroundVerifier(maxsize=0)
+
+	def test_valid_operation_passes(self):
+		add = AssociativeOperation(lambda a, b: a + b, R, R)
+		with BackgroundVerifier() as verifier:
+			add.verifier = verifier
+			assert add(1, 2) == 3
+			assert add(4, 5) == 9
+			verifier.join()
+
+	def test_violation_reaches_callback(self):
+		errors = []
+		sub = AssociativeOperation(lambda a, b: a - b, R, R)
+		sub.verifier = BackgroundVerifier(callback=errors.append)
+		assert sub(1, 2) == -1
+		assert sub(12, 3) == 9
+		sub.verifier.join()
+		sub.verifier.close()
+		assert any(isinstance(e, AssociativityError) for e in errors)
+
+	def test_violation_raised_on_join(self):
+		sub = CommutativeOperation(lambda a, b: a - b, R, R)
+		sub.verifier = BackgroundVerifier()
+		assert sub(5, 3) == 2
+		with raises(CommutativityError):
+			sub.verifier.join()
+		assert sub(1, 1) == 0
+		sub.verifier.close()
+
+	def test_failing_callback_keeps_worker_alive(self):
+		def check():
+			raise AssociativityError('not associative')
+		def callback(error):
+			raise RuntimeError('callback failed')
+		verifier = BackgroundVerifier(maxsize=1, callback=callback)
+		for _ in range(4):
+			verifier.submit(check)
+		with raises(RuntimeError):
+			verifier.join()
+		verifier.close()
+
+	def test_witness_copy_is_capped(self):
+		seen = []
+		add = AssociativeOperation(lambda a, b: a + b, R, R)
+		add.verifier = BackgroundVerifier()
+		add.verifier.submit = lambda check, obj, witnesses: seen.append(len(witnesses))
+		for a in range(50):
+			add(a, a + 1)
+		assert max(seen) == MAX_WITNESSES
+		add.verifier.close()
+
+	def test_drop_policy_counts_dropped_witnesses(self):
+		release = threading.Event()
+		verifier = BackgroundVerifier(maxsize=1, policy='drop')
+		accepted = [verifier.submit(release.wait) for _ in range(4)]
+		assert not all(accepted)
+		assert verifier.dropped == accepted.count(False)
+		release.set()
+		verifier.close()
+
+	def test_closed_verifier_rejects_witnesses(self):
+		verifier = BackgroundVerifier()
+		verifier.close()
+		with raises(RuntimeError):
+			verifier.submit(lambda: None)
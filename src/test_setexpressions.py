@@ -0,0 +1,90 @@
+
+from pytest import raises
+
+from .setexpressions import *
+from .algaeset import AlgaeSet, Z, N
+
+
+def is_even(e):
+	return e % 2 == 0
+
+def is_small(e):
+	return e < 10
+
+
+class TestSetExpression:
+
+	def test_lazy_wraps_set(self):
+		A = AlgaeSet(1, 2, 3)
+		assert isinstance(A.lazy(), SetLeaf)
+		assert 2 in A.lazy()
+
+	def test_union_membership(self):
+		expr = AlgaeSet(1, 2).lazy() | AlgaeSet(3)
+		assert 1 in expr
+		assert 3 in expr
+		assert 4 not in expr
+
+	def test_mixed_union_membership(self):
+		expr = (Z.lazy() & AlgaeSet(1, 2.5)) | N.lazy().such_that(is_even)
+		assert 1 in expr
+		assert 2.5 not in expr
+		assert 4 in expr
+		assert 5 not in expr
+		assert -2 not in expr
+
+	def test_difference_and_complement(self):
+		expr = Z.lazy() - AlgaeSet(0, 1)
+		assert 2 in expr
+		assert 0 not in expr
+		assert 0 in ~expr
+		assert ~~expr is expr
+
+	def test_idempotence(self):
+		A = Z.lazy()
+		assert (A | A) is A
+		assert (A & A) is A
+
+	def test_absorption(self):
+		A = Z.lazy()
+		B = AlgaeSet(1, 2).lazy()
+		assert (A | (A & B)) is A
+		assert (A & (A | B)) is A
+
+	def test_leaves_are_keyed_by_set(self):
+		assert AlgaeSet(1, 2).lazy() == AlgaeSet(2, 1).lazy()
+		assert len((AlgaeSet(1).lazy() | AlgaeSet(1).lazy() | AlgaeSet(2).lazy()).children) == 2
+
+	def test_abstract(self):
+		with raises(TypeError):
+			SetExpression(('leaf',))
+
+	def test_flattens_operands(self):
+		A, B, C = AlgaeSet(1).lazy(), AlgaeSet(2).lazy(), AlgaeSet(3).lazy()
+		assert ((A | B) | C) == (A | (B | C))
+		assert len(((A | B) | C).children) == 3
+
+	def test_predicate_fusion(self):
+		expr = N.lazy().such_that(is_even).such_that(is_small)
+		assert isinstance(expr, SetRestriction)
+		assert len(expr.predicates) == 2
+		assert 4 in expr
+		assert 12 not in expr
+
+	def test_finite_intersection_is_evaluated_from_finite_part(self):
+		expr = Z.lazy() & AlgaeSet(1, 2.5, 3).lazy()
+		assert expr.is_finite
+		assert set(expr) == {1, 3}
+		assert expr.evaluate() == AlgaeSet(1, 3)
+
+	def test_membership_is_compiled_once(self):
+		expr = Z.lazy() & N.lazy().such_that(is_even)
+		assert expr.membership() is expr.membership()
+
+	def test_infinite_expression_cannot_be_listed(self):
+		with raises(TypeError):
+			list(Z.lazy() | AlgaeSet(0.5))
+
+	def test_rejects_non_sets(self):
+		with raises(TypeError):
+			Z.lazy() | [1, 2]
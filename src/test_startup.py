@@ -0,0 +1,114 @@
+
+import os
+import sys
+import time
+import subprocess
+from pytest import mark
+
+from . import utils
+from .utils import num_args, num_kwargs, is_predicate, _signatures
+from .algaeset import AlgaeSet
+from .maps import BinaryOperation
+
+# the tests run the package in a fresh interpreter under whatever name it
+# was imported as here, from the directory that contains it
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = __package__
+
+# wall-clock budgets only run on request, ALGAE_BENCHMARK=1, since loaded
+# machines would flake; they are generous and catch regressions in kind
+IMPORT_BUDGET = 2.0
+CONSTRUCTION_BUDGET = 2.0
+benchmark = mark.skipif(
+	not os.environ.get('ALGAE_BENCHMARK'), reason='set ALGAE_BENCHMARK=1 to run timing budgets'
+)
+
+
+def run(code):
+	return subprocess.run(
+		[sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True
+	).stdout.split()
+
+
+class TestStartup:
+
+	def test_import_stays_lazy(self):
+		loaded = run(
+			f'import sys, {PACKAGE}, {PACKAGE}.maps, {PACKAGE}.absal.rings\n'
+			f'print("numpy" in sys.modules, "inspect" in sys.modules)\n'
+			f'print("Z" in vars({PACKAGE}.algaeset), "matrices" in vars({PACKAGE}.absal))'
+		)
+		assert loaded == ['False'] * 4
+
+	def test_array_modules_import_without_numpy(self):
+		modules = ('absal.morphisms', 'absal.matrices', 'absal.lie', 'verification')
+		loaded = run(
+			f'import sys\n'
+			+ ''.join(f'import {PACKAGE}.{m}\n' for m in modules)
+			+ 'print("numpy" in sys.modules)'
+		)
+		assert loaded == ['False']
+
+	def test_standard_sets_build_on_access(self):
+		assert run(f'from {PACKAGE}.algaeset import N\nprint(3 in N, -3 in N)') == ['True', 'False']
+
+	def test_submodules_load_on_access(self):
+		assert run(f'import {PACKAGE}\nprint({PACKAGE}.absal.groups.Group.Z_mod(4).order)') == ['4']
+
+	def test_construction_analyses_each_mapping_once(self, monkeypatch):
+		calls = []
+		analyse = utils._code_arity
+		monkeypatch.setattr(utils, '_code_arity', lambda f: calls.append(f) or analyse(f))
+		aset = AlgaeSet(1, 2, 3)
+		f = lambda a, b: a
+		for _ in range(1000):
+			BinaryOperation(f, aset, aset)
+		assert calls == [f]
+
+
+@benchmark
+class TestBudgets:
+
+	def test_import_budget(self):
+		elapsed, = run(
+			f'import time\n'
+			f'start = time.perf_counter()\n'
+			f'import {PACKAGE}.maps, {PACKAGE}.absal.rings\n'
+			f'print(time.perf_counter() - start)'
+		)
+		assert float(elapsed) < IMPORT_BUDGET
+
+	def test_construction_budget(self):
+		aset = AlgaeSet(1, 2, 3)
+		start = time.perf_counter()
+		for _ in range(1000):
+			BinaryOperation(lambda a, b: a, aset, aset)
+		assert time.perf_counter() - start < CONSTRUCTION_BUDGET
+
+
+class TestArity:
+
+	def test_counts(self):
+		f = lambda a, b=1, *args, c, d=2, **kwargs: None
+		assert num_args(f) == 4 and num_kwargs(f) == 2
+		assert is_predicate(lambda e: True)
+		assert not is_predicate(lambda: True)
+
+	def test_bound_methods(self):
+		class Operation:
+			def apply(self, a, b=0):
+				...
+		assert num_args(Operation().apply) == 1
+		assert num_kwargs(Operation().apply) == 1
+
+	def test_builtins_and_callables(self):
+		assert num_args(divmod) == 2
+		class Callable:
+			def __call__(self, a):
+				...
+		assert num_args(Callable()) == 1
+
+	def test_analysis_is_cached(self):
+		f = lambda a: a
+		num_args(f)
+		assert _signatures[f] == (1, 0)
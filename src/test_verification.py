@@ -0,0 +1,108 @@
+
+from types import SimpleNamespace
+from pytest import raises, importorskip
+
+np = importorskip('numpy')
+
+from .verification import *
+from .verification import _simpler
+from . import algaeset
+from .algaeset import AlgaeSet
+from .maps import AssociativeOperation, CommutativeOperation, ClosedOperation
+from .properties import AssociativityError, CommutativityError, ClosureError, DistributivityError
+from .absal.groups import Group
+from .absal.rings import UnitalRing
+
+
+class TestSampling:
+
+	def test_standard_sets(self):
+		rng = np.random.default_rng(0)
+		for aset in (algaeset.N, algaeset.Z, algaeset.R, algaeset.C):
+			sample = aset.sample(500, rng)
+			assert len(sample) == 500
+			assert aset.contains_array(sample).all()
+		assert (algaeset.N.sample(500, rng) >= 0).all()
+
+	def test_restrictions_are_rejection_sampled(self):
+		evens = algaeset.Z.such_that(lambda e: e % 2 == 0)
+		sample = evens.sample(300, np.random.default_rng(1))
+		assert len(sample) == 300 and (sample % 2 == 0).all()
+
+	def test_finite_sets(self):
+		sample = AlgaeSet(1, 2, 3).sample(100, np.random.default_rng(2))
+		assert set(sample.tolist()) <= {1, 2, 3}
+
+	def test_requires_sampler(self):
+		with raises(TypeError):
+			AlgaeSet(int).sample(10)
+
+	def test_unsatisfiable_restriction(self):
+		with raises(ValueError):
+			algaeset.N.such_that(lambda e: e < 0).sample(10, max_rounds=3)
+
+
+class TestVerifyRandomized:
+
+	def test_valid_operation(self):
+		Z = algaeset.Z
+		verify_randomized(AssociativeOperation(lambda a, b: a + b, Z, Z), seed=0)
+		verify_randomized(CommutativeOperation(lambda a, b: a * b, Z, Z), seed=0)
+
+	def test_counterexample_is_shrunk(self):
+		Z = algaeset.Z
+		with raises(AssociativityError) as info:
+			verify_randomized(AssociativeOperation(lambda a, b: a - b, Z, Z), seed=0)
+		assert info.value.counterexample == (0, 0, 1)
+		with raises(CommutativityError) as info:
+			verify_randomized(CommutativeOperation(lambda a, b: max(a, b + 100), Z, Z), seed=0)
+		assert info.value.counterexample == (0, 1)
+
+	def test_overflow_does_not_hide_counterexamples(self):
+		N = algaeset.N
+		# fourth powers wrap around in int64, failing closure in many rows
+		# that Python integers pass; only (0, 0) really leaves N
+		verify_randomized(ClosedOperation(lambda a, b: a * a * a * a + b * b * b * b, N), seed=0)
+		lowered = ClosedOperation(lambda a, b: a * a * a * a + b * b * b * b - 1, N)
+		with raises(ClosureError) as info:
+			verify_randomized(lowered, samples=4000, seed=0)
+		assert info.value.counterexample == (0, 0)
+
+	def test_closure_over_restriction(self):
+		evens = algaeset.Z.such_that(lambda e: e % 2 == 0)
+		verify_randomized(ClosedOperation(lambda a, b: a + b, evens), seed=0)
+		with raises(ClosureError):
+			verify_randomized(ClosedOperation(lambda a, b: a + b + 1, evens), seed=0)
+
+	def test_float_tolerance(self):
+		R = algaeset.R
+		addition = AssociativeOperation(lambda a, b: a + b, R, R)
+		with raises(AssociativityError):
+			verify_randomized(addition, seed=0)
+		verify_randomized(addition, seed=0, tolerance=1e-9)
+
+	def test_finite_structures(self):
+		verify_randomized(Group.symmetric(4), samples=200, seed=1)
+		verify_randomized(UnitalRing.Z_mod(12), seed=1)
+
+	def test_distributivity(self):
+		Z = algaeset.Z
+		ring = SimpleNamespace(
+			aset=Z,
+			addition=ClosedOperation(lambda a, b: a + b, Z),
+			multiplication=ClosedOperation(lambda a, b: a * b + 1, Z)
+		)
+		with raises(DistributivityError) as info:
+			verify_randomized(ring, seed=0)
+		assert info.value.counterexample == (0, 0, 0)
+
+	def test_integer_halving_is_exact(self):
+		x = 2**60 + 3
+		assert 2**59 + 1 in _simpler(x)
+		assert -(2**59 + 1) in _simpler(-x)
+
+	def test_rejects_bad_arguments(self):
+		with raises(TypeError):
+			verify_randomized(3)
+		with raises(ValueError):
+			verify_randomized(Group.Z_mod(3), samples=0)
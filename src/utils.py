@@ -1,5 +1,7 @@
 
-import inspect
+import math
+import types
+import weakref
 from collections.abc import Iterable
 
 
@@ -12,19 +14,87 @@ def chain(*iterators):
 	for i in iterators:
 		yield from i
 
+_signatures = weakref.WeakKeyDictionary()
+
+def _code_arity(_func):
+	# plain functions carry their arity on the code object, which spares
+	# importing inspect at startup
+	code = _func.__code__
+	parameters = code.co_argcount + code.co_kwonlyargcount
+	parameters += bool(code.co_flags & 0x04) + bool(code.co_flags & 0x08)
+	defaults = len(_func.__defaults__ or ()) + len(_func.__kwdefaults__ or {})
+	return parameters - defaults, defaults
+
+def _signature_arity(_func):
+	import inspect
+	parameters = inspect.signature(_func).parameters.values()
+	defaults = sum(p.default is not inspect.Parameter.empty for p in parameters)
+	return len(parameters) - defaults, defaults
+
+def _arity(_func):
+	# (parameters without defaults, parameters with defaults), computed once
+	# per function; bound methods share their function's entry
+	bound = 0
+	if isinstance(_func, types.MethodType):
+		_func, bound = _func.__func__, 1
+	try:
+		arity = _signatures.get(_func)
+	except TypeError:
+		arity = None
+	if arity is None:
+		plain = (
+			isinstance(_func, types.FunctionType)
+			and not hasattr(_func, '__wrapped__')
+			and not hasattr(_func, '__signature__')
+		)
+		arity = _code_arity(_func) if plain else _signature_arity(_func)
+		try:
+			_signatures[_func] = arity
+		except TypeError:
+			pass
+	return max(arity[0] - bound, 0), arity[1]
+
 def num_kwargs(_func):
 	if not callable(_func):
 		raise TypeError(f'Expected callable, not {typename(_func)}')
-	return str(inspect.signature(_func)).count('=')
+	return _arity(_func)[1]
 
 def num_args(_func):
 	if not callable(_func):
 		raise TypeError(f'Expected callable, not {typename(_func)}')
-	return len(inspect.signature(_func).parameters) - num_kwargs(_func)
+	return _arity(_func)[0]
 
 def is_predicate(candidate):
 	if not callable(candidate):
 		return False
-	return len(inspect.signature(candidate).parameters)
+	return sum(_arity(candidate))
 
+def factorize(n):
+	if not isinstance(n, int):
+		raise TypeError(f'Expected int, not {typename(n)}')
+	if n < 1:
+		raise ValueError(f'Expected a positive integer, not {n}')
+	factors = {}
+	for p in chain((2, 3), range(5, math.isqrt(n) + 1, 2)):
+		if p * p > n:
+			break
+		while n % p == 0:
+			factors[p] = factors.get(p, 0) + 1
+			n //= p
+	if n > 1:
+		factors[n] = factors.get(n, 0) + 1
+	return factors
 
+def crt(residues, moduli):
+	if len(residues) != len(moduli):
+		raise ValueError(f'Expected as many residues as moduli')
+	x, m = 0, 1
+	for r, n in zip(residues, moduli):
+		g = math.gcd(m, n)
+		if (r - x) % g:
+			raise ValueError(f'Incompatible congruences modulo {m} and {n}')
+		step = ((r - x) // g) * pow(m // g, -1, n // g) % (n // g)
+		x += m * step
+		m = m // g * n
+		x %= m
+	return x
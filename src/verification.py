@@ -0,0 +1,174 @@
+
+from .utils import typename, num_args
+from .algaeset import as_column, _numpy
+from .maps import (
+	BinaryOperation, AssociativeOperation, CommutativeOperation,
+	IndempotentOperation, IdentityOperation, InvertibleOperation
+)
+from .properties import (
+	ClosureError, AssociativityError, CommutativityError, IndempotencyError,
+	IdentityError, InvertibilityError, DistributivityError
+)
+
+
+SHRINK_STEPS = 200
+
+
+def _objects(values):
+	np = _numpy()
+	column = np.empty(len(values), dtype=object)
+	for i, v in enumerate(values):
+		column[i] = v
+	return column
+
+def _evaluate(mapping, *columns):
+	# numeric columns are tried in one broadcast call; mappings that do not
+	# broadcast to one result per row are evaluated row by row
+	np = _numpy()
+	if all(c.dtype.kind in 'biufc' for c in columns):
+		try:
+			with np.errstate(all='ignore'):
+				result = mapping(*columns)
+			if isinstance(result, np.ndarray) and result.shape == columns[0].shape:
+				return result
+		except Exception:
+			pass
+	return as_column([mapping(*args) for args in zip(*(c.tolist() for c in columns))])
+
+def _equality(tolerance):
+	def same(a, b):
+		if tolerance is not None and isinstance(a, (int, float, complex)) and isinstance(b, (int, float, complex)):
+			return abs(a - b) <= tolerance * (1 + abs(b))
+		return bool(a == b)
+	def equal(x, y):
+		np = _numpy()
+		if x.dtype.kind == 'O' or y.dtype.kind == 'O':
+			return np.fromiter(map(same, x.tolist(), y.tolist()), bool, len(x))
+		if tolerance is not None and (x.dtype.kind in 'fc' or y.dtype.kind in 'fc'):
+			return np.isclose(x, y, rtol=tolerance, atol=tolerance)
+		return x == y
+	return equal
+
+def _operation_laws(operation, equal):
+	op, domain, name = operation.mapping, operation.domain, typename(operation)
+	apply = lambda a, b: _evaluate(op, a, b)
+	yield (
+		ClosureError, domain, f'{name} is not closed over {operation.range}',
+		lambda a, b: operation.range.contains_array(apply(a, b))
+	)
+	if isinstance(operation, AssociativeOperation):
+		yield (
+			AssociativityError, domain, f'{name} is not associative',
+			lambda a, b, c: equal(apply(apply(a, b), c), apply(a, apply(b, c)))
+		)
+	if isinstance(operation, CommutativeOperation):
+		yield (
+			CommutativityError, domain, f'{name} is not commutative',
+			lambda a, b: equal(apply(a, b), apply(b, a))
+		)
+	if isinstance(operation, IndempotentOperation):
+		yield (
+			IndempotencyError, domain, f'{name} is not indempotent',
+			lambda a: equal(apply(a, a), a)
+		)
+	if isinstance(operation, IdentityOperation):
+		identity = operation.identity
+		def identity_law(a):
+			e = as_column([identity] * len(a))
+			return equal(apply(e, a), a) & equal(apply(a, e), a)
+		yield IdentityError, domain, f'{name} does not have identity {identity}', identity_law
+	if isinstance(operation, InvertibleOperation):
+		inverse = operation.inverse_mapping.mapping
+		yield (
+			InvertibilityError, domain, f'{name} is not right invertible',
+			lambda a, b: equal(_evaluate(inverse, apply(a, b), b), a)
+		)
+
+def _laws(structure, equal):
+	if isinstance(structure, BinaryOperation):
+		yield from _operation_laws(structure, equal)
+		return
+	if hasattr(structure, 'addition') and hasattr(structure, 'multiplication'):
+		yield from _operation_laws(structure.addition, equal)
+		yield from _operation_laws(structure.multiplication, equal)
+		add = lambda a, b: _evaluate(structure.addition.mapping, a, b)
+		mul = lambda a, b: _evaluate(structure.multiplication.mapping, a, b)
+		yield (
+			DistributivityError, structure.aset, f'Multiplication does not distribute over addition',
+			lambda a, b, c: (
+				equal(mul(a, add(b, c)), add(mul(a, b), mul(a, c)))
+				& equal(mul(add(a, b), c), add(mul(a, c), mul(b, c)))
+			)
+		)
+		return
+	if hasattr(structure, 'binop'):
+		yield from _operation_laws(structure.binop, equal)
+		return
+	raise TypeError(f'Expected an operation or algebraic structure, not {typename(structure)}')
+
+def _fails(law, witness):
+	return not law(*(_objects([w]) for w in witness))[0]
+
+def _simpler(x):
+	# candidates strictly simpler than x: smaller magnitude, or integral
+	# where x is not
+	if isinstance(x, bool):
+		return
+	if isinstance(x, int):
+		half = x // 2 if x >= 0 else -(-x // 2)
+		for c in (0, -x if x < 0 else None, half, x - 1 if x > 0 else x + 1):
+			if c is not None and (abs(c) < abs(x) or c == -x > 0):
+				yield c
+	elif isinstance(x, float):
+		if x != x or x in (float('inf'), float('-inf')):
+			return
+		if x != int(x):
+			yield 0.0
+			yield float(int(x))
+			return
+		yield from (float(c) for c in _simpler(int(x)))
+	elif isinstance(x, complex):
+		if x.imag:
+			yield complex(x.real, 0)
+		yield from (complex(r, x.imag) for r in _simpler(x.real))
+		yield from (complex(x.real, i) for i in _simpler(x.imag))
+
+def _shrink(law, domain, witness):
+	witness = list(witness)
+	for _ in range(SHRINK_STEPS):
+		for i, value in enumerate(witness):
+			trial = next((
+				witness[:i] + [c] + witness[i + 1:] for c in _simpler(value)
+				if c in domain and _fails(law, witness[:i] + [c] + witness[i + 1:])
+			), None)
+			if trial is not None:
+				witness = trial
+				break
+		else:
+			break
+	return tuple(witness)
+
+def verify_randomized(structure, samples=1000, seed=None, tolerance=None, shrink=True):
+	np = _numpy()
+	if not isinstance(samples, int):
+		raise TypeError(f'Expected int, not {typename(samples)}')
+	if samples < 1:
+		raise ValueError(f'Expected a positive number of samples, not {samples}')
+	rng = np.random.default_rng(seed)
+	for error, domain, message, law in _laws(structure, _equality(tolerance)):
+		columns = [domain.sample(samples, rng) for _ in range(num_args(law))]
+		failing = np.flatnonzero(~np.asarray(law(*columns), dtype=bool))
+		if not len(failing):
+			continue
+		# every vectorized failure is re-checked on Python objects in one
+		# pass; int64 overflow can fail rows that Python integers pass
+		rows = [c[failing].tolist() for c in columns]
+		confirmed = np.flatnonzero(~np.asarray(law(*(_objects(r) for r in rows)), dtype=bool))
+		if not len(confirmed):
+			continue
+		witness = tuple(r[confirmed[0]] for r in rows)
+		if shrink:
+			witness = _shrink(law, domain, witness)
+		failure = error(f'{message}, for example at {witness}')
+		failure.counterexample = witness
+		raise failure